@@ -1,21 +1,51 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 
+from app.core.page_records import PageRecords
 
-def _sorted_tree(node: dict[str, dict]) -> dict[str, dict]:
-    return {key: _sorted_tree(node[key]) for key in sorted(node)}
 
+def _tree_from_sorted(rows: Iterable[Sequence[str]]) -> dict[str, dict]:
+    """Nested tree from segment tuples in sorted order; children come out sorted.
 
-def build_tree(paths: list[str] | Iterable[str]) -> dict[str, dict]:
+    Consecutive rows share their leading segments, so each row resumes from the node where
+    it diverges from the previous one instead of walking down from the root.
+    """
     tree: dict[str, dict] = {}
-    for raw_path in paths:
-        current = tree
-        for segment in (part.strip() for part in str(raw_path).split("/")):
-            if not segment:
-                continue
+    previous: Sequence[str] = ()
+    # stack[i] is the node holding the children of previous[:i]
+    stack: list[dict[str, dict]] = [tree]
+    for segments in rows:
+        shared = 0
+        limit = min(len(previous), len(segments))
+        while shared < limit and previous[shared] == segments[shared]:
+            shared += 1
+        del stack[shared + 1 :]
+        current = stack[shared]
+        for segment in segments[shared:]:
             current = current.setdefault(segment, {})
-    return _sorted_tree(tree)
+            stack.append(current)
+        previous = segments
+    return tree
+
+
+def build_tree(paths: list[str] | Iterable[str] | PageRecords) -> dict[str, dict]:
+    if isinstance(paths, PageRecords):
+        # strip like the path branch, once per distinct segment
+        clean = [segment.strip() for segment in paths.segments]
+        if clean == paths.segments:
+            return _tree_from_sorted(paths.segments_of(row) for row in paths.sorted_rows())
+        return _tree_from_sorted(
+            sorted(
+                tuple(clean[number] for number in paths.segment_ids(row) if clean[number])
+                for row in range(len(paths))
+            )
+        )
+    rows = sorted(
+        tuple(segment for segment in (part.strip() for part in str(raw_path).split("/")) if segment)
+        for raw_path in paths
+    )
+    return _tree_from_sorted(rows)
 
 
 def render_tree_text(tree: dict[str, dict]) -> str:
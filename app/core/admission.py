@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Literal
+
+from fastapi import Request
+
+from app.core.config import env_float, env_int
+from app.core.errors import TooManyRequests, error_response
+from app.core.metrics import ADMISSION_INFLIGHT, ADMISSION_REJECTIONS
+
+
+RouteClass = Literal["read", "write", "bulk"]
+
+# Probes, metrics, docs and admin stay reachable however busy the service is.
+_EXEMPT_PREFIXES = (
+    "/api/v1/admin/",
+    "/docs",
+    "/redoc",
+)
+_EXEMPT_PATHS = frozenset(
+    {
+        "/api/v1/health",
+        "/api/v1/ready",
+        "/healthz",
+        "/readyz",
+        "/wikimgr/health",
+        "/metrics",
+        "/openapi.json",
+    }
+)
+_BULK_PATHS = frozenset(
+    {
+        "/api/v1/pages/inventory",
+        "/api/v1/search/refresh",
+        "/api/v1/analysis/duplicates",
+        "/api/v1/links/report",
+        # list every page (up to 1000) from Wiki.js
+        "/content/tree",
+        "/content/preflight",
+        "/pages/bulk_upload",
+        "/wikimgr/pages/inventory.json",
+    }
+)
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def classify_request(method: str, path: str) -> RouteClass | None:
+    """Route class for admission, or None for endpoints that are never shed."""
+    if path in _EXEMPT_PATHS or path.startswith(_EXEMPT_PREFIXES):
+        return None
+    if path in _BULK_PATHS or "/bulk-" in path:
+        return "bulk"
+    if method in _WRITE_METHODS:
+        return "write"
+    return "read"
+
+
+class RouteGate:
+    """Concurrency cap for one route class with a FIFO queue and a wait deadline.
+
+    A request that finds the cap reached is queued only if the expected wait (queue
+    position times the recent service time, divided by the cap) fits in ``max_wait_s``;
+    otherwise it is rejected straight away instead of timing out after doing nothing.
+    Runs on the event loop only, so no locking.
+    """
+
+    def __init__(self, route_class: str, limit: int, max_wait_s: float, queue_size: int):
+        self.route_class = route_class
+        self.limit = max(1, limit)
+        self.max_wait_s = max_wait_s
+        self.queue_size = queue_size
+        self.inflight = 0
+        self.service_s = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def expected_wait_s(self) -> float:
+        return self.service_s * (len(self._waiters) + 1) / self.limit
+
+    def _reject(self, reason: str, retry_after_s: float) -> TooManyRequests:
+        ADMISSION_REJECTIONS.labels(route_class=self.route_class, reason=reason).inc()
+        return TooManyRequests(
+            f"Too many concurrent {self.route_class} requests ({reason})",
+            retry_after_s=retry_after_s,
+            details={
+                "route_class": self.route_class,
+                "limit": self.limit,
+                "queued": len(self._waiters),
+            },
+        )
+
+    async def acquire(self) -> None:
+        if self.inflight < self.limit and not self._waiters:
+            self._take()
+            return
+        expected = self.expected_wait_s()
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue_full", max(1.0, expected))
+        if expected > self.max_wait_s:
+            raise self._reject("deadline", expected)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # granted while giving up; hand the slot on
+                self._release_slot()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject("deadline", max(1.0, self.expected_wait_s()))
+
+    def _take(self) -> None:
+        self.inflight += 1
+        ADMISSION_INFLIGHT.labels(route_class=self.route_class).set(self.inflight)
+
+    def _release_slot(self) -> None:
+        self.inflight -= 1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.inflight += 1
+                break
+        ADMISSION_INFLIGHT.labels(route_class=self.route_class).set(self.inflight)
+
+    def release(self, elapsed_s: float) -> None:
+        self.service_s = (
+            elapsed_s
+            if self.service_s == 0.0
+            else self.service_s + 0.1 * (elapsed_s - self.service_s)
+        )
+        self._release_slot()
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class KeyQuotas:
+    """Per-client token buckets: ``rate`` requests per second with bursts up to ``burst``.
+
+    Clients are keyed by a hash of their ``X-API-Key`` (or their address when they send
+    none). Only the ``max_keys`` most recently seen clients are remembered.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10_000):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def try_take(self, key: str) -> float:
+        """Take one token; returns 0 when allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None) or TokenBucket(self.burst, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+            if bucket.tokens >= 1.0:
+                bucket.tokens -= 1.0
+                return 0.0
+            return (1.0 - bucket.tokens) / self.rate
+
+
+def client_key(request: Request) -> str:
+    api_key = request.headers.get("X-API-Key")
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return "addr:" + (request.client.host if request.client else "unknown")
+
+
+class AdmissionController:
+    def __init__(self, gates: dict[str, RouteGate], quotas: KeyQuotas):
+        self.gates = gates
+        self.quotas = quotas
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        max_wait_s = env_float("WIKIMGR_ADMIT_MAX_WAIT_MS", 2000.0, 0.0) / 1000.0
+        queue_size = env_int("WIKIMGR_ADMIT_QUEUE", 128, 0)
+        limits = {
+            "read": env_float("WIKIMGR_ADMIT_READ", 64, 1),
+            "write": env_float("WIKIMGR_ADMIT_WRITE", 16, 1),
+            "bulk": env_float("WIKIMGR_ADMIT_BULK", 2, 1),
+        }
+        rate = env_float("WIKIMGR_QUOTA_RPS", 0.0, 0.0)
+        return cls(
+            gates={
+                name: RouteGate(name, int(limit), max_wait_s, queue_size)
+                for name, limit in limits.items()
+            },
+            quotas=KeyQuotas(rate, env_float("WIKIMGR_QUOTA_BURST", max(1.0, rate * 2), 1.0)),
+        )
+
+
+_CONTROLLER: AdmissionController | None = None
+
+
+def admission_controller() -> AdmissionController:
+    global _CONTROLLER
+    if _CONTROLLER is None:
+        _CONTROLLER = AdmissionController.from_env()
+    return _CONTROLLER
+
+
+def reset_admission() -> None:
+    """Drop gates and quotas so the next request re-reads the environment."""
+    global _CONTROLLER
+    _CONTROLLER = None
+
+
+async def admit_request(request: Request, call_next):
+    route_class = classify_request(request.method, request.url.path)
+    if route_class is None:
+        return await call_next(request)
+    controller = admission_controller()
+    if controller.quotas.enabled:
+        wait_s = controller.quotas.try_take(client_key(request))
+        if wait_s:
+            ADMISSION_REJECTIONS.labels(route_class=route_class, reason="quota").inc()
+            return error_response(
+                TooManyRequests(
+                    "Request quota exceeded for this client",
+                    retry_after_s=wait_s,
+                    code="quota_exceeded",
+                    details={
+                        "rate_per_s": controller.quotas.rate,
+                        "burst": controller.quotas.burst,
+                    },
+                )
+            )
+    gate = controller.gates[route_class]
+    try:
+        await gate.acquire()
+    except TooManyRequests as e:
+        return error_response(e)
+    start = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        gate.release(time.perf_counter() - start)
@@ -20,3 +20,16 @@ async def require_api_key(
         return
     if x_api_key != expected:
         raise APIError(status_code=401, code="unauthorized", message="Invalid API key")
+
+
+async def require_admin_key(
+    x_api_key: Annotated[str | None, Security(api_key_header)],
+) -> None:
+    # Admin endpoints stay off unless a dedicated key is configured.
+    expected = os.getenv("WIKIMGR_ADMIN_API_KEY", "")
+    if not expected:
+        raise APIError(
+            status_code=403, code="admin_disabled", message="WIKIMGR_ADMIN_API_KEY is not set"
+        )
+    if x_api_key != expected:
+        raise APIError(status_code=401, code="unauthorized", message="Invalid admin API key")
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Literal
+
+from app.core.concurrency import is_overload_error
+from app.core.config import env_float, env_int
+from app.core.errors import UpstreamUnavailable
+from app.core.metrics import UPSTREAM_CIRCUIT_STATE, UPSTREAM_REJECTIONS
+
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitBreaker:
+    """Fails fast while an upstream is down instead of letting every request ride out retries.
+
+    ``closed``: calls pass; ``failure_threshold`` consecutive overload failures (timeouts,
+    connection errors, 5xx/429) open the circuit. ``open``: calls are rejected with
+    ``UpstreamUnavailable`` (503, ``Retry-After`` = time left) for ``reset_timeout_s``.
+    ``half_open``: up to ``half_open_probes`` calls go through as probes; a success closes
+    the circuit, a failure opens it again for another ``reset_timeout_s``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.half_open_probes = half_open_probes
+        self.failures = 0
+        self._state: CircuitState = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._publish_locked()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._state == "open" and self._retry_after_locked() <= 0:
+                return "half_open"
+            return self._state
+
+    def retry_after_s(self) -> float:
+        with self._lock:
+            return max(0.0, self._retry_after_locked()) if self._state == "open" else 0.0
+
+    def _retry_after_locked(self) -> float:
+        return self._opened_at + self.reset_timeout_s - time.monotonic()
+
+    def _publish_locked(self) -> None:
+        UPSTREAM_CIRCUIT_STATE.labels(upstream=self.name).set(_STATE_VALUES[self._state])
+
+    def _open_locked(self) -> None:
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self._publish_locked()
+
+    def before_call(self) -> bool:
+        """Admit a call or raise; returns True when the call is a half-open probe."""
+        with self._lock:
+            if self._state == "open":
+                remaining = self._retry_after_locked()
+                if remaining > 0:
+                    raise self._reject(remaining)
+                self._state = "half_open"
+                self._publish_locked()
+            if self._state == "half_open":
+                if self._probes >= self.half_open_probes:
+                    raise self._reject(1.0)
+                self._probes += 1
+                return True
+            return False
+
+    def _reject(self, retry_after_s: float) -> UpstreamUnavailable:
+        UPSTREAM_REJECTIONS.labels(reason="circuit_open").inc()
+        return UpstreamUnavailable(
+            f"Wiki.js circuit open after {self.failures} consecutive failures",
+            retry_after_s=retry_after_s,
+            code="circuit_open",
+            details={"upstream": self.name},
+        )
+
+    def record_success(self, probe: bool) -> None:
+        with self._lock:
+            self.failures = 0
+            if probe or self._state == "half_open":
+                self._state = "closed"
+                self._probes = 0
+                self._publish_locked()
+
+    def record_failure(self, probe: bool) -> None:
+        with self._lock:
+            self.failures += 1
+            if probe or self._state == "half_open" or self.failures >= self.failure_threshold:
+                self._open_locked()
+
+    def release_probe(self, probe: bool) -> None:
+        """A probe ended without reaching upstream (shed locally or cancelled); free its slot."""
+        if probe:
+            with self._lock:
+                self._probes = max(0, self._probes - 1)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        probe = self.before_call()
+        try:
+            yield
+        except UpstreamUnavailable:
+            # shed locally (e.g. by the concurrency limiter); says nothing about upstream
+            self.release_probe(probe)
+            raise
+        except Exception as e:
+            if is_overload_error(e):
+                self.record_failure(probe)
+            else:
+                # the upstream answered; a GraphQL error or missing page still proves it is up
+                self.record_success(probe)
+            raise
+        except BaseException:
+            self.release_probe(probe)
+            raise
+        self.record_success(probe)
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def breaker_for(upstream: str) -> CircuitBreaker:
+    """One breaker per upstream GraphQL URL, configured from the environment on first use."""
+    breaker = _BREAKERS.get(upstream)
+    if breaker is None:
+        with _BREAKERS_LOCK:
+            breaker = _BREAKERS.get(upstream)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    upstream,
+                    failure_threshold=env_int("WIKIMGR_BREAKER_FAILURES", 5, 1),
+                    reset_timeout_s=env_float("WIKIMGR_BREAKER_RESET_S", 30.0, 0.1),
+                    half_open_probes=env_int("WIKIMGR_BREAKER_PROBES", 1, 1),
+                )
+                _BREAKERS[upstream] = breaker
+    return breaker
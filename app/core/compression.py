@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import zlib
+from typing import Any, Callable
+
+from app.core.config import env_flag, env_int
+from app.core.metrics import RESPONSE_COMPRESSION_BYTES
+
+try:  # optional: pip install zstandard
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+try:  # optional: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli
+    brotli = None
+
+
+DEFAULT_MIN_BYTES = 1024
+DEFAULT_LEVEL = 5
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+)
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(max(1, min(9, level)), zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._z = zstandard.ZstdCompressor(level=max(1, min(19, level))).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._z = brotli.Compressor(quality=max(0, min(11, level)))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.process(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush()
+
+    def finish(self) -> bytes:
+        return self._z.finish()
+
+
+# Server preference when the client rates several encodings equally.
+ENCODERS: dict[str, Callable[[int], Any]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = _Zstd
+if brotli is not None:
+    ENCODERS["br"] = _Brotli
+ENCODERS["gzip"] = _Gzip
+
+
+def negotiate_encoding(
+    accept_encoding: str, available: tuple[str, ...] = tuple(ENCODERS)
+) -> str | None:
+    """Best supported encoding for an ``Accept-Encoding`` header, or None for identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def parse_level_rules(raw: str) -> list[tuple[str, int]]:
+    rules: list[tuple[str, int]] = []
+    for part in raw.split(","):
+        pattern, sep, level = part.strip().rpartition("=")
+        if not sep or not pattern:
+            continue
+        try:
+            rules.append((pattern, max(0, int(level))))
+        except ValueError:
+            continue
+    return rules
+
+
+def _header(headers: list[tuple[bytes, bytes]], name: bytes) -> bytes | None:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _varies(headers: list[tuple[bytes, bytes]]) -> bool:
+    """Whether the response could have been compressed, so caches must key on Accept-Encoding."""
+    content_type = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+    return _header(headers, b"content-encoding") is None and content_type.startswith(
+        _COMPRESSIBLE_TYPES
+    )
+
+
+def _with_vary(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    vary = _header(headers, b"vary")
+    if vary and b"accept-encoding" in vary.lower():
+        return headers
+    value = b"Accept-Encoding" if not vary else vary + b", Accept-Encoding"
+    return [(k, v) for k, v in headers if k.lower() != b"vary"] + [(b"vary", value)]
+
+
+class CompressionMiddleware:
+    """gzip/zstd/brotli response compression, negotiated from ``Accept-Encoding``.
+
+    Bodies smaller than ``min_bytes`` that arrive in one message are sent as-is. Streaming
+    responses (NDJSON, chunked exports) are compressed message by message and flushed after
+    each one, so the client still receives every chunk as soon as it is produced. The level
+    is chosen per path from ``level_rules`` (fnmatch ``pattern=level``, first match wins,
+    ``0`` turns compression off for that route), else ``default_level``.
+
+    Every response with a compressible content type carries ``Vary: Accept-Encoding``,
+    compressed or not, so shared caches never hand one client's encoding to another.
+    """
+
+    def __init__(
+        self,
+        app,
+        min_bytes: int | None = None,
+        default_level: int | None = None,
+        level_rules: list[tuple[str, int]] | None = None,
+    ):
+        self.app = app
+        self.enabled = env_flag("WIKIMGR_COMPRESS", default=True)
+        self.min_bytes = (
+            env_int("WIKIMGR_COMPRESS_MIN_BYTES", DEFAULT_MIN_BYTES, 0)
+            if min_bytes is None
+            else min_bytes
+        )
+        self.default_level = (
+            env_int("WIKIMGR_COMPRESS_LEVEL", DEFAULT_LEVEL, 0)
+            if default_level is None
+            else default_level
+        )
+        self.level_rules = (
+            parse_level_rules(os.getenv("WIKIMGR_COMPRESS_LEVELS", ""))
+            if level_rules is None
+            else level_rules
+        )
+
+    def level_for(self, path: str) -> int:
+        for pattern, level in self.level_rules:
+            if fnmatch.fnmatchcase(path, pattern):
+                return level
+        return self.default_level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        accept = _header(scope.get("headers") or [], b"accept-encoding") or b""
+        encoding = negotiate_encoding(accept.decode("latin-1"))
+        level = self.level_for(scope.get("path", "")) if encoding else 0
+        if encoding is None or level == 0:
+
+            async def send_with_vary(message) -> None:
+                if message["type"] == "http.response.start" and _varies(
+                    message.get("headers") or []
+                ):
+                    message = {**message, "headers": _with_vary(message.get("headers") or [])}
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+        await _CompressedResponse(self, encoding, level, send).run(scope, receive)
+
+
+class _CompressedResponse:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, level: int, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.level = level
+        self.send = send
+        self.start: dict | None = None
+        self.encoder = None
+        self.passthrough = False
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+
+    async def run(self, scope, receive) -> None:
+        await self.middleware.app(scope, receive, self.on_send)
+        if self.encoder is not None:
+            RESPONSE_COMPRESSION_BYTES.labels(encoding=self.encoding, stage="raw").inc(
+                self.raw_bytes
+            )
+            RESPONSE_COMPRESSION_BYTES.labels(encoding=self.encoding, stage="sent").inc(
+                self.sent_bytes
+            )
+
+    async def on_send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            headers = message.get("headers") or []
+            varies = _varies(headers)
+            if varies:
+                message = {**message, "headers": _with_vary(headers)}
+            self.passthrough = not varies or message.get("status", 200) in (204, 304)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.middleware.min_bytes:
+                await self.send(start)
+                await self.send(message)
+                self.passthrough = True
+                return
+            self.encoder = ENCODERS[self.encoding](self.level)
+            headers = [(k, v) for k, v in start["headers"] if k.lower() != b"content-length"]
+            headers.append((b"content-encoding", self.encoding.encode()))
+            if not more_body:
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                headers.append((b"content-length", str(len(compressed)).encode()))
+                self._count(body, compressed)
+                await self.send({**start, "headers": headers})
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send({**start, "headers": headers})
+
+        chunk = self.encoder.compress(body)
+        chunk += self.encoder.flush() if more_body else self.encoder.finish()
+        self._count(body, chunk)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _count(self, raw: bytes, sent: bytes) -> None:
+        self.raw_bytes += len(raw)
+        self.sent_bytes += len(sent)
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Literal
+
+import httpx
+
+from app.core.config import env_float, env_int
+from app.core.errors import UpstreamUnavailable
+from app.core.metrics import (
+    UPSTREAM_CONCURRENCY_LIMIT,
+    UPSTREAM_INFLIGHT,
+    UPSTREAM_QUEUE_DEPTH,
+    UPSTREAM_QUEUE_WAIT,
+    UPSTREAM_REJECTIONS,
+)
+from app.core.timing import record_phase
+
+
+Priority = Literal["interactive", "bulk"]
+PRIORITIES: tuple[Priority, ...] = ("interactive", "bulk")
+
+_PRIORITY: ContextVar[Priority] = ContextVar("wikimgr_upstream_priority", default="interactive")
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Errors that mean Wiki.js is struggling, as opposed to a bad request or missing page."""
+    if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return False
+
+
+def current_priority() -> Priority:
+    return _PRIORITY.get()
+
+
+@contextmanager
+def upstream_priority(priority: Priority) -> Iterator[None]:
+    """Tag upstream calls made in this context (and threads/tasks it spawns) with ``priority``."""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _Waiter:
+    __slots__ = ("priority", "event", "loop", "future", "granted")
+
+    def __init__(self, priority: Priority, event=None, loop=None, future=None):
+        self.priority = priority
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """Concurrency window for upstream calls, sized from observed latency and errors.
+
+    AIMD in the style of Netflix's gradient limiters: every completed call updates a short
+    and a long latency EWMA. An overload error, or a short average above ``tolerance``
+    times the long one, shrinks the window by ``backoff`` (at most once per round trip);
+    otherwise the window grows by ``1/limit`` per call while it is at least half used,
+    about one slot per round trip. Calls beyond the window wait in a bounded queue,
+    shared by threads (sync ``wikijs_api``) and coroutines (``WikiJSClient``), and are
+    rejected with 503 when the queue is full or the wait exceeds ``queue_timeout_s``.
+
+    Waiters are kept FIFO per priority class (see ``upstream_priority``). A freed slot goes
+    to the oldest interactive waiter, except that while both classes are waiting bulk work
+    gets ``bulk_share`` of the grants so a steady stream of interactive calls cannot starve it.
+    """
+
+    def __init__(
+        self,
+        initial: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        queue_size: int = 256,
+        queue_timeout_s: float = 10.0,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        bulk_share: float = 0.2,
+    ):
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max(max_limit, min_limit))
+        self.limit = min(self.max_limit, max(self.min_limit, float(initial)))
+        self.queue_size = queue_size
+        self.queue_timeout_s = queue_timeout_s
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.bulk_share = min(1.0, max(0.0, bulk_share))
+        self.inflight = 0
+        self._short_rtt = 0.0
+        self._long_rtt = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._waiters: dict[Priority, deque[_Waiter]] = {p: deque() for p in PRIORITIES}
+        self._bulk_credit = 0.0
+        self._publish_locked()
+
+    @classmethod
+    def from_env(cls) -> "AdaptiveLimiter":
+        return cls(
+            initial=env_float("WIKIMGR_UPSTREAM_LIMIT", 8, 1),
+            min_limit=env_float("WIKIMGR_UPSTREAM_LIMIT_MIN", 1, 1),
+            max_limit=env_float("WIKIMGR_UPSTREAM_LIMIT_MAX", 32, 1),
+            queue_size=env_int("WIKIMGR_UPSTREAM_QUEUE", 256, 0),
+            queue_timeout_s=env_float("WIKIMGR_UPSTREAM_QUEUE_TIMEOUT_S", 10.0, 0.0),
+            bulk_share=env_float("WIKIMGR_UPSTREAM_BULK_SHARE", 0.2, 0.0),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._waiters.values())
+
+    def _publish_locked(self) -> None:
+        UPSTREAM_CONCURRENCY_LIMIT.labels().set(int(self.limit))
+        UPSTREAM_INFLIGHT.labels().set(self.inflight)
+        for priority, queue in self._waiters.items():
+            UPSTREAM_QUEUE_DEPTH.labels(priority=priority).set(len(queue))
+
+    def _reject(self, reason: str, priority: Priority) -> UpstreamUnavailable:
+        UPSTREAM_REJECTIONS.labels(reason=reason).inc()
+        return UpstreamUnavailable(
+            f"Wiki.js concurrency limit reached ({reason})",
+            retry_after_s=max(1.0, self._long_rtt * 2),
+            details={
+                "limit": int(self.limit),
+                "queue_depth": self.queue_depth,
+                "priority": priority,
+            },
+        )
+
+    def _try_acquire_locked(self) -> bool:
+        if self.inflight < int(self.limit) and not self.queue_depth:
+            self.inflight += 1
+            self._publish_locked()
+            return True
+        return False
+
+    def _enqueue_locked(self, waiter: _Waiter) -> None:
+        if self.queue_depth >= self.queue_size:
+            raise self._reject("queue_full", waiter.priority)
+        self._waiters[waiter.priority].append(waiter)
+        self._publish_locked()
+
+    def _abandon_locked(self, waiter: _Waiter) -> bool:
+        """Drop a waiter that gave up; True if it was granted a slot in the meantime."""
+        if waiter.granted:
+            return True
+        try:
+            self._waiters[waiter.priority].remove(waiter)
+        except ValueError:
+            pass
+        self._publish_locked()
+        return False
+
+    def _next_waiter_locked(self) -> _Waiter:
+        interactive, bulk = self._waiters["interactive"], self._waiters["bulk"]
+        if interactive and bulk:
+            # weighted: bulk earns ``bulk_share`` of a grant per contended grant
+            self._bulk_credit += self.bulk_share
+            if self._bulk_credit >= 1.0:
+                self._bulk_credit -= 1.0
+                return bulk.popleft()
+            return interactive.popleft()
+        self._bulk_credit = 0.0
+        return (interactive or bulk).popleft()
+
+    def _grant_locked(self) -> None:
+        while self.queue_depth and self.inflight < int(self.limit):
+            waiter = self._next_waiter_locked()
+            waiter.granted = True
+            self.inflight += 1
+            waiter.wake()
+        self._publish_locked()
+
+    def acquire(self) -> None:
+        priority = current_priority()
+        with self._lock:
+            if self._try_acquire_locked():
+                return
+            if _on_event_loop():
+                # A blocking call made directly on the event loop cannot wait for a slot
+                # without stalling the coroutines that would free one; let it overdraw.
+                self.inflight += 1
+                self._publish_locked()
+                return
+            waiter = _Waiter(priority, event=threading.Event())
+            self._enqueue_locked(waiter)
+        if waiter.event.wait(self.queue_timeout_s):
+            return
+        with self._lock:
+            if self._abandon_locked(waiter):
+                return
+        raise self._reject("timeout", priority)
+
+    async def acquire_async(self) -> None:
+        priority = current_priority()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire_locked():
+                return
+            waiter = _Waiter(priority, loop=loop, future=loop.create_future())
+            self._enqueue_locked(waiter)
+        try:
+            await asyncio.wait_for(waiter.future, self.queue_timeout_s)
+            return
+        except asyncio.TimeoutError:
+            with self._lock:
+                if self._abandon_locked(waiter):
+                    return
+            raise self._reject("timeout", priority)
+        except asyncio.CancelledError:
+            with self._lock:
+                if self._abandon_locked(waiter):
+                    self._release_locked()
+            raise
+
+    def _release_locked(self) -> None:
+        self.inflight = max(0, self.inflight - 1)
+        self._grant_locked()
+
+    def release(self, rtt_s: float, overloaded: bool) -> None:
+        with self._lock:
+            self._update_locked(rtt_s, overloaded)
+            self._release_locked()
+
+    def _update_locked(self, rtt_s: float, overloaded: bool) -> None:
+        if not overloaded:
+            if self._long_rtt == 0.0:
+                self._short_rtt = self._long_rtt = rtt_s
+            else:
+                self._short_rtt += 0.2 * (rtt_s - self._short_rtt)
+                self._long_rtt += 0.02 * (rtt_s - self._long_rtt)
+        congested = overloaded or (
+            self._long_rtt > 0 and self._short_rtt > self._long_rtt * self.tolerance
+        )
+        now = time.monotonic()
+        if congested:
+            if now - self._last_decrease >= max(self._short_rtt, 0.01):
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif self.inflight * 2 >= int(self.limit):
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        start = time.perf_counter()
+        self.acquire()
+        start = _record_wait(start)
+        overloaded = False
+        try:
+            yield
+        except Exception as e:
+            overloaded = is_overload_error(e)
+            raise
+        finally:
+            self.release(time.perf_counter() - start, overloaded)
+
+    @asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[None]:
+        start = time.perf_counter()
+        await self.acquire_async()
+        start = _record_wait(start)
+        overloaded = False
+        try:
+            yield
+        except Exception as e:
+            overloaded = is_overload_error(e)
+            raise
+        finally:
+            self.release(time.perf_counter() - start, overloaded)
+
+
+def _record_wait(start: float) -> float:
+    now = time.perf_counter()
+    UPSTREAM_QUEUE_WAIT.labels(priority=current_priority()).observe(now - start)
+    if now - start >= 0.001:
+        record_phase("upstream-queue", now - start)
+    return now
+
+
+UPSTREAM_LIMITER = AdaptiveLimiter.from_env()
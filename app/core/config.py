@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
+
+def env_float(name: str, default: float, minimum: float | None = None) -> float:
+    """``name`` as a float, raised to ``minimum``; unset or unparsable gives ``default``."""
+    try:
+        value = float(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if minimum is None else max(minimum, value)
+
+
+def env_int(name: str, default: int, minimum: int | None = None) -> int:
+    """``name`` as an int, raised to ``minimum``; unset or unparsable gives ``default``."""
+    try:
+        value = int(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if minimum is None else max(minimum, value)
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """``1/true/yes/on`` or ``0/false/no/off`` (any case); anything else gives ``default``."""
+    value = os.getenv(name, "").strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    return default
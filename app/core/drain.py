@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from typing import Any, Awaitable, TypeVar
+
+from app.core.config import env_float
+from app.core.errors import ServiceUnavailable
+from app.core.metrics import BULK_INTERRUPTED
+from app.core.state import state_path, write_json_atomic
+
+
+logger = logging.getLogger("wikimgr.shutdown")
+
+T = TypeVar("T")
+
+DRAIN_TIMEOUT_S_DEFAULT = 20.0
+INTERRUPTED_DIR = "interrupted"
+
+
+class ShutdownDrain:
+    """Shutdown state shared by the lifespan, the SIGTERM hook and the bulk loops.
+
+    Once ``begin()`` runs, new bulk operations are refused with 503 and readiness fails,
+    while operations already running keep going item by item. When ``timeout_s`` has
+    passed they stop at the next item boundary (``should_stop``) and journal what they did
+    not reach. An item that has started always completes: ``step`` shields it from request
+    cancellation, and ``wait`` gives the remaining steps until the deadline to finish.
+    """
+
+    def __init__(self, timeout_s: float = DRAIN_TIMEOUT_S_DEFAULT):
+        self.timeout_s = timeout_s
+        self.started_at: float | None = None
+        self._steps: set[asyncio.Future] = set()
+
+    @classmethod
+    def from_env(cls) -> "ShutdownDrain":
+        return cls(env_float("WIKIMGR_DRAIN_TIMEOUT_S", DRAIN_TIMEOUT_S_DEFAULT, 0.0))
+
+    @property
+    def draining(self) -> bool:
+        return self.started_at is not None
+
+    def begin(self) -> None:
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+            logger.info(
+                "shutdown: draining bulk operations",
+                extra={"fields": {"timeout_s": self.timeout_s}},
+            )
+
+    def remaining_s(self) -> float:
+        if self.started_at is None:
+            return self.timeout_s
+        return max(0.0, self.started_at + self.timeout_s - time.monotonic())
+
+    def should_stop(self) -> bool:
+        """True once the drain deadline has passed: finish the current item, start no more."""
+        return self.draining and self.remaining_s() <= 0.0
+
+    def admit(self, operation: str) -> None:
+        if self.draining:
+            raise ServiceUnavailable(
+                f"shutting down; bulk {operation} not started",
+                retry_after_s=max(1.0, self.remaining_s()),
+                code="shutting_down",
+            )
+
+    async def step(self, awaitable: Awaitable[T]) -> T:
+        """Run one bulk item to completion even if the request awaiting it is cancelled."""
+        future = asyncio.ensure_future(awaitable)
+        self._steps.add(future)
+        future.add_done_callback(self._steps.discard)
+        return await asyncio.shield(future)
+
+    @property
+    def pending_steps(self) -> int:
+        return len(self._steps)
+
+    async def wait(self) -> bool:
+        """Wait for in-flight items until the deadline; False if some were still running."""
+        self.begin()
+        if self._steps:
+            await asyncio.wait(set(self._steps), timeout=self.remaining_s())
+        if self._steps:
+            logger.warning(
+                "shutdown: bulk steps still running at the drain deadline",
+                extra={"fields": {"pending": len(self._steps)}},
+            )
+            return False
+        return True
+
+
+def _plain(item: Any) -> Any:
+    return item.model_dump(mode="json", by_alias=True) if hasattr(item, "model_dump") else item
+
+
+def journal_interrupted(
+    operation: str,
+    report: Any,
+    remaining: list[Any],
+    in_progress: Any = None,
+    context: dict[str, Any] | None = None,
+) -> str:
+    """Write an interrupted operation's partial report and the items it never reached.
+
+    Called when the drain deadline stops a loop, or when the request running it is
+    cancelled (forced shutdown, client gone). ``in_progress`` is the item that was running
+    at cancellation; it completes in the background.
+    """
+    BULK_INTERRUPTED.labels(operation=operation).inc()
+    path = (
+        state_path(INTERRUPTED_DIR)
+        / f"{operation}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+    )
+    write_json_atomic(
+        path,
+        {
+            "operation": operation,
+            "report": _plain(report),
+            "in_progress": _plain(in_progress),
+            "remaining": [_plain(item) for item in remaining],
+            **(context or {}),
+        },
+    )
+    logger.warning(
+        "bulk operation interrupted",
+        extra={
+            "fields": {"operation": operation, "remaining": len(remaining), "journal": str(path)}
+        },
+    )
+    return str(path)
+
+
+def install_signal_hook() -> None:
+    """Start draining as soon as SIGTERM/SIGINT arrives, not only at lifespan shutdown.
+
+    uvicorn waits for open requests before it runs the lifespan shutdown, so a bulk request
+    would otherwise not learn about the shutdown until it had finished or was killed. The
+    server's own handler still runs afterwards.
+    """
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(sig)
+        if getattr(previous, "_wikimgr_drain", False) or not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            shutdown_drain().begin()
+            previous(signum, frame)
+
+        handler._wikimgr_drain = True
+        try:
+            signal.signal(sig, handler)
+        except ValueError:  # not the main thread (e.g. TestClient); lifespan shutdown still drains
+            return
+
+
+_DRAIN: ShutdownDrain | None = None
+
+
+def shutdown_drain() -> ShutdownDrain:
+    global _DRAIN
+    if _DRAIN is None:
+        _DRAIN = ShutdownDrain.from_env()
+    return _DRAIN
+
+
+def reset_shutdown_drain() -> None:
+    global _DRAIN
+    _DRAIN = None
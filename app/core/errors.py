@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import math
 from typing import Any
 
+from app.core.jsonio import FastJSONResponse
+from app.models import ErrorResponse
+
 
 class APIError(Exception):
     def __init__(
@@ -16,3 +20,70 @@ class APIError(Exception):
         self.code = code
         self.message = message
         self.details = details
+
+
+class RetryableAPIError(APIError):
+    """An error the client should retry later; answered with ``Retry-After`` in whole seconds."""
+
+    def __init__(
+        self,
+        status_code: int,
+        code: str,
+        message: str,
+        retry_after_s: float,
+        details: dict[str, Any] | None = None,
+    ):
+        super().__init__(status_code, code, message, details)
+        self.retry_after_s = retry_after_s
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after_s)))}
+
+
+class UpstreamUnavailable(RetryableAPIError):
+    """wikimgr declined to call Wiki.js (overloaded or known-down); answered as 503."""
+
+    def __init__(
+        self,
+        message: str,
+        retry_after_s: float,
+        code: str = "upstream_unavailable",
+        details: dict[str, Any] | None = None,
+    ):
+        super().__init__(503, code, message, retry_after_s, details)
+
+
+class TooManyRequests(RetryableAPIError):
+    """wikimgr itself is saturated or the client is over its quota; answered as 429."""
+
+    def __init__(
+        self,
+        message: str,
+        retry_after_s: float,
+        code: str = "overloaded",
+        details: dict[str, Any] | None = None,
+    ):
+        super().__init__(429, code, message, retry_after_s, details)
+
+
+class ServiceUnavailable(RetryableAPIError):
+    """wikimgr is shutting down and not starting new work; answered as 503."""
+
+    def __init__(
+        self,
+        message: str,
+        retry_after_s: float,
+        code: str = "unavailable",
+        details: dict[str, Any] | None = None,
+    ):
+        super().__init__(503, code, message, retry_after_s, details)
+
+
+def error_response(exc: APIError) -> FastJSONResponse:
+    """The JSON error body for ``exc``, with ``Retry-After`` when it is retryable."""
+    return FastJSONResponse(
+        status_code=exc.status_code,
+        content=ErrorResponse(code=exc.code, message=exc.message, details=exc.details).model_dump(),
+        headers=exc.headers if isinstance(exc, RetryableAPIError) else None,
+    )
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:  # optional: pip install orjson (or wikimgr[fast])
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+HAS_ORJSON = orjson is not None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON; orjson when installed, the stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: same output as ``JSONResponse``, rendered with orjson when
+    available. Multi-megabyte inventories and trees render several times faster and without
+    the intermediate ``str`` the stdlib encoder builds."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """Serialize a response model the service built itself straight to JSON bytes.
+
+    Returning a model from a route makes FastAPI dump it to a dict, validate that dict
+    against ``response_model`` again and dump it once more; for a 10k-item inventory that is
+    most of the request's CPU. The output matches FastAPI's (aliases, no exclusions), and the
+    route keeps its ``response_model`` for the OpenAPI schema.
+    """
+    return Response(
+        model.model_dump_json(by_alias=True),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class PageLinks:
+    id: int
+    path: str
+    updated_at: str
+    links: list[str] = field(default_factory=list)
+
+
+def _is_asset(target: str) -> bool:
+    return "." in target.rsplit("/", 1)[-1]
+
+
+class LinkGraph:
+    """Outbound internal links per page, keyed by page id."""
+
+    def __init__(self) -> None:
+        self.pages: dict[int, PageLinks] = {}
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def versions(self) -> dict[int, str]:
+        return {page.id: page.updated_at for page in self.pages.values()}
+
+    def set_page(self, page_id: int, path: str, updated_at: str, links: list[str]) -> None:
+        self.pages[int(page_id)] = PageLinks(int(page_id), path.strip("/"), updated_at, links)
+
+    def remove(self, page_id: int) -> bool:
+        return self.pages.pop(int(page_id), None) is not None
+
+    def resolve(self, target: str, known: set[str], locale: str | None = None) -> str | None:
+        """Map a link target to an existing page path, tolerating a leading locale segment."""
+        if target in known:
+            return target
+        if locale:
+            head, _, rest = target.partition("/")
+            if head == locale and rest in known:
+                return rest
+        return None
+
+    def report(self, *, locale: str | None = None, top: int = 20) -> dict[str, Any]:
+        known = {page.path for page in self.pages.values()}
+        inbound: Counter[str] = Counter()
+        broken: list[dict[str, str]] = []
+        link_count = 0
+
+        for page in sorted(self.pages.values(), key=lambda p: p.path):
+            for target in page.links:
+                if _is_asset(target):
+                    continue
+                link_count += 1
+                resolved = self.resolve(target, known, locale)
+                if resolved is None:
+                    broken.append({"source": page.path, "target": target})
+                elif resolved != page.path:
+                    inbound[resolved] += 1
+
+        orphans = sorted(path for path in known if not inbound[path])
+        most_linked = [
+            {"path": path, "inbound": count}
+            for path, count in sorted(inbound.items(), key=lambda item: (-item[1], item[0]))[:top]
+        ]
+        return {
+            "page_count": len(self.pages),
+            "link_count": link_count,
+            "broken": broken,
+            "orphans": orphans,
+            "most_linked": most_linked,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": 1,
+            "pages": [[p.id, p.path, p.updated_at, p.links] for p in self.pages.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LinkGraph":
+        graph = cls()
+        for page_id, path, updated_at, links in data.get("pages", []):
+            graph.set_page(page_id, path, updated_at, list(links))
+        return graph
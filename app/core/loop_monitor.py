@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from app.core.config import env_flag, env_float
+from app.core.metrics import LOOP_BLOCKED, LOOP_LAG, LOOP_LAG_LAST
+
+
+logger = logging.getLogger("wikimgr.loop")
+
+_INTERVAL_MS_DEFAULT = 250.0
+_BLOCK_MS_DEFAULT = 100.0
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag with a periodic timer and, in debug mode, reports what blocks it.
+
+    The probe task sleeps ``interval_s`` and records how much later than scheduled it woke
+    up. The debug watchdog is a plain thread: when the probe has not ticked for
+    ``interval_s + block_s`` it captures the loop thread's current stack, which points at
+    the blocking call (a sync HTTP request, a big ``json.dumps``, ...), and logs it once
+    per stall.
+    """
+
+    def __init__(self, interval_s: float = 0.25, block_s: float = 0.1, debug: bool = False):
+        self.interval_s = interval_s
+        self.block_s = block_s
+        self.debug = debug
+        self.max_lag_s = 0.0
+        self._last_tick = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._loop_thread: int | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_env(cls) -> "LoopLagMonitor":
+        return cls(
+            interval_s=env_float("WIKIMGR_LOOP_LAG_INTERVAL_MS", _INTERVAL_MS_DEFAULT, 1.0)
+            / 1000.0,
+            block_s=env_float("WIKIMGR_LOOP_BLOCK_MS", _BLOCK_MS_DEFAULT, 1.0) / 1000.0,
+            debug=env_flag("WIKIMGR_LOOP_DEBUG"),
+        )
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopped.clear()
+        self._task = loop.create_task(self._probe(), name="wikimgr-loop-lag")
+        if self.debug:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="wikimgr-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    async def _probe(self) -> None:
+        lag_hist = LOOP_LAG.labels()
+        lag_last = LOOP_LAG_LAST.labels()
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval_s)
+            now = time.monotonic()
+            lag = max(0.0, now - start - self.interval_s)
+            self._last_tick = now
+            self.max_lag_s = max(self.max_lag_s, lag)
+            lag_hist.observe(lag)
+            lag_last.set(lag)
+
+    def _watch(self) -> None:
+        reported_tick = 0.0
+        poll_s = max(0.005, self.block_s / 4)
+        while not self._stopped.wait(poll_s):
+            tick = self._last_tick
+            stalled = time.monotonic() - tick - self.interval_s
+            if stalled < self.block_s or tick == reported_tick:
+                continue
+            reported_tick = tick
+            frame = sys._current_frames().get(self._loop_thread or 0)
+            if frame is None:
+                continue
+            LOOP_BLOCKED.labels().inc()
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                "event loop blocked",
+                extra={"fields": {"blocked_ms": round(stalled * 1000.0, 1), "stack": stack}},
+            )
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_REGISTRY: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+        _REGISTRY.append(self)
+
+    def labels(self, **labels: str):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self): ...
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]: ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def _samples(self) -> Iterator[str]:
+        for key, child in sorted(self._children.items()):
+            yield f"{self.name}_total{_label_str(self.labelnames, key)} {_fmt(child.value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def _samples(self) -> Iterator[str]:
+        for key, child in sorted(self._children.items()):
+            yield f"{self.name}{_label_str(self.labelnames, key)} {_fmt(child.value)}"
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def _samples(self) -> Iterator[str]:
+        for key, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), child.counts):
+                cumulative += count
+                le = _label_str(self.labelnames, key, f'le="{_fmt(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            labels = _label_str(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_fmt(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in _REGISTRY) + "\n"
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "wikimgr_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+UPSTREAM_REQUESTS = Counter(
+    "wikimgr_upstream_requests",
+    "Wiki.js GraphQL calls by operation and outcome.",
+    ("operation", "outcome"),
+)
+UPSTREAM_DURATION = Histogram(
+    "wikimgr_upstream_request_duration_seconds",
+    "Wiki.js GraphQL call latency by operation.",
+    ("operation",),
+)
+UPSTREAM_RETRIES = Counter(
+    "wikimgr_upstream_retries",
+    "Wiki.js GraphQL retries by operation.",
+    ("operation",),
+)
+CACHE_REQUESTS = Counter(
+    "wikimgr_cache_requests",
+    "In-process cache lookups by cache and result (hit/miss).",
+    ("cache", "result"),
+)
+CACHE_WRITE_ERRORS = Counter(
+    "wikimgr_cache_write_errors",
+    "Cache and index updates that failed after Wiki.js committed a write, by step.",
+    ("step",),
+)
+BULK_IN_PROGRESS = Gauge(
+    "wikimgr_bulk_operations_in_progress",
+    "Bulk operations currently running.",
+    ("operation",),
+)
+BULK_INTERRUPTED = Counter(
+    "wikimgr_bulk_operations_interrupted",
+    "Bulk operations stopped early by shutdown, with their remaining items journaled.",
+    ("operation",),
+)
+LOG_RECORDS_DROPPED = Counter(
+    "wikimgr_log_records_dropped",
+    "Log records dropped because the log queue was full.",
+)
+LOOP_LAG = Histogram(
+    "wikimgr_event_loop_lag_seconds",
+    "How late the event loop ran a timer scheduled every probe interval.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_LAG_LAST = Gauge(
+    "wikimgr_event_loop_lag_last_seconds",
+    "Event loop lag measured by the most recent probe.",
+)
+LOOP_BLOCKED = Counter(
+    "wikimgr_event_loop_blocked",
+    "Stalls longer than WIKIMGR_LOOP_BLOCK_MS seen by the debug watchdog.",
+)
+RESPONSE_COMPRESSION_BYTES = Counter(
+    "wikimgr_response_compression_bytes",
+    "Response body bytes before (raw) and after (sent) compression, by encoding.",
+    ("encoding", "stage"),
+)
+ADMISSION_INFLIGHT = Gauge(
+    "wikimgr_admission_inflight",
+    "Requests currently admitted, by route class (read/write/bulk).",
+    ("route_class",),
+)
+ADMISSION_REJECTIONS = Counter(
+    "wikimgr_admission_rejections",
+    "Requests shed with 429, by route class and reason (queue_full/deadline/quota).",
+    ("route_class", "reason"),
+)
+UPSTREAM_CONCURRENCY_LIMIT = Gauge(
+    "wikimgr_upstream_concurrency_limit",
+    "Current adaptive concurrency window for Wiki.js calls.",
+)
+UPSTREAM_INFLIGHT = Gauge(
+    "wikimgr_upstream_inflight",
+    "Wiki.js calls currently holding a concurrency slot.",
+)
+UPSTREAM_QUEUE_DEPTH = Gauge(
+    "wikimgr_upstream_queue_depth",
+    "Wiki.js calls waiting for a concurrency slot, by priority class.",
+    ("priority",),
+)
+UPSTREAM_QUEUE_WAIT = Histogram(
+    "wikimgr_upstream_queue_wait_seconds",
+    "Time Wiki.js calls waited for a concurrency slot, by priority class.",
+    ("priority",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+UPSTREAM_RETRY_BUDGET_EXHAUSTED = Counter(
+    "wikimgr_upstream_retry_budget_exhausted",
+    "Retries or hedges skipped because the retry budget was spent.",
+    ("operation",),
+)
+UPSTREAM_HEDGES = Counter(
+    "wikimgr_upstream_hedges",
+    "Hedged reads sent, by which attempt answered first (primary/hedge/none).",
+    ("operation", "winner"),
+)
+UPSTREAM_CIRCUIT_STATE = Gauge(
+    "wikimgr_upstream_circuit_state",
+    "Circuit breaker state per upstream: 0 closed, 1 half-open, 2 open.",
+    ("upstream",),
+)
+UPSTREAM_REJECTIONS = Counter(
+    "wikimgr_upstream_rejections",
+    "Wiki.js calls shed by wikimgr before being sent, by reason.",
+    ("reason",),
+)
+UPSTREAM_PROBES = Counter(
+    "wikimgr_upstream_probes",
+    "Background Wiki.js readiness probes by outcome.",
+    ("outcome",),
+)
+UPSTREAM_PROBE_DURATION = Histogram(
+    "wikimgr_upstream_probe_duration_seconds",
+    "Latency of background Wiki.js readiness probes.",
+)
+UPSTREAM_HEALTH = Gauge(
+    "wikimgr_upstream_health",
+    "Wiki.js health from the background probe: 0 ok, 1 degraded, 2 down.",
+)
+
+
+@contextmanager
+def observe_upstream(operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except asyncio.CancelledError:
+        # a hedged read that lost the race
+        outcome = "cancelled"
+        raise
+    finally:
+        UPSTREAM_DURATION.labels(operation=operation).observe(time.perf_counter() - start)
+        UPSTREAM_REQUESTS.labels(operation=operation, outcome=outcome).inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+async def observe_request(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response: Response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        ).observe(time.perf_counter() - start)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterable
+
+import numpy as np
+
+from app.core.search_index import tokenize
+
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+LSH_BANDS = 32
+_EMPTY = np.empty(0, dtype=np.uint64)
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Sorted unique 32-bit hashes of the ``k``-word shingles of ``text``."""
+    tokens = tokenize(text)
+    if not tokens:
+        return _EMPTY
+    if len(tokens) < k:
+        grams = [" ".join(tokens)]
+    else:
+        grams = [" ".join(tokens[i : i + k]) for i in range(len(tokens) - k + 1)]
+    hashes = np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+    return np.unique(hashes)
+
+
+class MinHasher:
+    """MinHash over multiply-shift hashes: ``h(x) = ((a*x + b) mod 2**64) >> 32``."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        if hashes.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        with np.errstate(over="ignore"):
+            permuted = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int = LSH_BANDS) -> set[tuple[int, int]]:
+    """Row indices that share at least one identical band of their signatures."""
+    n, num_perm = signatures.shape
+    if n < 2:
+        return set()
+    rows = num_perm // bands
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+        buckets: dict[bytes, list[int]] = {}
+        for idx in range(n):
+            buckets.setdefault(chunk[idx].tobytes(), []).append(idx)
+        for members in buckets.values():
+            for i, left in enumerate(members):
+                for right in members[i + 1 :]:
+                    pairs.add((left, right))
+    return pairs
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    if a.size == 0 or b.size == 0:
+        return 0.0
+    inter = np.intersect1d(a, b, assume_unique=True).size
+    return inter / (a.size + b.size - inter)
+
+
+def connected_components(n: int, edges: Iterable[tuple[int, int]]) -> list[list[int]]:
+    parent = list(range(n))
+
+    def _find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for left, right in edges:
+        root_l, root_r = _find(left), _find(right)
+        if root_l != root_r:
+            parent[root_r] = root_l
+
+    groups: dict[int, list[int]] = {}
+    for idx in range(n):
+        groups.setdefault(_find(idx), []).append(idx)
+    return [members for members in groups.values() if len(members) > 1]
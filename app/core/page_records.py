@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+
+def _split(path: str) -> list[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+class PageRecords(Mapping[str, int]):
+    """Compact page listing: ids, titles and paths stored as columns.
+
+    A path is kept as a run of segment numbers in one flat ``array`` (4 bytes each), and each
+    distinct segment string is stored once in ``segments``; folders repeat across pages, so
+    mostly the leaf slugs are stored per page. Rows keep the listing order. Path lookups
+    bisect a sorted column of path hashes, built on first use, and compare the one
+    candidate, instead of a dict entry and key string per page.
+
+    Read as a mapping, it is ``path -> id`` for paths stored as their non-empty segments
+    joined by ``/``. Records are immutable once built; ``PathIndex`` layers changes on top.
+    """
+
+    __slots__ = ("ids", "titles", "segments", "_segment_ids", "_offsets", "_lookup")
+
+    def __init__(
+        self, ids: array, titles: list[str], segments: list[str], segment_ids: array, offsets: array
+    ):
+        self.ids = ids
+        self.titles = titles
+        self.segments = segments
+        self._segment_ids = segment_ids
+        self._offsets = offsets
+        self._lookup: tuple[array, array] | None = None
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Mapping[str, Any]], titles: bool = True) -> "PageRecords":
+        """Build from Wiki.js ``pages.list`` items (``id``, ``path``, optional ``title``).
+
+        With ``titles=False`` the ``titles`` column stays empty, e.g. for the path index.
+        """
+        ids = array("q")
+        title_column: list[str] = []
+        segments: list[str] = []
+        numbers: dict[str, int] = {}
+        segment_ids = array("I")
+        offsets = array("I", [0])
+        for page in pages:
+            ids.append(int(page["id"]))
+            if titles:
+                title_column.append(page.get("title") or "")
+            for segment in _split(page.get("path") or ""):
+                number = numbers.get(segment)
+                if number is None:
+                    number = numbers[segment] = len(segments)
+                    segments.append(segment)
+                segment_ids.append(number)
+            offsets.append(len(segment_ids))
+        return cls(ids, title_column, segments, segment_ids, offsets)
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> "PageRecords":
+        return cls.from_pages(({"id": 0, "path": path} for path in paths), titles=False)
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, int]) -> "PageRecords":
+        return cls.from_pages(
+            ({"id": page_id, "path": path} for path, page_id in mapping.items()), titles=False
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def segment_ids(self, row: int) -> array:
+        return self._segment_ids[self._offsets[row] : self._offsets[row + 1]]
+
+    def segments_of(self, row: int) -> tuple[str, ...]:
+        return tuple(map(self.segments.__getitem__, self.segment_ids(row)))
+
+    def root(self, row: int) -> str | None:
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return self.segments[self._segment_ids[start]] if end > start else None
+
+    def path(self, row: int) -> str:
+        return "/".join(map(self.segments.__getitem__, self.segment_ids(row)))
+
+    def sorted_rows(self) -> list[int]:
+        """Rows ordered by path segments, so tree children come out sorted."""
+        return sorted(range(len(self.ids)), key=self.segments_of)
+
+    def _build_lookup(self) -> tuple[array, array]:
+        # built on the first lookup: the tree and preflight only walk the rows
+        hashes = [hash(self.path(row)) for row in range(len(self.ids))]
+        by_hash = sorted(range(len(self.ids)), key=hashes.__getitem__)
+        self._lookup = (array("q", [hashes[row] for row in by_hash]), array("I", by_hash))
+        return self._lookup
+
+    def find(self, path: str) -> int | None:
+        """Row of ``path`` (the last one if listed twice, like a dict), or None."""
+        key = path.strip("/")
+        if "//" in key:
+            key = "/".join(_split(key))
+        hashed = hash(key)
+        hashes, by_hash = self._lookup or self._build_lookup()
+        pos = bisect_left(hashes, hashed)
+        found = None
+        # rows with equal hashes sit together, in listing order
+        while pos < len(hashes) and hashes[pos] == hashed:
+            row = by_hash[pos]
+            if self.path(row) == key:
+                found = row
+            pos += 1
+        return found
+
+    def __getitem__(self, path: str) -> int:
+        row = self.find(path)
+        if row is None:
+            raise KeyError(path)
+        return self.ids[row]
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self.find(path) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.path(row) for row in range(len(self.ids)))
+
+    def items(self) -> Iterator[tuple[str, int]]:  # type: ignore[override]
+        # listing order, without a lookup per key
+        return ((self.path(row), page_id) for row, page_id in enumerate(self.ids))
+
+
+class PathIndex:
+    """``path -> id`` cache over a ``PageRecords`` snapshot and the changes made since.
+
+    ``replace`` installs a fresh snapshot (a full listing). Paths learned one at a time go to
+    a small overlay dict, and forgotten rows to a set, until the next ``replace``. It has the
+    interface of ``SharedMap``, which takes its place when workers share the cache.
+
+    Writers come from threadpool threads, so changes take a lock; reads do not, since a
+    snapshot is never modified in place.
+    """
+
+    __slots__ = ("_records", "_learned", "_dropped", "_lock")
+
+    def __init__(self, records: PageRecords | None = None):
+        self._records = records if records is not None else PageRecords.from_pages(())
+        self._learned: dict[str, int] = {}
+        self._dropped: set[int] = set()
+        self._lock = threading.Lock()
+
+    def _row(self, path: str) -> int | None:
+        row = self._records.find(path)
+        return None if row is None or row in self._dropped else row
+
+    def get(self, path: str, default: Any = None) -> Any:
+        value = self._learned.get(path)
+        if value is not None:
+            return value
+        row = self._row(path)
+        return default if row is None else self._records.ids[row]
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def __getitem__(self, path: str) -> int:
+        value = self.get(path)
+        if value is None:
+            raise KeyError(path)
+        return value
+
+    def __setitem__(self, path: str, page_id: int) -> None:
+        with self._lock:
+            row = self._records.find(path)
+            if row is not None and self._records.ids[row] == page_id:
+                self._dropped.discard(row)
+                self._learned.pop(path, None)
+            else:
+                self._learned[path] = page_id
+                if row is not None:
+                    # the snapshot row is stale now; remove_value(page_id) must not bring it back
+                    self._dropped.add(row)
+
+    def __len__(self) -> int:
+        return (
+            len(self._records)
+            - len(self._dropped)
+            + sum(1 for path in list(self._learned) if self._row(path) is None)
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        records = self._records
+        learned = self._learned
+        for row in range(len(records)):
+            if row not in self._dropped:
+                path = records.path(row)
+                if path not in learned:
+                    yield path
+        yield from list(learned)
+
+    def pop(self, path: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self.get(path, default)
+            self._learned.pop(path, None)
+            row = self._row(path)
+            if row is not None:
+                self._dropped.add(row)
+            return value
+
+    def remove_value(self, page_id: int) -> None:
+        """Drop every path that maps to ``page_id`` (e.g. all paths cached for a page id)."""
+        with self._lock:
+            for path in [path for path, value in self._learned.items() if value == page_id]:
+                self._learned.pop(path, None)
+            ids = self._records.ids
+            row = -1
+            while True:
+                try:
+                    row = ids.index(page_id, row + 1)
+                except ValueError:
+                    return
+                self._dropped.add(row)
+
+    def replace(self, items: Mapping[str, int]) -> None:
+        # built outside the lock; only the swap has to exclude writers
+        records = items if isinstance(items, PageRecords) else PageRecords.from_mapping(items)
+        with self._lock:
+            self._records, self._learned, self._dropped = records, {}, set()
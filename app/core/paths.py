@@ -3,6 +3,8 @@ from __future__ import annotations
 import os
 import re
 
+from app.core.page_records import PageRecords
+
 
 _SEGMENT_SEP_RE = re.compile(r"[ _]+")
 _SEGMENT_BAD_RE = re.compile(r"[^a-z0-9-]+")
@@ -80,16 +82,29 @@ def _keyword_root_suggestions(normalized: str, allowed_roots: list[str]) -> list
     return out
 
 
-def _segment_overlap_score(path_a: str, path_b: str) -> int:
-    seg_a = {s for s in normalize_path(path_a).strip("/").split("/") if s}
-    seg_b = {s for s in normalize_path(path_b).strip("/").split("/") if s}
-    if not seg_a or not seg_b:
-        return 0
-    return len(seg_a.intersection(seg_b))
+def _overlap_scores(normalized: str, records: PageRecords) -> list[tuple[int, str]]:
+    """(shared normalized segments, normalized path) for every page sharing at least one.
+
+    Each distinct segment is normalized once instead of once per page that uses it.
+    """
+    wanted = {s for s in normalized.strip("/").split("/") if s}
+    if not wanted:
+        return []
+    matches = [normalize_segment(segment) for segment in records.segments]
+    matches = [segment if segment in wanted else None for segment in matches]
+    if not any(matches):
+        return []
+    scored: list[tuple[int, str]] = []
+    for row in range(len(records)):
+        shared = {matches[number] for number in records.segment_ids(row)}
+        shared.discard(None)
+        if shared:
+            scored.append((len(shared), normalize_path(records.path(row))))
+    return scored
 
 
 def preflight_analysis(
-    raw_path: str, *, allowed_roots: list[str], existing_paths: list[str]
+    raw_path: str, *, allowed_roots: list[str], existing_paths: list[str] | PageRecords
 ) -> dict:
     normalized = normalize_path(raw_path)
     root = root_from_path(normalized)
@@ -111,13 +126,12 @@ def preflight_analysis(
             if candidate not in suggestions:
                 suggestions.append(candidate)
 
-    scored: list[tuple[int, str]] = []
-    for path in existing_paths:
-        candidate = normalize_path(path)
-        score = _segment_overlap_score(normalized, candidate)
-        if score > 0:
-            scored.append((score, candidate))
-
+    records = (
+        existing_paths
+        if isinstance(existing_paths, PageRecords)
+        else PageRecords.from_paths(existing_paths)
+    )
+    scored = _overlap_scores(normalized, records)
     for _, candidate in sorted(scored, key=lambda item: (-item[0], item[1])):
         if candidate not in suggestions:
             suggestions.append(candidate)
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import cProfile
+import fnmatch
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Literal
+
+from starlette.requests import Request
+
+from app.core.errors import APIError
+
+
+ProfileMode = Literal["sampling", "cprofile"]
+
+# The admin endpoints themselves are never profiled.
+_SELF_PREFIX = "/api/v1/admin/profile"
+
+
+def _short_file(filename: str) -> str:
+    idx = filename.rfind("site-packages" + os.sep)
+    if idx >= 0:
+        return filename[idx + len("site-packages") + 1 :]
+    cwd = os.getcwd() + os.sep
+    return filename[len(cwd) :] if filename.startswith(cwd) else os.path.basename(filename)
+
+
+def _frame_label(code) -> str:
+    return f"{_short_file(code.co_filename)}:{code.co_name}"
+
+
+def _is_idle(stack: tuple[str, ...]) -> bool:
+    """Parked worker threads and the event loop waiting in ``select`` are not work."""
+    leaf = stack[-1]
+    if leaf.endswith("selectors.py:select"):
+        return True
+    return leaf.endswith("threading.py:wait") and any(f.endswith("queue.py:get") for f in stack)
+
+
+class ProfileSession:
+    """Collects stats for the next ``requests`` requests whose path matches ``route``.
+
+    ``sampling`` walks every thread's stack each ``interval_s`` (wall clock, so time spent
+    waiting on Wiki.js shows up) while a profiled request is in flight. ``cprofile`` is
+    deterministic but only sees the event-loop thread: async handlers, middleware and
+    response serialization, not sync endpoints running in the threadpool.
+    """
+
+    def __init__(
+        self,
+        route: str,
+        requests: int,
+        mode: ProfileMode = "sampling",
+        interval_s: float = 0.005,
+        timeout_s: float = 300.0,
+    ):
+        self.route = route
+        self.mode = mode
+        self.interval_s = interval_s
+        self.requested = requests
+        self.remaining = requests
+        self.profiled = 0
+        self.started_at = time.time()
+        self.deadline = time.monotonic() + timeout_s
+        self.finished_at: float | None = None
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.sample_count = 0
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._profiler = cProfile.Profile() if mode == "cprofile" else None
+        self._sampler: threading.Thread | None = None
+        if mode == "sampling":
+            self._sampler = threading.Thread(
+                target=self._sample_loop, name="wikimgr-profiler", daemon=True
+            )
+            self._sampler.start()
+
+    @property
+    def active(self) -> bool:
+        return not self._done.is_set()
+
+    def matches(self, path: str) -> bool:
+        return not path.startswith(_SELF_PREFIX) and fnmatch.fnmatchcase(path, self.route)
+
+    def check_deadline(self) -> None:
+        if self.active and time.monotonic() > self.deadline:
+            self.stop()
+
+    def claim(self, path: str) -> bool:
+        if not self.matches(path):
+            return False
+        self.check_deadline()
+        with self._lock:
+            if self.remaining <= 0 or self._done.is_set():
+                return False
+            self.remaining -= 1
+            self._inflight += 1
+            if self._profiler is not None and self._inflight == 1:
+                self._profiler.enable()
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._inflight -= 1
+            self.profiled += 1
+            if self._profiler is not None and self._inflight == 0:
+                self._profiler.disable()
+            if self.remaining <= 0 and self._inflight == 0:
+                self._finish_locked()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._profiler is not None and self._inflight > 0:
+                self._profiler.disable()
+            self._finish_locked()
+
+    def _finish_locked(self) -> None:
+        if not self._done.is_set():
+            self.finished_at = time.time()
+            self._done.set()
+            _deactivate(self)
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self._done.wait(self.interval_s):
+            self.check_deadline()
+            if not self._inflight:
+                continue
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack: list[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                key = tuple(stack)
+                if key and not _is_idle(key):
+                    self.samples[key] += 1
+                    self.sample_count += 1
+
+    def join_sampler(self) -> None:
+        if self._sampler is not None and self._sampler is not threading.current_thread():
+            self._sampler.join(timeout=1.0)
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed stacks (``a;b;c count``), for flamegraph.pl or speedscope."""
+        if self.mode != "sampling":
+            raise APIError(400, "invalid_format", "collapsed output needs a sampling profile")
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def pstats_text(self, sort: str = "cumulative", limit: int = 50) -> str:
+        if self._profiler is not None:
+            buf = io.StringIO()
+            try:
+                pstats.Stats(self._profiler, stream=buf).sort_stats(sort).print_stats(limit)
+            except (TypeError, KeyError):
+                # no calls recorded, or an unknown sort key
+                raise APIError(
+                    400, "invalid_profile", f"Cannot render cProfile stats sorted by {sort!r}"
+                )
+            return buf.getvalue()
+        return self._sampled_table(sort, limit)
+
+    def _sampled_table(self, sort: str, limit: int) -> str:
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        table = own if sort in ("tottime", "time", "self") else total
+        n = self.sample_count or 1
+        lines = [
+            f"{self.sample_count} samples every {self.interval_s * 1000.0:.1f}ms "
+            f"over {self.profiled} request(s) matching {self.route!r}",
+            "",
+            f"{'self':>8} {'self%':>7} {'total':>8} {'total%':>7}  function",
+        ]
+        for label, _ in table.most_common(limit):
+            lines.append(
+                f"{own[label]:>8} {own[label] * 100.0 / n:>6.1f}% {total[label]:>8} "
+                f"{total[label] * 100.0 / n:>6.1f}%  {label}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def prof_bytes(self) -> bytes:
+        """Marshalled stats in the ``.prof`` format read by ``pstats``/snakeviz."""
+        if self._profiler is None:
+            raise APIError(400, "invalid_format", "prof output needs a cprofile profile")
+        self._profiler.create_stats()
+        return marshal.dumps(self._profiler.stats)
+
+    def status(self) -> dict:
+        return {
+            "active": self.active,
+            "mode": self.mode,
+            "route": self.route,
+            "requests": self.requested,
+            "remaining": self.remaining,
+            "profiled": self.profiled,
+            "samples": self.sample_count,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+# ``_ACTIVE`` is the only thing the middleware reads; it is None unless a session is collecting.
+_ACTIVE: ProfileSession | None = None
+_LAST: ProfileSession | None = None
+_STATE_LOCK = threading.Lock()
+
+
+def _deactivate(session: ProfileSession) -> None:
+    global _ACTIVE
+    if _ACTIVE is session:
+        _ACTIVE = None
+
+
+def start_profile(
+    route: str, requests: int, mode: ProfileMode, interval_s: float, timeout_s: float
+) -> ProfileSession:
+    global _ACTIVE, _LAST
+    with _STATE_LOCK:
+        if _ACTIVE is not None:
+            raise APIError(409, "profile_running", "A profiling session is already collecting")
+        session = ProfileSession(route, requests, mode, interval_s, timeout_s)
+        _LAST = session
+        _ACTIVE = session
+    return session
+
+
+def stop_profile() -> ProfileSession:
+    session = current_profile()
+    session.stop()
+    return session
+
+
+def current_profile() -> ProfileSession:
+    if _LAST is None:
+        raise APIError(404, "no_profile", "No profiling session has been started")
+    _LAST.check_deadline()
+    return _LAST
+
+
+def finished_profile() -> ProfileSession:
+    session = current_profile()
+    if session.active:
+        raise APIError(
+            409,
+            "profile_running",
+            "Profiling session is still collecting",
+            details={"remaining": session.remaining},
+        )
+    session.join_sampler()
+    return session
+
+
+async def profile_request(request: Request, call_next):
+    session = _ACTIVE
+    if session is None or not session.claim(request.url.path):
+        return await call_next(request)
+    try:
+        return await call_next(request)
+    finally:
+        session.release()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from app.core.config import env_flag, env_float
+from app.core.metrics import UPSTREAM_RETRY_BUDGET_EXHAUSTED
+
+
+# Reads that are safe to repeat or race against each other.
+IDEMPOTENT_OPERATIONS = frozenset({"singleByPath", "single", "list", "search"})
+HEDGEABLE_OPERATIONS = frozenset({"singleByPath", "single", "list"})
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE_S = 0.5
+BACKOFF_CAP_S = 8.0
+# Never honour a Retry-After longer than this; give up instead.
+MAX_RETRY_AFTER_S = 30.0
+
+
+def full_jitter(
+    attempt: int, base_s: float = BACKOFF_BASE_S, cap_s: float = BACKOFF_CAP_S
+) -> float:
+    """AWS-style full jitter: uniform in ``[0, min(cap, base * 2**attempt)]``."""
+    return random.uniform(0.0, min(cap_s, base_s * (2**attempt)))
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """Parse ``Retry-After`` as delta-seconds or an HTTP date."""
+    raw = response.headers.get("Retry-After")
+    if not raw:
+        return None
+    raw = raw.strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def is_retryable(exc: BaseException, operation: str) -> bool:
+    """Reads retry on any transport error, 5xx or 429. Mutations only retry when the
+    request cannot have been applied: connection failures, 429 and 503."""
+    idempotent = operation in IDEMPOTENT_OPERATIONS
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    if isinstance(exc, httpx.RequestError):
+        return idempotent
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        if status in (429, 503):
+            return True
+        return idempotent and status >= 500
+    return False
+
+
+class RetryBudget:
+    """Caps retries to a fraction of traffic so a sick upstream is not hit with a retry storm.
+
+    Every request deposits ``ratio`` tokens and every retry or hedge spends one. A floor of
+    ``min_per_s`` tokens per second keeps low-traffic instances able to retry at all. The
+    balance never exceeds ``cap``.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_s: float = 1.0, cap: float = 20.0):
+        self.ratio = ratio
+        self.min_per_s = min_per_s
+        self.cap = cap
+        self._balance = cap
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill_locked(self) -> None:
+        now = time.monotonic()
+        self._balance = min(self.cap, self._balance + (now - self._updated) * self.min_per_s)
+        self._updated = now
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._refill_locked()
+            self._balance = min(self.cap, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill_locked()
+            if self._balance < 1.0:
+                return False
+            self._balance -= 1.0
+            return True
+
+    @property
+    def balance(self) -> float:
+        with self._lock:
+            self._refill_locked()
+            return self._balance
+
+
+class LatencyTracker:
+    """Recent successful-call latencies per operation, for the hedge delay."""
+
+    def __init__(self, window: int = 256, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(operation)
+            if samples is None:
+                samples = self._samples[operation] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, operation: str, pct: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(operation, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(1, math.ceil(pct / 100.0 * len(samples)))
+        return samples[rank - 1]
+
+
+def retry_delay(exc: BaseException, operation: str, attempt: int) -> float | None:
+    """Seconds to wait before the next attempt, or None to give up now.
+
+    ``Retry-After`` wins over jittered backoff; a longer one than ``MAX_RETRY_AFTER_S``,
+    a non-retryable error, the last attempt or an empty budget all end the chain.
+    """
+    if attempt + 1 >= MAX_ATTEMPTS or not is_retryable(exc, operation):
+        return None
+    retry_after = (
+        retry_after_seconds(exc.response) if isinstance(exc, httpx.HTTPStatusError) else None
+    )
+    if retry_after is not None and retry_after > MAX_RETRY_AFTER_S:
+        return None
+    if not RETRY_BUDGET.try_spend():
+        UPSTREAM_RETRY_BUDGET_EXHAUSTED.labels(operation=operation).inc()
+        return None
+    return retry_after if retry_after is not None else full_jitter(attempt)
+
+
+def hedging_enabled() -> bool:
+    return env_flag("WIKIMGR_HEDGE_READS")
+
+
+def hedge_delay_s(operation: str) -> float:
+    """p95 of recent latencies for ``operation``, floored; a fixed default until warmed up."""
+    floor = env_float("WIKIMGR_HEDGE_MIN_DELAY_MS", 10.0, 0.0) / 1000.0
+    p95 = UPSTREAM_LATENCY.percentile(operation, 95)
+    if p95 is None:
+        return max(floor, env_float("WIKIMGR_HEDGE_DEFAULT_DELAY_MS", 250.0, 0.0) / 1000.0)
+    return max(floor, p95)
+
+
+RETRY_BUDGET = RetryBudget(
+    ratio=env_float("WIKIMGR_RETRY_BUDGET_RATIO", 0.2, 0.0),
+    min_per_s=env_float("WIKIMGR_RETRY_BUDGET_MIN_PER_S", 1.0, 0.0),
+)
+UPSTREAM_LATENCY = LatencyTracker()
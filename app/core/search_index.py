@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+_FENCE_RE = re.compile(r"^(```|~~~).*$", re.MULTILINE)
+_LINK_TARGET_RE = re.compile(r"\]\([^)]*\)")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to was with".split()
+)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 3.0
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with markdown syntax, link targets and stopwords removed."""
+    if not text:
+        return []
+    text = _FENCE_RE.sub(" ", text)
+    text = _LINK_TARGET_RE.sub("]", text)
+    text = _HTML_TAG_RE.sub(" ", text)
+    return [tok for tok in _TOKEN_RE.findall(text.lower()) if tok not in _STOPWORDS]
+
+
+def _path_matches(path: str, prefixes: list[str]) -> bool:
+    for prefix in prefixes:
+        if not prefix or path == prefix or path.startswith(prefix + "/"):
+            return True
+    return False
+
+
+@dataclass(slots=True)
+class IndexedDoc:
+    id: int
+    path: str
+    title: str
+    updated_at: str
+    length: float
+    terms: dict[str, float] = field(default_factory=dict)
+
+
+class SearchIndex:
+    """In-memory inverted index ranked with BM25; title terms count ``title_boost`` times."""
+
+    def __init__(self, *, k1: float = BM25_K1, b: float = BM25_B, title_boost: float = TITLE_BOOST):
+        self.k1 = k1
+        self.b = b
+        self.title_boost = title_boost
+        self.docs: dict[int, IndexedDoc] = {}
+        self.postings: dict[str, dict[int, float]] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def versions(self) -> dict[int, str]:
+        return {doc.id: doc.updated_at for doc in self.docs.values()}
+
+    def upsert(
+        self,
+        page_id: int,
+        path: str,
+        title: str,
+        content: str,
+        updated_at: str = "",
+    ) -> None:
+        terms: Counter[str] = Counter(tokenize(content))
+        for tok in tokenize(title):
+            terms[tok] += self.title_boost
+        self._add(
+            IndexedDoc(
+                id=int(page_id),
+                path=path.strip("/"),
+                title=title,
+                updated_at=updated_at,
+                length=float(sum(terms.values())),
+                terms=dict(terms),
+            )
+        )
+
+    def _add(self, doc: IndexedDoc) -> None:
+        self.remove(doc.id)
+        self.docs[doc.id] = doc
+        self._total_length += doc.length
+        for term, tf in doc.terms.items():
+            self.postings.setdefault(term, {})[doc.id] = tf
+
+    def remove(self, page_id: int) -> bool:
+        doc = self.docs.pop(int(page_id), None)
+        if doc is None:
+            return False
+        self._total_length -= doc.length
+        for term in doc.terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc.id, None)
+            if not posting:
+                del self.postings[term]
+        return True
+
+    def search(
+        self,
+        query: str,
+        *,
+        prefixes: Iterable[str] = (),
+        limit: int = 20,
+    ) -> list[tuple[IndexedDoc, float]]:
+        terms = set(tokenize(query))
+        if not terms or not self.docs:
+            return []
+        wanted = [p.strip("/") for p in prefixes]
+
+        n_docs = len(self.docs)
+        avg_len = (self._total_length / n_docs) or 1.0
+        scores: dict[int, float] = {}
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                doc = self.docs[doc_id]
+                norm = self.k1 * (1.0 - self.b + self.b * doc.length / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        if wanted:
+            scores = {
+                doc_id: score
+                for doc_id, score in scores.items()
+                if _path_matches(self.docs[doc_id].path, wanted)
+            }
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self.docs[doc_id], score) for doc_id, score in top]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": 1,
+            "title_boost": self.title_boost,
+            "docs": [
+                [doc.id, doc.path, doc.title, doc.updated_at, doc.terms]
+                for doc in self.docs.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SearchIndex":
+        index = cls(title_boost=float(data.get("title_boost", TITLE_BOOST)))
+        for page_id, path, title, updated_at, terms in data.get("docs", []):
+            index._add(
+                IndexedDoc(
+                    id=int(page_id),
+                    path=path,
+                    title=title,
+                    updated_at=updated_at,
+                    length=float(sum(terms.values())),
+                    terms=terms,
+                )
+            )
+        return index
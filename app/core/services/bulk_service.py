@@ -1,16 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import inspect
+import logging
 import re
+import time
 from typing import Any
 
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.concurrency import current_priority, upstream_priority
+from app.core.drain import journal_interrupted, shutdown_drain
 from app.core.errors import APIError
+from app.core.metrics import BULK_IN_PROGRESS
 from app.core.services.pages_service import get_page, upsert_page
 from app.models import (
     BulkMoveAppliedItem,
     BulkMoveRequest,
     BulkMoveResponse,
     BulkMoveSkippedItem,
+    BulkMoveItem,
     BulkRedirectAppliedItem,
+    BulkRedirectItem,
     BulkRedirectRequest,
     BulkRedirectResponse,
     BulkRelinkRequest,
@@ -23,6 +36,14 @@ from app.models import (
 from app.wikijs_api import get_single, refresh_index
 
 
+logger = logging.getLogger("wikimgr.bulk")
+
+# One validator call for a whole list is cheaper than one model per item.
+_INVENTORY_PAGES = TypeAdapter(list[InventoryPage])
+
+# reported for items a draining shutdown never started
+SHUTDOWN_ERROR = "503: shutting down; not processed"
+
 LINK_RE = re.compile(r"\]\((/[^\s)]+)\)")
 
 
@@ -37,6 +58,73 @@ def rewrite_links(md: str, mapping: dict[str, str]) -> str:
     return LINK_RE.sub(_sub, md)
 
 
+def extract_links(md: str) -> list[str]:
+    """Internal link targets in ``md`` with anchors/query strings and edge slashes removed."""
+    out: list[str] = []
+    for match in LINK_RE.finditer(md or ""):
+        target = match.group(1).split("#", 1)[0].split("?", 1)[0].strip().strip("/")
+        if target:
+            out.append(target)
+    return out
+
+
+def tracks_bulk(operation: str):
+    """Count the wrapped bulk operation in ``wikimgr_bulk_operations_in_progress``,
+    run its upstream calls at bulk priority and log its duration when it finishes.
+    New top-level operations are refused once shutdown has started draining."""
+
+    def admit() -> None:
+        # nested calls (relink's inventory) belong to an operation that was already admitted
+        if current_priority() != "bulk":
+            shutdown_drain().admit(operation)
+
+    def log_finished(start: float, failed: bool) -> None:
+        logger.info(
+            "bulk operation finished",
+            extra={
+                "fields": {
+                    "operation": operation,
+                    "duration_ms": round((time.perf_counter() - start) * 1000.0, 1),
+                    "failed": failed,
+                }
+            },
+        )
+
+    def decorator(fn):
+        gauge = BULK_IN_PROGRESS.labels(operation=operation)
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                admit()
+                start, failed = time.perf_counter(), True
+                with gauge.track_inprogress(), upstream_priority("bulk"):
+                    try:
+                        result = await fn(*args, **kwargs)
+                        failed = False
+                        return result
+                    finally:
+                        log_finished(start, failed)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            admit()
+            start, failed = time.perf_counter(), True
+            with gauge.track_inprogress(), upstream_priority("bulk"):
+                try:
+                    result = fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    log_finished(start, failed)
+
+        return wrapper
+
+    return decorator
+
+
 def moved_stub(to_path: str) -> str:
     return (
         "# Moved\n\n"
@@ -45,45 +133,57 @@ def moved_stub(to_path: str) -> str:
     )
 
 
-async def bulk_move(req: BulkMoveRequest) -> BulkMoveResponse:
-    if not req.moves:
-        raise APIError(400, "bad_request", "No moves provided")
-
-    report = BulkMoveResponse(dry_run=req.dry_run)
-
-    for move in req.moves:
-        src = (move.from_path or "").strip("/")
-        dst = (move.to_path or "").strip("/")
-        if not src or not dst or src == dst:
-            report.skipped.append(BulkMoveSkippedItem(move=move, reason="noop/invalid"))
-            continue
-
-        try:
-            src_page = get_page(path=src)
-            title = src_page.title or dst.split("/")[-1].replace("-", " ").title()
-            desc = src_page.description or ""
-            content = src_page.content or ""
-
-            if req.dry_run:
-                report.applied.append(
-                    BulkMoveAppliedItem.model_validate({"from": src, "to": dst, "dry": True})
-                )
-                continue
+async def _apply_move(move: BulkMoveItem, dry_run: bool, report: BulkMoveResponse) -> None:
+    src = (move.from_path or "").strip("/")
+    dst = (move.to_path or "").strip("/")
+    if not src or not dst or src == dst:
+        report.skipped.append(BulkMoveSkippedItem(move=move, reason="noop/invalid"))
+        return
 
+    try:
+        src_page = await run_in_threadpool(get_page, path=src)
+        title = src_page.title or dst.split("/")[-1].replace("-", " ").title()
+        desc = src_page.description or ""
+        content = src_page.content or ""
+
+        if dry_run:
+            report.applied.append(
+                BulkMoveAppliedItem.model_validate({"from": src, "to": dst, "dry": True})
+            )
+            return
+
+        await upsert_page(
+            UpsertPageRequest(
+                path=dst,
+                title=title,
+                content=content,
+                description=desc,
+                tags=[],
+                is_private=False,
+            ),
+            x_idempotency_key=None,
+            legacy_x_idempotency_key=None,
+        )
+
+        if move.merge:
             await upsert_page(
                 UpsertPageRequest(
-                    path=dst,
+                    path=src,
                     title=title,
-                    content=content,
-                    description=desc,
+                    content=moved_stub(dst),
+                    description="Moved",
                     tags=[],
                     is_private=False,
                 ),
                 x_idempotency_key=None,
                 legacy_x_idempotency_key=None,
             )
+        else:
+            from app.core.services.pages_service import delete_page
 
-            if move.merge:
+            try:
+                await run_in_threadpool(delete_page, DeletePageRequest(path=src))
+            except APIError:
                 await upsert_page(
                     UpsertPageRequest(
                         path=src,
@@ -96,67 +196,114 @@ async def bulk_move(req: BulkMoveRequest) -> BulkMoveResponse:
                     x_idempotency_key=None,
                     legacy_x_idempotency_key=None,
                 )
-            else:
-                from app.core.services.pages_service import delete_page
 
-                try:
-                    delete_page(DeletePageRequest(path=src))
-                except APIError:
-                    await upsert_page(
-                        UpsertPageRequest(
-                            path=src,
-                            title=title,
-                            content=moved_stub(dst),
-                            description="Moved",
-                            tags=[],
-                            is_private=False,
-                        ),
-                        x_idempotency_key=None,
-                        legacy_x_idempotency_key=None,
-                    )
-
-            report.applied.append(BulkMoveAppliedItem.model_validate({"from": src, "to": dst}))
-        except APIError as e:
-            report.errors.append({"move": move, "error": f"{e.status_code}: {e.message}"})
-        except Exception as e:
-            report.errors.append({"move": move, "error": repr(e)})
+        report.applied.append(BulkMoveAppliedItem.model_validate({"from": src, "to": dst}))
+    except APIError as e:
+        report.errors.append({"move": move, "error": f"{e.status_code}: {e.message}"})
+    except Exception as e:
+        report.errors.append({"move": move, "error": repr(e)})
+
+
+@tracks_bulk("move")
+async def bulk_move(req: BulkMoveRequest) -> BulkMoveResponse:
+    if not req.moves:
+        raise APIError(400, "bad_request", "No moves provided")
+
+    report = BulkMoveResponse(dry_run=req.dry_run)
+    drain = shutdown_drain()
+
+    for index, move in enumerate(req.moves):
+        if drain.should_stop():
+            remaining = req.moves[index:]
+            report.skipped.extend(BulkMoveSkippedItem(move=m, reason="shutdown") for m in remaining)
+            journal_interrupted("move", report, remaining)
+            break
+        try:
+            # each move runs to completion so no page is left copied but not stubbed/deleted
+            await drain.step(_apply_move(move, req.dry_run, report))
+        except asyncio.CancelledError:
+            journal_interrupted("move", report, req.moves[index + 1 :], in_progress=move)
+            raise
 
     return report
 
 
+async def _apply_redirect(redirect: BulkRedirectItem, report: BulkRedirectResponse) -> None:
+    src = (redirect.from_path or "").strip("/")
+    dst = (redirect.to_path or "").strip("/")
+    if not src or not dst or src == dst:
+        return
+    try:
+        title_guess = src.split("/")[-1].replace("-", " ").title()
+        await upsert_page(
+            UpsertPageRequest(
+                path=src,
+                title=title_guess,
+                content=moved_stub(dst),
+                description="Moved",
+                tags=[],
+                is_private=False,
+            ),
+            x_idempotency_key=None,
+            legacy_x_idempotency_key=None,
+        )
+        report.applied.append(BulkRedirectAppliedItem.model_validate({"from": src, "to": dst}))
+    except APIError as e:
+        report.errors.append({"redirect": redirect, "error": f"{e.status_code}: {e.message}"})
+    except Exception as e:
+        report.errors.append({"redirect": redirect, "error": repr(e)})
+
+
+@tracks_bulk("redirect")
 async def bulk_redirect(req: BulkRedirectRequest) -> BulkRedirectResponse:
     if not req.redirects:
         raise APIError(400, "bad_request", "No redirects provided")
 
     report = BulkRedirectResponse()
-    for redirect in req.redirects:
-        src = (redirect.from_path or "").strip("/")
-        dst = (redirect.to_path or "").strip("/")
-        if not src or not dst or src == dst:
-            continue
+    drain = shutdown_drain()
+    for index, redirect in enumerate(req.redirects):
+        if drain.should_stop():
+            remaining = req.redirects[index:]
+            report.errors.extend({"redirect": r, "error": SHUTDOWN_ERROR} for r in remaining)
+            journal_interrupted("redirect", report, remaining)
+            break
         try:
-            title_guess = src.split("/")[-1].replace("-", " ").title()
+            await drain.step(_apply_redirect(redirect, report))
+        except asyncio.CancelledError:
+            journal_interrupted(
+                "redirect", report, req.redirects[index + 1 :], in_progress=redirect
+            )
+            raise
+
+    return report
+
+
+async def _relink_page(path: str, mapping: dict[str, str], report: BulkRelinkResponse) -> None:
+    try:
+        cur = await run_in_threadpool(get_page, path=path)
+        content = cur.content or ""
+        new_md = rewrite_links(content, mapping)
+        if new_md != content:
             await upsert_page(
                 UpsertPageRequest(
-                    path=src,
-                    title=title_guess,
-                    content=moved_stub(dst),
-                    description="Moved",
+                    path=path,
+                    title=cur.title or path.split("/")[-1],
+                    content=new_md,
+                    description=cur.description or "",
                     tags=[],
                     is_private=False,
                 ),
                 x_idempotency_key=None,
                 legacy_x_idempotency_key=None,
             )
-            report.applied.append(BulkRedirectAppliedItem.model_validate({"from": src, "to": dst}))
-        except APIError as e:
-            report.errors.append({"redirect": redirect, "error": f"{e.status_code}: {e.message}"})
-        except Exception as e:
-            report.errors.append({"redirect": redirect, "error": repr(e)})
-
-    return report
+            report.updated.append(path)
+    except APIError as e:
+        report.errors.append({"path": path, "error": f"{e.status_code}: {e.message}"})
+    except Exception as e:
+        report.errors.append({"path": path, "error": repr(e)})
 
 
+@tracks_bulk("relink")
 async def bulk_relink(req: BulkRelinkRequest) -> BulkRelinkResponse:
     normalized_mapping = {
         str(k).strip("/"): str(v).strip("/")
@@ -164,65 +311,73 @@ async def bulk_relink(req: BulkRelinkRequest) -> BulkRelinkResponse:
         if str(k).strip("/") and str(v).strip("/")
     }
 
-    inventory = inventory(include_content=False)
-    pages = inventory.pages
+    pages = (await run_in_threadpool(inventory, include_content=False)).pages
 
-    report = BulkRelinkResponse()
-    for page in pages:
-        path = (page.path or "").strip("/")
-        if not path:
-            continue
-
-        scope = req.scope
-        if isinstance(scope, list) and scope and path not in scope:
-            continue
+    scope = req.scope
+    paths = [
+        path
+        for path in ((page.path or "").strip("/") for page in pages)
+        if path and not (isinstance(scope, list) and scope and path not in scope)
+    ]
 
+    report = BulkRelinkResponse()
+    drain = shutdown_drain()
+    for index, path in enumerate(paths):
+        if drain.should_stop():
+            remaining = paths[index:]
+            report.errors.extend({"path": p, "error": SHUTDOWN_ERROR} for p in remaining)
+            journal_interrupted(
+                "relink", report, remaining, context={"mapping": normalized_mapping}
+            )
+            break
         try:
-            cur = get_page(path=path)
-            content = cur.content or ""
-            new_md = rewrite_links(content, normalized_mapping)
-            if new_md != content:
-                await upsert_page(
-                    UpsertPageRequest(
-                        path=path,
-                        title=cur.title or path.split("/")[-1],
-                        content=new_md,
-                        description=cur.description or "",
-                        tags=[],
-                        is_private=False,
-                    ),
-                    x_idempotency_key=None,
-                    legacy_x_idempotency_key=None,
-                )
-                report.updated.append(path)
-        except APIError as e:
-            report.errors.append({"path": path, "error": f"{e.status_code}: {e.message}"})
-        except Exception as e:
-            report.errors.append({"path": path, "error": repr(e)})
+            await drain.step(_relink_page(path, normalized_mapping, report))
+        except asyncio.CancelledError:
+            journal_interrupted(
+                "relink",
+                report,
+                paths[index + 1 :],
+                in_progress=path,
+                context={"mapping": normalized_mapping},
+            )
+            raise
 
     return report
 
 
+def _inventory_page(record: dict[str, Any]) -> InventoryPage:
+    try:
+        return InventoryPage(**record)
+    except ValidationError as e:
+        path = str(record.get("path") or "")
+        return InventoryPage(
+            id=int(record.get("id") or 0), path=path, title=path.split("/")[-1], error=str(e)
+        )
+
+
+@tracks_bulk("inventory")
 def inventory(include_content: bool = False) -> InventoryResponse:
     try:
         path_to_id = refresh_index()
-        pages: list[InventoryPage] = []
+        records: list[dict[str, Any]] = []
         for path, page_id in path_to_id.items():
             try:
                 page_data: dict[str, Any] = get_single(page_id)
                 if not include_content:
                     page_data.pop("content", None)
-                pages.append(InventoryPage(**page_data))
+                records.append(page_data)
             except Exception as e:
-                pages.append(
-                    InventoryPage(
-                        id=page_id,
-                        path=path,
-                        title=path.split("/")[-1],
-                        error=str(e),
-                    )
+                records.append(
+                    {"id": page_id, "path": path, "title": path.split("/")[-1], "error": str(e)}
                 )
 
+        try:
+            pages = _INVENTORY_PAGES.validate_python(records)
+        except ValidationError:
+            # rare malformed upstream record: fall back to per-page so only that page errors
+            pages = [_inventory_page(record) for record in records]
         return InventoryResponse(count=len(pages), pages=pages)
+    except APIError:
+        raise
     except Exception as e:
         raise APIError(502, "upstream_error", f"Inventory generation failed: {e}")
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.core.concurrency import upstream_priority
+from app.core.errors import APIError
+from app.core.metrics import CACHE_REQUESTS
+from app.core.minhash import (
+    MinHasher,
+    connected_components,
+    jaccard,
+    lsh_candidate_pairs,
+    shingle_hashes,
+)
+from app.core.services.page_sync import diff_versions, fetch_pages
+from app.models import (
+    BulkMoveItem,
+    BulkMoveRequest,
+    DuplicateCluster,
+    DuplicatePage,
+    DuplicatePair,
+    DuplicatesResponse,
+)
+from app.wikijs_api import list_page_versions
+
+
+@dataclass(slots=True)
+class _Fingerprint:
+    page: DuplicatePage
+    hashes: np.ndarray
+    signature: np.ndarray
+
+
+_LOCK = threading.Lock()
+_HASHER = MinHasher()
+# page id -> fingerprint; reused across calls while the page's updatedAt is unchanged
+_FINGERPRINTS: dict[int, _Fingerprint] = {}
+
+
+def _in_prefixes(path: str, prefixes: list[str]) -> bool:
+    return any(path == p or path.startswith(p + "/") for p in prefixes)
+
+
+def _fingerprint(page: dict[str, Any]) -> _Fingerprint:
+    hashes = shingle_hashes(page.get("content") or "")
+    return _Fingerprint(
+        page=DuplicatePage(
+            id=int(page["id"]),
+            path=page["path"],
+            title=page.get("title") or "",
+            createdAt=page.get("createdAt") or "",
+            updatedAt=page.get("updatedAt") or "",
+        ),
+        hashes=hashes,
+        signature=_HASHER.signature(hashes),
+    )
+
+
+def _sync_fingerprints(listing: list[dict[str, Any]], wanted: set[int]) -> dict[int, str]:
+    with _LOCK:
+        known = {page_id: fp.page.updatedAt for page_id, fp in _FINGERPRINTS.items()}
+    changed, removed = diff_versions(listing, known)
+    stale = [page_id for page_id in changed if page_id in wanted]
+    CACHE_REQUESTS.labels(cache="minhash", result="hit").inc(len(wanted) - len(stale))
+    CACHE_REQUESTS.labels(cache="minhash", result="miss").inc(len(stale))
+    with upstream_priority("bulk"):
+        pages, errors = fetch_pages(stale)
+    fingerprints = [_fingerprint(page) for page in pages]
+    with _LOCK:
+        for page_id in removed:
+            _FINGERPRINTS.pop(page_id, None)
+        for fp in fingerprints:
+            _FINGERPRINTS[fp.page.id] = fp
+    return errors
+
+
+def _build_cluster(members: list[_Fingerprint], pairs: list[DuplicatePair]) -> DuplicateCluster:
+    # The most recently edited copy is always a move source and is applied last, so its
+    # content is what ends up at the target; the target is the oldest remaining copy.
+    newest = max(members, key=lambda fp: (fp.page.updatedAt, fp.page.id))
+    others = [fp for fp in members if fp is not newest]
+    target = min(others, key=lambda fp: (fp.page.createdAt or "~", fp.page.path))
+    sources = sorted(
+        (fp for fp in members if fp is not target),
+        key=lambda fp: (fp is newest, fp.page.updatedAt, fp.page.path),
+    )
+    return DuplicateCluster(
+        target=target.page.path,
+        similarity=min(pair.similarity for pair in pairs),
+        pages=sorted((fp.page for fp in members), key=lambda page: page.path),
+        pairs=pairs,
+        moves=[
+            BulkMoveItem(from_path=fp.page.path, to_path=target.page.path, merge=True)
+            for fp in sources
+        ],
+    )
+
+
+def find_duplicates(
+    threshold: float = 0.8, prefixes: list[str] | None = None
+) -> DuplicatesResponse:
+    try:
+        listing = list_page_versions()
+    except APIError:
+        raise
+    except Exception as e:
+        raise APIError(502, "upstream_error", f"duplicate analysis failed: {e}")
+
+    wanted_prefixes = [p.strip("/") for p in prefixes or [] if p.strip("/")]
+    wanted = {
+        int(item["id"])
+        for item in listing
+        if not wanted_prefixes or _in_prefixes(item["path"], wanted_prefixes)
+    }
+    fetch_errors = _sync_fingerprints(listing, wanted)
+
+    with _LOCK:
+        prints = [
+            fp
+            for page_id, fp in sorted(_FINGERPRINTS.items())
+            if page_id in wanted and fp.hashes.size
+        ]
+
+    edges: list[tuple[int, int]] = []
+    by_edge: dict[tuple[int, int], DuplicatePair] = {}
+    candidates: set[tuple[int, int]] = set()
+    if len(prints) > 1:
+        candidates = lsh_candidate_pairs(np.vstack([fp.signature for fp in prints]))
+    for left, right in sorted(candidates):
+        score = jaccard(prints[left].hashes, prints[right].hashes)
+        if score >= threshold:
+            edges.append((left, right))
+            by_edge[(left, right)] = DuplicatePair(
+                a=prints[left].page.path, b=prints[right].page.path, similarity=round(score, 4)
+            )
+
+    clusters: list[DuplicateCluster] = []
+    for component in connected_components(len(prints), edges):
+        members = set(component)
+        pairs = [pair for (l, r), pair in by_edge.items() if l in members and r in members]
+        clusters.append(_build_cluster([prints[idx] for idx in component], pairs))
+    clusters.sort(key=lambda c: (-c.similarity, c.target))
+
+    return DuplicatesResponse(
+        page_count=len(prints),
+        candidate_pairs=len(candidates),
+        threshold=threshold,
+        clusters=clusters,
+        bulk_move=BulkMoveRequest(
+            moves=[move for cluster in clusters for move in cluster.moves],
+            dry_run=True,
+        ),
+        fetch_errors=fetch_errors,
+    )
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import threading
+
+from app.core.concurrency import upstream_priority
+from app.core.errors import APIError
+from app.core.link_graph import LinkGraph
+from app.core.metrics import CACHE_REQUESTS
+from app.core.services.bulk_service import extract_links
+from app.core.services.page_sync import diff_versions, fetch_pages
+from app.core.state import read_json, state_path, write_json_atomic
+from app.models import LinkReportResponse
+from app.wikijs_api import list_page_versions
+
+
+GRAPH_FILE = "link_graph.json"
+
+_LOCK = threading.RLock()
+_GRAPH: LinkGraph | None = None
+
+
+def _load_graph() -> LinkGraph:
+    global _GRAPH
+    with _LOCK:
+        if _GRAPH is None:
+            snapshot = read_json(state_path(GRAPH_FILE))
+            _GRAPH = LinkGraph.from_dict(snapshot) if isinstance(snapshot, dict) else LinkGraph()
+        return _GRAPH
+
+
+def refresh_link_graph() -> dict[int, str]:
+    """Re-extract links only for pages whose ``updatedAt`` changed; returns fetch errors."""
+    graph = _load_graph()
+    try:
+        listing = list_page_versions()
+    except APIError:
+        raise
+    except Exception as e:
+        raise APIError(502, "upstream_error", f"link graph refresh failed: {e}")
+
+    with _LOCK:
+        known = graph.versions()
+    changed, removed = diff_versions(listing, known)
+    CACHE_REQUESTS.labels(cache="link_graph", result="hit").inc(len(listing) - len(changed))
+    CACHE_REQUESTS.labels(cache="link_graph", result="miss").inc(len(changed))
+    with upstream_priority("bulk"):
+        pages, errors = fetch_pages(changed)
+    if not (pages or removed):
+        return errors
+
+    with _LOCK:
+        for page_id in removed:
+            graph.remove(page_id)
+        for page in pages:
+            graph.set_page(
+                page["id"],
+                page["path"],
+                page.get("updatedAt") or "",
+                extract_links(page.get("content") or ""),
+            )
+        write_json_atomic(state_path(GRAPH_FILE), graph.to_dict())
+    return errors
+
+
+def link_report(refresh: bool = True, top: int = 20) -> LinkReportResponse:
+    graph = _load_graph()
+    errors = refresh_link_graph() if refresh or not len(graph) else {}
+    with _LOCK:
+        report = graph.report(locale=os.getenv("WIKIJS_LOCALE", "en"), top=top)
+    return LinkReportResponse(**report, fetch_errors=errors)
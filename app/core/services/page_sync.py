@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import contextvars
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.core.config import env_int
+from app.wikijs_api import get_single
+
+
+_FETCH_WORKERS_DEFAULT = 8
+
+
+def fetch_workers() -> int:
+    return env_int("WIKIMGR_FETCH_WORKERS", _FETCH_WORKERS_DEFAULT, 1)
+
+
+def diff_versions(
+    listing: list[dict[str, Any]], known: dict[int, str]
+) -> tuple[list[int], list[int]]:
+    """Compare an upstream listing against locally known ``updatedAt`` markers.
+
+    Returns ``(changed_ids, removed_ids)``; pages without a marker are always changed.
+    """
+    changed: list[int] = []
+    seen: set[int] = set()
+    for item in listing:
+        page_id = int(item["id"])
+        seen.add(page_id)
+        marker = item.get("updatedAt") or ""
+        if not marker or known.get(page_id) != marker:
+            changed.append(page_id)
+    removed = [page_id for page_id in known if page_id not in seen]
+    return changed, removed
+
+
+def _fetch_one(page_id: int) -> tuple[int, dict[str, Any] | None, str | None]:
+    try:
+        return page_id, get_single(page_id), None
+    except Exception as e:
+        return page_id, None, str(e)
+
+
+def fetch_pages(page_ids: Iterable[int]) -> tuple[list[dict[str, Any]], dict[int, str]]:
+    """Fetch full pages in parallel. Returns ``(pages, errors_by_id)``."""
+    ids = list(page_ids)
+    pages: list[dict[str, Any]] = []
+    errors: dict[int, str] = {}
+    if not ids:
+        return pages, errors
+
+    with ThreadPoolExecutor(max_workers=min(fetch_workers(), len(ids))) as pool:
+        # each task runs in a copy of the caller's context so request-scoped state
+        # (timing phases) follows the fetch into the worker thread
+        futures = [pool.submit(contextvars.copy_context().run, _fetch_one, i) for i in ids]
+        for future in futures:
+            page_id, page, error = future.result()
+            if page is None:
+                errors[page_id] = error or "fetch failed"
+            else:
+                pages.append(page)
+    return pages, errors
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
+import logging
+from typing import Any, Callable
+
+from starlette.concurrency import run_in_threadpool
+
 from app.core.errors import APIError
+from app.core.metrics import CACHE_WRITE_ERRORS, record_cache
+from app.core.services.search_service import record_page_delete, record_page_write
+from app.core.shared_cache import cache_store, idempotency_ttl_s
+from app.core.timing import timed
 from app.core.wikijs_client import WikiError, WikiJSClient, map_wiki_error
 from app.models import (
     DeletePageRequest,
@@ -11,32 +20,96 @@ from app.models import (
     UpsertPageResponse,
 )
 from app.wikijs_client import derive_idempotency_key
-from app.wikijs_api import delete_by_id, get_single, resolve_id
+from app.wikijs_api import (
+    delete_by_id,
+    forget_page,
+    get_single,
+    note_page_write,
+    remember_path,
+    resolve_id,
+)
+
+
+logger = logging.getLogger("wikimgr.cache")
+
+IDEMPOTENCY_NS = "idempotency"
+# how long a claimed key blocks a concurrent duplicate if its request dies before finishing
+IDEMPOTENCY_PENDING_TTL_S = 120.0
+
+
+def as_page_payload(payload: UpsertPageRequest) -> PagePayload:
+    """Read the request's attributes straight into a PagePayload (no intermediate dict)."""
+    return PagePayload.model_validate(payload, from_attributes=True)
 
 
 def resolve_idempotency_key(
     payload: UpsertPageRequest,
     x_idempotency_key: str | None,
     legacy_x_idempotency_key: str | None,
+    page_payload: PagePayload | None = None,
 ) -> str:
     if x_idempotency_key:
         return x_idempotency_key
     if legacy_x_idempotency_key:
         return legacy_x_idempotency_key
-    page_payload = PagePayload(**payload.model_dump())
-    return derive_idempotency_key(page_payload)
+    return derive_idempotency_key(page_payload or as_page_payload(payload))
 
 
-async def upsert_page(
-    payload: UpsertPageRequest,
-    x_idempotency_key: str | None,
-    legacy_x_idempotency_key: str | None,
-) -> UpsertPageResponse:
-    idem = resolve_idempotency_key(payload, x_idempotency_key, legacy_x_idempotency_key)
-    page_payload = PagePayload(**payload.model_dump())
+def _best_effort(step: str, fn: Callable[..., Any], *args: Any) -> None:
+    """Run cache bookkeeping for a write Wiki.js already committed; log and count a failure.
+
+    The caller still gets the real result: a locked shared store must not turn a done write
+    into an error that invites a retry.
+    """
+    try:
+        fn(*args)
+    except Exception:
+        CACHE_WRITE_ERRORS.labels(step=step).inc()
+        logger.exception(
+            "cache update failed after a committed write", extra={"fields": {"step": step}}
+        )
+
+
+def _claim_or_replay(key: str, digest: str) -> UpsertPageResponse | None:
+    """Stored response for a retried upsert, or None after claiming ``key`` for this request.
+
+    The claim is a pending record added only if the key is free, so of two concurrent
+    requests with one key, on any worker, only one writes; the other gets a 409.
+    """
+    store = cache_store()
+    pending = {"digest": digest, "pending": True}
+    if store.add(IDEMPOTENCY_NS, key, pending, ttl_s=IDEMPOTENCY_PENDING_TTL_S):
+        record_cache("idempotency", hit=False)
+        return None
+    record = store.get(IDEMPOTENCY_NS, key)
+    if record is not None and record.get("pending"):
+        raise APIError(
+            409, "idempotency_conflict", "a request with this idempotency key is still in progress"
+        )
+    hit = record is not None and record["digest"] == digest
+    record_cache("idempotency", hit=hit)
+    if hit:
+        return UpsertPageResponse(**record["response"])
+    # a different payload under a used key (or a record that just expired) writes again
+    store.set(IDEMPOTENCY_NS, key, pending, ttl_s=IDEMPOTENCY_PENDING_TTL_S)
+    return None
+
+
+def record_upsert(page_id: int, path: str, title: str, content: str) -> None:
+    """Bookkeeping after a successful upsert: path cache, listing generation, search index.
+
+    These may hit the shared SQLite store (busy timeout) and the search index file, so async
+    callers run this in the threadpool. Each step is best-effort.
+    """
+    _best_effort("path_cache", remember_path, path, page_id)
+    _best_effort("generation", note_page_write)
+    _best_effort("search_index", record_page_write, page_id, path, title, content)
+
+
+async def _upstream_upsert(page_payload: PagePayload, idem: str) -> dict:
     try:
         wikijs_client = WikiJSClient.from_env()
-        result = await wikijs_client.upsert_page(page_payload, idem_key=idem)
+        return await wikijs_client.upsert_page(page_payload, idem_key=idem)
     except WikiError as e:
         upstream = map_wiki_error(e)
         raise APIError(upstream.status_code, "upstream_error", upstream.message)
@@ -44,7 +117,53 @@ async def upsert_page(
         raise
     except Exception as e:
         raise APIError(502, "upstream_error", str(e))
-    return UpsertPageResponse(id=result["id"], path=result["path"], idempotency_key=idem)
+
+
+async def upsert_page(
+    payload: UpsertPageRequest,
+    x_idempotency_key: str | None,
+    legacy_x_idempotency_key: str | None,
+) -> UpsertPageResponse:
+    with timed("validate"):
+        page_payload = as_page_payload(payload)
+        idem = resolve_idempotency_key(
+            payload, x_idempotency_key, legacy_x_idempotency_key, page_payload=page_payload
+        )
+        # A client-supplied key with the same payload replays the earlier result (from any
+        # worker) instead of writing again; derived keys are the digest itself.
+        replay_ttl_s = (
+            idempotency_ttl_s() if (x_idempotency_key or legacy_x_idempotency_key) else 0.0
+        )
+        digest = derive_idempotency_key(page_payload) if replay_ttl_s else ""
+        if replay_ttl_s:
+            replayed = await run_in_threadpool(_claim_or_replay, idem, digest)
+            if replayed is not None:
+                return replayed
+    try:
+        result = await _upstream_upsert(page_payload, idem)
+    except BaseException:
+        if replay_ttl_s:
+            # release the claim so a retry can write
+            await run_in_threadpool(
+                _best_effort, "idempotency", cache_store().delete, IDEMPOTENCY_NS, idem
+            )
+        raise
+    await run_in_threadpool(
+        record_upsert, result["id"], result["path"], page_payload.title, page_payload.content or ""
+    )
+    response = UpsertPageResponse(id=result["id"], path=result["path"], idempotency_key=idem)
+    if replay_ttl_s:
+        record = {"digest": digest, "response": response.model_dump()}
+        await run_in_threadpool(
+            _best_effort,
+            "idempotency",
+            cache_store().set,
+            IDEMPOTENCY_NS,
+            idem,
+            record,
+            replay_ttl_s,
+        )
+    return response
 
 
 def get_page(path: str | None = None, id: int | None = None) -> GetPageResponse:
@@ -55,6 +174,8 @@ def get_page(path: str | None = None, id: int | None = None) -> GetPageResponse:
         raise APIError(400, "bad_request", str(e))
     except FileNotFoundError as e:
         raise APIError(404, "not_found", str(e))
+    except APIError:
+        raise
     except Exception as e:
         raise APIError(502, "upstream_error", f"get failed: {e}")
 
@@ -63,10 +184,15 @@ def delete_page(req: DeletePageRequest) -> DeletePageResponse:
     try:
         pid = resolve_id(path=req.path, id=req.id)
         ok = delete_by_id(pid)
-        return DeletePageResponse(ok=ok, hard_deleted=ok, id=pid)
     except ValueError as e:
         raise APIError(400, "bad_request", str(e))
     except FileNotFoundError as e:
         raise APIError(404, "not_found", str(e))
+    except APIError:
+        raise
     except Exception as e:
         raise APIError(502, "upstream_error", f"delete failed: {e}")
+    if ok:
+        _best_effort("path_cache", forget_page, pid, req.path)
+        _best_effort("search_index", record_page_delete, pid)
+    return DeletePageResponse(ok=ok, hard_deleted=ok, id=pid)
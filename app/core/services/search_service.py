@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.core.errors import APIError
+from app.core.search_index import SearchIndex
+from app.core.services.page_sync import diff_versions, fetch_pages
+from app.core.shared_cache import cache_store
+from app.core.state import read_json, state_path, write_json_atomic
+from app.models import SearchHit, SearchRefreshResponse, SearchResponse
+from app.wikijs_api import PAGES_GENERATION, list_page_versions
+
+
+INDEX_FILE = "search_index.json"
+PERSIST_INTERVAL_S = 30.0
+
+_LOCK = threading.RLock()
+_INDEX: SearchIndex | None = None
+_SYNCED = False
+# pages generation the index was last synced at; another worker's write moves it on
+_SYNCED_GENERATION = 0
+_DIRTY = False
+_LAST_PERSIST = 0.0
+
+
+def _load_index() -> SearchIndex:
+    global _INDEX, _SYNCED
+    with _LOCK:
+        if _INDEX is None:
+            snapshot = read_json(state_path(INDEX_FILE))
+            if isinstance(snapshot, dict):
+                _INDEX = SearchIndex.from_dict(snapshot)
+                _SYNCED = True
+            else:
+                _INDEX = SearchIndex()
+        return _INDEX
+
+
+def persist_search_index(force: bool = False) -> bool:
+    global _DIRTY, _LAST_PERSIST
+    with _LOCK:
+        if _INDEX is None or not _DIRTY:
+            return False
+        now = time.monotonic()
+        if not force and now - _LAST_PERSIST < PERSIST_INTERVAL_S:
+            return False
+        write_json_atomic(state_path(INDEX_FILE), _INDEX.to_dict())
+        _DIRTY = False
+        _LAST_PERSIST = now
+        return True
+
+
+def refresh_search_index() -> SearchRefreshResponse:
+    """Bring the index in line with upstream, fetching only pages whose ``updatedAt`` moved."""
+    global _SYNCED, _DIRTY, _SYNCED_GENERATION
+    index = _load_index()
+    generation = cache_store().generation(PAGES_GENERATION)
+    try:
+        listing = list_page_versions()
+    except APIError:
+        raise
+    except Exception as e:
+        raise APIError(502, "upstream_error", f"search index refresh failed: {e}")
+
+    with _LOCK:
+        known = index.versions()
+    changed, removed = diff_versions(listing, known)
+    pages, errors = fetch_pages(changed)
+
+    with _LOCK:
+        for page_id in removed:
+            index.remove(page_id)
+        for page in pages:
+            index.upsert(
+                page["id"],
+                page["path"],
+                page.get("title") or "",
+                page.get("content") or "",
+                updated_at=page.get("updatedAt") or "",
+            )
+        _SYNCED = True
+        _SYNCED_GENERATION = generation
+        _DIRTY = _DIRTY or bool(removed or pages)
+        count = len(index)
+    persist_search_index(force=True)
+    return SearchRefreshResponse(
+        indexed=count, updated=len(pages), removed=len(removed), errors=errors
+    )
+
+
+def search_pages(q: str, prefixes: list[str] | None = None, limit: int = 20) -> SearchResponse:
+    index = _load_index()
+    store = cache_store()
+    if not _SYNCED or (store.shared and store.generation(PAGES_GENERATION) != _SYNCED_GENERATION):
+        refresh_search_index()
+    with _LOCK:
+        hits = index.search(q, prefixes=prefixes or (), limit=limit)
+    results = [
+        SearchHit(id=doc.id, path=doc.path, title=doc.title, score=round(score, 4))
+        for doc, score in hits
+    ]
+    return SearchResponse(query=q, count=len(results), results=results)
+
+
+def record_page_write(page_id: int, path: str, title: str, content: str) -> None:
+    """Write-through hook for upserts; the empty version marker forces a recheck on refresh."""
+    global _DIRTY
+    with _LOCK:
+        if _INDEX is None:
+            return
+        _INDEX.upsert(page_id, path, title, content)
+        _DIRTY = True
+    persist_search_index()
+
+
+def record_page_delete(page_id: int) -> None:
+    global _DIRTY
+    with _LOCK:
+        if _INDEX is None:
+            return
+        _DIRTY = _INDEX.remove(page_id) or _DIRTY
+    persist_search_index()
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.core.config import env_float, env_int
+from app.core.jsonio import dumps, loads
+from app.core.state import state_path
+
+
+SHARED_CACHE_FILE = "shared_cache.sqlite3"
+LISTING_TTL_S_DEFAULT = 5.0
+IDEMPOTENCY_TTL_S_DEFAULT = 600.0
+# expired entries are deleted lazily; sweep at most this often per process
+_SWEEP_INTERVAL_S = 60.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS entries ("
+    " ns TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires REAL,"
+    " PRIMARY KEY (ns, key)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS generations (ns TEXT PRIMARY KEY, gen INTEGER NOT NULL)",
+)
+
+
+def listing_ttl_s() -> float:
+    return env_float("WIKIMGR_SHARED_LISTING_TTL_S", LISTING_TTL_S_DEFAULT, 0.0)
+
+
+def idempotency_ttl_s() -> float:
+    return env_float("WIKIMGR_IDEMPOTENCY_TTL_S", IDEMPOTENCY_TTL_S_DEFAULT, 0.0)
+
+
+def _expiry(ttl_s: float | None) -> float | None:
+    return time.time() + ttl_s if ttl_s else None
+
+
+class LocalStore:
+    """In-process store with the ``SharedStore`` interface, for single-worker deployments."""
+
+    shared = False
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], tuple[Any, float | None]] = {}
+        self._generations: dict[str, int] = {}
+        self._last_sweep = 0.0
+
+    def get(self, ns: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get((ns, key))
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.time():
+                del self._entries[(ns, key)]
+                return default
+            return value
+
+    def set(self, ns: str, key: str, value: Any, ttl_s: float | None = None) -> None:
+        with self._lock:
+            self._entries[(ns, key)] = (value, _expiry(ttl_s))
+            self._sweep()
+
+    def add(self, ns: str, key: str, value: Any, ttl_s: float | None = None) -> bool:
+        """Store ``value`` only if ``key`` is absent or expired; True if it was stored."""
+        with self._lock:
+            entry = self._entries.get((ns, key))
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                return False
+            self._entries[(ns, key)] = (value, _expiry(ttl_s))
+            return True
+
+    def delete(self, ns: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((ns, key), None)
+
+    def generation(self, ns: str) -> int:
+        with self._lock:
+            return self._generations.get(ns, 0)
+
+    def bump(self, ns: str) -> int:
+        with self._lock:
+            self._generations[ns] = self._generations.get(ns, 0) + 1
+            return self._generations[ns]
+
+    def _sweep(self) -> None:
+        # caller holds the lock; keys read once (e.g. idempotency keys) would otherwise stay forever
+        now = time.time()
+        if now - self._last_sweep < _SWEEP_INTERVAL_S:
+            return
+        self._last_sweep = now
+        expired = [
+            key
+            for key, (_, expires) in self._entries.items()
+            if expires is not None and expires <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+
+
+class SharedStore:
+    """Key/value store in a SQLite file (WAL mode) shared by every worker on the host.
+
+    Values are JSON. Entries live in namespaces with an optional TTL. ``bump(ns)`` increments
+    a per-namespace generation that workers compare against the one their in-memory state
+    was built from, which is how one worker's write invalidates the others' copies.
+    Connections are per thread and per process, so the store is safe to use from the
+    threadpool and after a fork.
+    """
+
+    shared = True
+
+    def __init__(self, path: Path | str, timeout_s: float = 5.0) -> None:
+        self.path = Path(path)
+        self.timeout_s = timeout_s
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._last_sweep = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # forked: the parent's connections must not be reused
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, ns: str, key: str, default: Any = None) -> Any:
+        row = (
+            self._conn()
+            .execute("SELECT value, expires FROM entries WHERE ns = ? AND key = ?", (ns, key))
+            .fetchone()
+        )
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        return loads(row[0])
+
+    def set(self, ns: str, key: str, value: Any, ttl_s: float | None = None) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (ns, key, value, expires) VALUES (?, ?, ?, ?)",
+            (ns, key, dumps(value), _expiry(ttl_s)),
+        )
+        self._sweep()
+
+    def add(self, ns: str, key: str, value: Any, ttl_s: float | None = None) -> bool:
+        """Store ``value`` only if ``key`` is absent or expired; True if it was stored.
+
+        One statement, so of several workers adding the same key exactly one wins.
+        """
+        cursor = self._conn().execute(
+            "INSERT INTO entries (ns, key, value, expires) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (ns, key)"
+            " DO UPDATE SET value = excluded.value, expires = excluded.expires"
+            " WHERE entries.expires IS NOT NULL AND entries.expires <= ?",
+            (ns, key, dumps(value), _expiry(ttl_s), time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, ns: str, key: str) -> None:
+        self._conn().execute("DELETE FROM entries WHERE ns = ? AND key = ?", (ns, key))
+
+    def generation(self, ns: str) -> int:
+        row = self._conn().execute("SELECT gen FROM generations WHERE ns = ?", (ns,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def bump(self, ns: str) -> int:
+        row = (
+            self._conn()
+            .execute(
+                "INSERT INTO generations (ns, gen) VALUES (?, 1)"
+                " ON CONFLICT (ns) DO UPDATE SET gen = gen + 1 RETURNING gen",
+                (ns,),
+            )
+            .fetchone()
+        )
+        return int(row[0])
+
+    def mapping(self, ns: str) -> "SharedMap":
+        return SharedMap(self, ns)
+
+    def _sweep(self) -> None:
+        now = time.time()
+        if now - self._last_sweep < _SWEEP_INTERVAL_S:
+            return
+        self._last_sweep = now
+        self._conn().execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)
+        )
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class SharedMap:
+    """Dict-like view of one ``SharedStore`` namespace (no TTL), e.g. the path -> id cache."""
+
+    def __init__(self, store: SharedStore, ns: str) -> None:
+        self.store = store
+        self.ns = ns
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.store.set(self.ns, key, value)
+
+    def __len__(self) -> int:
+        row = (
+            self.store._conn()
+            .execute("SELECT COUNT(*) FROM entries WHERE ns = ?", (self.ns,))
+            .fetchone()
+        )
+        return int(row[0])
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self.store._conn().execute("SELECT key FROM entries WHERE ns = ?", (self.ns,))
+        return iter([row[0] for row in rows])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.store.get(self.ns, key, default)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        value = self.get(key, default)
+        self.store.delete(self.ns, key)
+        return value
+
+    def remove_value(self, value: Any) -> None:
+        """Drop every key that maps to ``value`` (e.g. all paths cached for a page id)."""
+        self.store._conn().execute(
+            "DELETE FROM entries WHERE ns = ? AND value = ?", (self.ns, dumps(value))
+        )
+
+    def replace(self, items: dict[str, Any]) -> None:
+        """Swap the whole namespace in one transaction, so readers never see it empty."""
+        conn = self.store._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM entries WHERE ns = ?", (self.ns,))
+            conn.executemany(
+                "INSERT INTO entries (ns, key, value, expires) VALUES (?, ?, ?, NULL)",
+                [(self.ns, key, dumps(value)) for key, value in items.items()],
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+_STORE: LocalStore | SharedStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def _workers() -> int:
+    return env_int("WEB_CONCURRENCY", 1)
+
+
+def shared_cache_path() -> Path | None:
+    """SQLite file from ``WIKIMGR_SHARED_CACHE``; defaults to the state dir when
+    ``WEB_CONCURRENCY`` asks for more than one worker. ``0``/``off`` disables it."""
+    configured = os.getenv("WIKIMGR_SHARED_CACHE", "").strip()
+    if configured.lower() in ("0", "false", "no", "off"):
+        return None
+    if configured and configured.lower() not in ("1", "true", "yes", "on"):
+        return Path(configured)
+    if configured or _workers() > 1:
+        return state_path(SHARED_CACHE_FILE)
+    return None
+
+
+def cache_store() -> LocalStore | SharedStore:
+    """The process-wide store: shared across workers when configured, in-process otherwise."""
+    global _STORE
+    store = _STORE
+    if store is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                path = shared_cache_path()
+                _STORE = SharedStore(path) if path is not None else LocalStore()
+            store = _STORE
+    return store
+
+
+def reset_cache_store() -> None:
+    global _STORE
+    with _STORE_LOCK:
+        store, _STORE = _STORE, None
+    if isinstance(store, SharedStore):
+        store.close()
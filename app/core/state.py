@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+_STATE_DIR_DEFAULT = ".wikimgr"
+
+
+def state_dir() -> Path:
+    return Path(os.getenv("WIKIMGR_STATE_DIR", _STATE_DIR_DEFAULT))
+
+
+def state_path(name: str) -> Path:
+    return state_dir() / name
+
+
+def read_json(path: Path) -> Any | None:
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        # A corrupt or unreadable snapshot is treated as missing; callers rebuild.
+        return None
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # per-process temp name: several workers may persist the same snapshot at once
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp, path)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+# Request-scoped list of (phase, seconds). Child tasks and threadpool calls share the list
+# object through their copied context, so phases recorded there land on the same request.
+_PHASES: ContextVar[list[tuple[str, float]] | None] = ContextVar("wikimgr_timing", default=None)
+
+
+def begin_request_timing() -> list[tuple[str, float]]:
+    phases: list[tuple[str, float]] = []
+    _PHASES.set(phases)
+    return phases
+
+
+def record_phase(name: str, seconds: float) -> None:
+    phases = _PHASES.get()
+    if phases is not None:
+        phases.append((name, seconds))
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+def summarize(phases: list[tuple[str, float]]) -> dict[str, tuple[float, int]]:
+    """Total milliseconds and call count per phase name, in first-seen order."""
+    out: dict[str, tuple[float, int]] = {}
+    for name, seconds in list(phases):
+        ms, count = out.get(name, (0.0, 0))
+        out[name] = (ms + seconds * 1000.0, count + 1)
+    return out
+
+
+def server_timing_header(phases: list[tuple[str, float]], total_s: float) -> str:
+    entries = []
+    for name, (ms, count) in summarize(phases).items():
+        entry = f"{name};dur={ms:.1f}"
+        if count > 1:
+            entry += f';desc="x{count}"'
+        entries.append(entry)
+    entries.append(f"total;dur={total_s * 1000.0:.1f}")
+    return ", ".join(entries)
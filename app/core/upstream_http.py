@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import importlib.util
+import logging
+import os
+import ssl
+import threading
+import weakref
+
+import httpx
+
+from app.core.config import env_flag, env_int
+
+
+logger = logging.getLogger("wikimgr.upstream")
+
+SYNC_TIMEOUT_S = 60.0
+_GZIP_MIN_BYTES_DEFAULT = 1024
+
+_SYNC_CLIENT: httpx.Client | None = None
+_SYNC_LOCK = threading.Lock()
+_SSL_CONTEXT: ssl.SSLContext | None = None
+# AsyncClient connections belong to the loop that opened them; one client per loop.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def accept_encoding() -> str:
+    """Encodings advertised to Wiki.js: gzip always, br/zstd when httpx can decode them."""
+    configured = os.getenv("WIKIMGR_UPSTREAM_ACCEPT_ENCODING", "").strip()
+    if configured:
+        return configured
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") is not None:
+        encodings.append("br")
+    if importlib.util.find_spec("zstandard") is not None:
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def http2_enabled() -> bool:
+    if not env_flag("WIKIMGR_UPSTREAM_HTTP2"):
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "WIKIMGR_UPSTREAM_HTTP2 is set but the h2 package is missing; using HTTP/1.1"
+        )
+        return False
+    return True
+
+
+def _ssl_context() -> ssl.SSLContext:
+    # loading the CA bundle takes tens of ms; the sync and async pools share one context
+    global _SSL_CONTEXT
+    with _SYNC_LOCK:
+        if _SSL_CONTEXT is None:
+            _SSL_CONTEXT = ssl.create_default_context()
+        return _SSL_CONTEXT
+
+
+def client_options() -> dict:
+    pool = env_int("WIKIMGR_UPSTREAM_POOL", 32, 1)
+    return {
+        "verify": _ssl_context(),
+        "http2": http2_enabled(),
+        "headers": {"Accept-Encoding": accept_encoding()},
+        "limits": httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+    }
+
+
+def encode_body(body: bytes) -> tuple[bytes, dict[str, str]]:
+    """gzip large request bodies when ``WIKIMGR_UPSTREAM_GZIP_REQUESTS`` is on.
+
+    Wiki.js (Express ``body-parser``) inflates ``Content-Encoding: gzip`` bodies; leave it
+    off when a proxy in front of Wiki.js does not pass the header through.
+    """
+    if not env_flag("WIKIMGR_UPSTREAM_GZIP_REQUESTS"):
+        return body, {}
+    if len(body) < env_int("WIKIMGR_UPSTREAM_GZIP_MIN_BYTES", _GZIP_MIN_BYTES_DEFAULT, 0):
+        return body, {}
+    # level 1: most of the size win on markdown for a fraction of the CPU of the default 6
+    return gzip.compress(body, compresslevel=1), {"Content-Encoding": "gzip"}
+
+
+def sync_client() -> httpx.Client:
+    """Process-wide pooled client for the thread-based ``wikijs_api`` calls."""
+    global _SYNC_CLIENT
+    client = _SYNC_CLIENT
+    if client is None:
+        options = client_options()
+        with _SYNC_LOCK:
+            if _SYNC_CLIENT is None:
+                _SYNC_CLIENT = httpx.Client(timeout=SYNC_TIMEOUT_S, **options)
+            client = _SYNC_CLIENT
+    return client
+
+
+def async_client() -> httpx.AsyncClient:
+    """Pooled client for ``WikiJSClient`` on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**client_options())
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def prewarm_clients() -> None:
+    """Build both pools in the background after startup.
+
+    The first client pulls in httpcore (and whatever async backends it probes) and the CA
+    bundle, ~200ms that would otherwise land on the first upstream request. Run as a task
+    from the lifespan so it does not delay readiness.
+    """
+    try:
+        await asyncio.to_thread(sync_client)
+        async_client()
+    except Exception as e:  # pragma: no cover - warm-up is best effort
+        logger.warning("upstream client warm-up failed: %s", e)
+
+
+async def close_clients() -> None:
+    """Close pooled connections (app shutdown); clients are recreated on next use."""
+    global _SYNC_CLIENT
+    with _SYNC_LOCK:
+        client, _SYNC_CLIENT = _SYNC_CLIENT, None
+    if client is not None:
+        client.close()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    aclient = _ASYNC_CLIENTS.pop(loop, None)
+    if aclient is not None:
+        await aclient.aclose()
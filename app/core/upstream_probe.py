@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import httpx
+
+from app.core.config import env_float, env_int
+from app.core.jsonio import loads
+from app.core.metrics import UPSTREAM_HEALTH, UPSTREAM_PROBE_DURATION, UPSTREAM_PROBES
+from app.core.shared_cache import cache_store
+from app.core.upstream_http import async_client
+
+
+logger = logging.getLogger("wikimgr.probe")
+
+UpstreamStatus = Literal["unknown", "ok", "degraded", "down"]
+
+# cheapest authenticated query: one row of the page list
+PROBE_QUERY = "{ pages { list(limit: 1) { id } } }"
+PROBE_NS = "probe"
+PROBE_KEY = "health"
+
+INTERVAL_S_DEFAULT = 10.0
+TIMEOUT_MS_DEFAULT = 2000.0
+WINDOW_DEFAULT = 10
+DOWN_AFTER_DEFAULT = 3
+DEGRADED_MS_DEFAULT = 1000.0
+DEGRADED_ERROR_RATE_DEFAULT = 0.2
+
+_HEALTH_VALUES = {"ok": 0, "degraded": 1, "down": 2}
+
+
+@dataclass
+class UpstreamHealth:
+    status: UpstreamStatus
+    latency_ms: float | None = None
+    error_rate: float | None = None
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    age_s: float | None = None
+
+
+class UpstreamProber:
+    """Pings Wiki.js in the background so readiness checks never wait on it.
+
+    Every ``interval_s`` the probe sends ``PROBE_QUERY`` straight to the pooled client,
+    outside the concurrency limiter and the circuit breaker, and keeps the last ``window``
+    outcomes. ``health()`` turns them into a status from the cached samples only:
+
+    - ``down`` after ``down_after`` consecutive failures,
+    - ``degraded`` when the window's error rate reaches ``degraded_error_rate`` or the median
+      probe latency reaches ``degraded_ms``,
+    - ``ok`` otherwise, and ``unknown`` before the first probe or when the samples are stale.
+
+    The samples live in the cache store, so with shared workers one probe per interval
+    serves all of them: a worker that finds a fresh enough snapshot adopts it instead. Each
+    tick reads and writes the store in a thread and keeps the snapshot it ends with, which is
+    what ``health()`` assesses, so readiness never waits on SQLite.
+    """
+
+    def __init__(
+        self,
+        graphql_url: str = "",
+        token: str = "",
+        interval_s: float = INTERVAL_S_DEFAULT,
+        timeout_s: float = TIMEOUT_MS_DEFAULT / 1000.0,
+        window: int = WINDOW_DEFAULT,
+        down_after: int = DOWN_AFTER_DEFAULT,
+        degraded_ms: float = DEGRADED_MS_DEFAULT,
+        degraded_error_rate: float = DEGRADED_ERROR_RATE_DEFAULT,
+    ):
+        self.graphql_url = graphql_url
+        self.token = token
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.window = window
+        self.down_after = down_after
+        self.degraded_ms = degraded_ms
+        self.degraded_error_rate = degraded_error_rate
+        self._task: asyncio.Task | None = None
+        self._snapshot: dict[str, Any] | None = None
+
+    @classmethod
+    def from_env(cls) -> "UpstreamProber":
+        base = os.getenv("WIKIJS_BASE_URL", "").rstrip("/")
+        return cls(
+            graphql_url=f"{base}/graphql" if base else "",
+            token=os.getenv("WIKIJS_API_TOKEN", ""),
+            interval_s=env_float("WIKIMGR_PROBE_INTERVAL_S", INTERVAL_S_DEFAULT, 0.0),
+            timeout_s=env_float("WIKIMGR_PROBE_TIMEOUT_MS", TIMEOUT_MS_DEFAULT, 1.0) / 1000.0,
+            window=env_int("WIKIMGR_PROBE_WINDOW", WINDOW_DEFAULT, 1),
+            down_after=env_int("WIKIMGR_PROBE_DOWN_AFTER", DOWN_AFTER_DEFAULT, 1),
+            degraded_ms=env_float("WIKIMGR_PROBE_DEGRADED_MS", DEGRADED_MS_DEFAULT, 0.0),
+            degraded_error_rate=env_float(
+                "WIKIMGR_PROBE_DEGRADED_ERROR_RATE", DEGRADED_ERROR_RATE_DEFAULT, 0.0
+            ),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.interval_s > 0 and self.graphql_url and self.token)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.enabled or self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name="wikimgr-upstream-probe"
+        )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._snapshot = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                # a store or probe error must not end the loop: readiness would report
+                # "unknown" (ready) from then on, whatever state Wiki.js is in
+                logger.exception("Wiki.js probe tick failed")
+            await asyncio.sleep(self.interval_s)
+
+    async def tick(self) -> UpstreamHealth:
+        """Probe once, unless another worker already did within this interval."""
+        store = await asyncio.to_thread(cache_store)
+        snapshot = await asyncio.to_thread(store.get, PROBE_NS, PROBE_KEY)
+        if snapshot is None or time.time() - snapshot["at"] >= self.interval_s * 0.9:
+            ok, latency_ms, error = await self.probe()
+            previous = snapshot or {"samples": [], "failures": 0}
+            snapshot = {
+                "at": time.time(),
+                "samples": ([*previous["samples"], [ok, latency_ms]])[-self.window :],
+                "failures": 0 if ok else previous["failures"] + 1,
+                "error": error,
+            }
+            # kept for a few intervals only: a worker that stops probing must not leave
+            # a verdict behind
+            await asyncio.to_thread(
+                store.set, PROBE_NS, PROBE_KEY, snapshot, ttl_s=self._stale_after_s()
+            )
+        self._snapshot = snapshot
+        health = self.assess(snapshot)
+        if health.status in _HEALTH_VALUES:
+            UPSTREAM_HEALTH.labels().set(_HEALTH_VALUES[health.status])
+        return health
+
+    async def probe(self) -> tuple[bool, float, str | None]:
+        start = time.perf_counter()
+        error: str | None = None
+        try:
+            resp = await async_client().post(
+                self.graphql_url,
+                json={"query": PROBE_QUERY},
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=self.timeout_s,
+            )
+            if resp.status_code != 200:
+                error = f"HTTP {resp.status_code}"
+            else:
+                errors = loads(resp.content).get("errors")
+                if errors:
+                    # Wiki.js is up but refuses the token or the query; wikimgr cannot work
+                    # either way
+                    error = f"GraphQL: {errors[0].get('message', 'error')}"
+        except httpx.TimeoutException:
+            error = f"timeout after {self.timeout_s * 1000.0:.0f}ms"
+        except (httpx.HTTPError, ValueError, AttributeError) as e:
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        elapsed = time.perf_counter() - start
+        UPSTREAM_PROBE_DURATION.labels().observe(elapsed)
+        UPSTREAM_PROBES.labels(outcome="error" if error else "ok").inc()
+        if error:
+            logger.warning("Wiki.js probe failed", extra={"fields": {"error": error}})
+        return error is None, round(elapsed * 1000.0, 1), error
+
+    def _stale_after_s(self) -> float:
+        return 3 * self.interval_s + self.timeout_s
+
+    def health(self) -> UpstreamHealth:
+        """Verdict from the last tick's samples; touches neither the network nor the store."""
+        if not self.running:
+            return UpstreamHealth(status="unknown")
+        return self.assess(self._snapshot)
+
+    def assess(self, snapshot: dict[str, Any] | None) -> UpstreamHealth:
+        if not snapshot or not snapshot["samples"]:
+            return UpstreamHealth(status="unknown")
+        age_s = max(0.0, time.time() - snapshot["at"])
+        if age_s > self._stale_after_s():
+            return UpstreamHealth(status="unknown", age_s=round(age_s, 1))
+        samples = snapshot["samples"]
+        failures = snapshot["failures"]
+        error_rate = sum(1 for ok, _ in samples if not ok) / len(samples)
+        latencies = [latency for ok, latency in samples if ok]
+        latency_ms = round(statistics.median(latencies), 1) if latencies else None
+        if failures >= self.down_after:
+            status: UpstreamStatus = "down"
+        elif error_rate >= self.degraded_error_rate > 0 or (
+            latency_ms is not None and latency_ms >= self.degraded_ms > 0
+        ):
+            status = "degraded"
+        else:
+            status = "ok"
+        return UpstreamHealth(
+            status=status,
+            latency_ms=latency_ms,
+            error_rate=round(error_rate, 3),
+            consecutive_failures=failures,
+            last_error=snapshot.get("error"),
+            age_s=round(age_s, 1),
+        )
+
+    def retry_after_s(self) -> int:
+        return max(1, math.ceil(self.interval_s))
+
+
+def ready_fail_on() -> frozenset[str]:
+    """Upstream statuses that make ``/ready`` answer 503 (``WIKIMGR_READY_FAIL_ON``)."""
+    if os.getenv("WIKIMGR_READY_FAIL_ON", "down").strip().lower() == "degraded":
+        return frozenset(("degraded", "down"))
+    return frozenset(("down",))
+
+
+_PROBER: UpstreamProber | None = None
+
+
+def upstream_prober() -> UpstreamProber:
+    global _PROBER
+    if _PROBER is None:
+        _PROBER = UpstreamProber.from_env()
+    return _PROBER
+
+
+def reset_upstream_prober() -> None:
+    global _PROBER
+    _PROBER = None
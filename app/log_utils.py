@@ -1,25 +1,177 @@
+import atexit
+import fnmatch
 import json
 import logging
+import os
+import queue
+import random
+import sys
+import time
 import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from starlette.requests import Request
 from starlette.responses import Response
 
+from app.core.config import env_int
+from app.core.metrics import LOG_RECORDS_DROPPED
+from app.core.timing import begin_request_timing, server_timing_header, summarize
+
+# Request id of the request being served; copied into threadpool calls and fetch workers
+# with the rest of the context, so service and upstream logs carry it too.
+_REQ_ID: ContextVar[str] = ContextVar("wikimgr_req_id", default="-")
+
+# Access-log sample rates by path pattern. Errors (status >= 400) are always logged.
+DEFAULT_LOG_SAMPLE = (
+    "/api/v1/health=0.01,/api/v1/ready=0.01,/healthz=0.01,/readyz=0.01,"
+    "/wikimgr/health=0.01,/metrics=0.01"
+)
+_LOG_QUEUE_SIZE_DEFAULT = 10000
+
+_LISTENER: QueueListener | None = None
+_SAMPLE_RULES: list[tuple[str, float]] = []
+
+logger = logging.getLogger("wikimgr")
+
+
+def current_request_id() -> str:
+    return _REQ_ID.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp ``req_id`` on records in the emitting thread, before they cross the queue."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "req_id"):
+            record.req_id = _REQ_ID.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; structured ``fields`` passed via ``extra`` are merged in."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "req_id": getattr(record, "req_id", "-"),
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the listener thread; drops (and counts) instead of blocking when full.
+
+    Unlike the stock ``prepare`` this does not run the formatter, so JSON encoding of
+    ``fields`` happens on the listener thread rather than the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels().inc()
+
+
+def parse_sample_rules(raw: str) -> list[tuple[str, float]]:
+    rules: list[tuple[str, float]] = []
+    for part in raw.split(","):
+        pattern, sep, rate = part.strip().rpartition("=")
+        if not sep or not pattern:
+            continue
+        try:
+            rules.append((pattern, min(1.0, max(0.0, float(rate)))))
+        except ValueError:
+            continue
+    return rules
+
+
+def access_sample_rate(path: str) -> float:
+    for pattern, rate in _SAMPLE_RULES:
+        if fnmatch.fnmatchcase(path, pattern):
+            return rate
+    return 1.0
+
+
 def setup_logging():
-    logging.basicConfig(level=logging.INFO)
+    """Route all logging through a bounded queue drained by one background writer thread."""
+    global _LISTENER, _SAMPLE_RULES
+    _SAMPLE_RULES = parse_sample_rules(os.getenv("WIKIMGR_LOG_SAMPLE", DEFAULT_LOG_SAMPLE))
+    if _LISTENER is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter())
+    log_queue: queue.Queue = queue.Queue(
+        maxsize=env_int("WIKIMGR_LOG_QUEUE_SIZE", _LOG_QUEUE_SIZE_DEFAULT, 1)
+    )
+    handler = _NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(os.getenv("WIKIMGR_LOG_LEVEL", "INFO").upper())
+
+    _LISTENER = QueueListener(log_queue, stream, respect_handler_level=True)
+    _LISTENER.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
 
 async def inject_request_id(request: Request, call_next):
     req_id = request.headers.get("X-Request-Id", str(uuid.uuid4()))
     # attach to logger via context
-    logger = logging.getLogger("wikimgr")
+    token = _REQ_ID.set(req_id)
     request.state.req_id = req_id
-    response: Response = await call_next(request)
+    phases = begin_request_timing()
+    start = time.perf_counter()
+    try:
+        response: Response = await call_next(request)
+    finally:
+        _REQ_ID.reset(token)
+    total = time.perf_counter() - start
     response.headers["X-Request-Id"] = req_id
-    # basic access log
-    logger.info(json.dumps({
-        "msg": "request",
-        "req_id": req_id,
-        "method": request.method,
-        "path": request.url.path,
-        "status": response.status_code,
-    }))
-    return response
\ No newline at end of file
+    response.headers["Server-Timing"] = server_timing_header(phases, total)
+    # basic access log; the dict is encoded by the writer thread, not here
+    path = request.url.path
+    if response.status_code >= 400 or random.random() < access_sample_rate(path):
+        logger.info(
+            "request",
+            extra={
+                "req_id": req_id,
+                "fields": {
+                    "method": request.method,
+                    "path": path,
+                    "status": response.status_code,
+                    "duration_ms": round(total * 1000.0, 1),
+                    "timing": {
+                        name: round(ms, 1) for name, (ms, _count) in summarize(phases).items()
+                    },
+                },
+            },
+        )
+    return response
@@ -1,21 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
 
 load_dotenv()
 
-from app.core.errors import APIError
-from app.routers.api import api_router
+from app.core.admission import admit_request
+from app.core.compression import CompressionMiddleware
+from app.core.drain import install_signal_hook, reset_shutdown_drain, shutdown_drain
+from app.core.errors import APIError, error_response
+from app.core.jsonio import FastJSONResponse
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.metrics import observe_request
+from app.core.profiler import profile_request
+from app.core.services.search_service import persist_search_index
+from app.core.upstream_http import close_clients, prewarm_clients
+from app.core.upstream_probe import reset_upstream_prober, upstream_prober
+from app.routers.api import include_api_routers
 from .log_utils import inject_request_id, setup_logging
-from .models import ErrorResponse
 from .routers.content import router as content_router
 from .routers.legacy import router as legacy_router
+from .routers.metrics import router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reset_shutdown_drain()
+    install_signal_hook()
+    app.state.loop_monitor = LoopLagMonitor.from_env()
+    app.state.loop_monitor.start()
+    prewarm = asyncio.create_task(prewarm_clients())
+    reset_upstream_prober()
+    upstream_prober().start()
+    try:
+        yield
+    finally:
+        # refuse new bulk work, let started items finish, then persist and disconnect
+        await shutdown_drain().wait()
+        prewarm.cancel()
+        await upstream_prober().stop()
+        persist_search_index(force=True)
+        await app.state.loop_monitor.stop()
+        await close_clients()
+
 
-app = FastAPI(title="Wiki Manager", version="0.2.0")
+app = FastAPI(
+    title="Wiki Manager",
+    version="0.2.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 setup_logging()
-app.include_router(api_router)
+include_api_routers(app)
 app.include_router(legacy_router, prefix="")
 app.include_router(content_router, prefix="")
+app.include_router(metrics_router, prefix="")
+
+
+@app.middleware("http")
+async def admission_control(request, call_next):
+    return await admit_request(request, call_next)
 
 
 @app.middleware("http")
@@ -23,9 +68,20 @@ async def add_req_id(request, call_next):
     return await inject_request_id(request, call_next)
 
 
+@app.middleware("http")
+async def record_metrics(request, call_next):
+    return await observe_request(request, call_next)
+
+
+@app.middleware("http")
+async def profile_requests(request, call_next):
+    return await profile_request(request, call_next)
+
+
+# outermost: compresses whatever the rest of the stack produced, streaming bodies included
+app.add_middleware(CompressionMiddleware)
+
+
 @app.exception_handler(APIError)
 async def api_error_handler(_request: Request, exc: APIError):
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=ErrorResponse(code=exc.code, message=exc.message, details=exc.details).model_dump(),
-    )
+    return error_response(exc)
@@ -113,6 +113,11 @@ class HealthResponse(BaseModel):
 class ReadyResponse(BaseModel):
     ready: bool
     reason: str | None = None
+    circuit: Literal["closed", "open", "half_open"] | None = None
+    retry_after_s: float | None = None
+    upstream: Literal["ok", "degraded", "down"] | None = None
+    upstream_latency_ms: float | None = None
+    upstream_error_rate: float | None = None
 
 
 class UpsertPageRequest(BaseModel):
@@ -273,3 +278,95 @@ class InventoryPage(BaseModel):
 class InventoryResponse(BaseModel):
     count: int
     pages: list[InventoryPage] = Field(default_factory=list)
+
+
+class SearchHit(BaseModel):
+    id: int
+    path: str
+    title: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    count: int
+    results: list[SearchHit] = Field(default_factory=list)
+
+
+class SearchRefreshResponse(BaseModel):
+    indexed: int
+    updated: int
+    removed: int
+    errors: dict[int, str] = Field(default_factory=dict)
+
+
+class DuplicatePage(BaseModel):
+    id: int
+    path: str
+    title: str = ""
+    createdAt: str = ""
+    updatedAt: str = ""
+
+
+class DuplicatePair(BaseModel):
+    a: str
+    b: str
+    similarity: float
+
+
+class DuplicateCluster(BaseModel):
+    target: str
+    similarity: float
+    pages: list[DuplicatePage] = Field(default_factory=list)
+    pairs: list[DuplicatePair] = Field(default_factory=list)
+    moves: list[BulkMoveItem] = Field(default_factory=list)
+
+
+class DuplicatesResponse(BaseModel):
+    page_count: int
+    candidate_pairs: int
+    threshold: float
+    clusters: list[DuplicateCluster] = Field(default_factory=list)
+    bulk_move: BulkMoveRequest
+    fetch_errors: dict[int, str] = Field(default_factory=dict)
+
+
+class BrokenLink(BaseModel):
+    source: str
+    target: str
+
+
+class LinkCount(BaseModel):
+    path: str
+    inbound: int
+
+
+class LinkReportResponse(BaseModel):
+    page_count: int
+    link_count: int
+    broken: list[BrokenLink] = Field(default_factory=list)
+    orphans: list[str] = Field(default_factory=list)
+    most_linked: list[LinkCount] = Field(default_factory=list)
+    fetch_errors: dict[int, str] = Field(default_factory=dict)
+
+
+class ProfileStartRequest(BaseModel):
+    route: str = Field(
+        default="*", description="fnmatch pattern on the request path, e.g. '/api/v1/pages*'"
+    )
+    requests: int = Field(default=50, ge=1, le=10000)
+    mode: Literal["sampling", "cprofile"] = "sampling"
+    interval_ms: float = Field(default=5.0, ge=1.0, le=100.0)
+    timeout_s: float = Field(default=300.0, gt=0, le=3600.0)
+
+
+class ProfileStatusResponse(BaseModel):
+    active: bool
+    mode: Literal["sampling", "cprofile"]
+    route: str
+    requests: int
+    remaining: int
+    profiled: int
+    samples: int
+    started_at: float
+    finished_at: float | None = None
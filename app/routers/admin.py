@@ -0,0 +1,63 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from app.core.auth import require_admin_key
+from app.core.profiler import current_profile, finished_profile, start_profile, stop_profile
+from app.models import ErrorResponse, ProfileStartRequest, ProfileStatusResponse
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+ERROR_RESPONSES = {
+    401: {"model": ErrorResponse},
+    403: {"model": ErrorResponse},
+    404: {"model": ErrorResponse},
+    409: {"model": ErrorResponse},
+}
+
+
+@router.post("/profile", response_model=ProfileStatusResponse, responses=ERROR_RESPONSES)
+async def start_profile_endpoint(payload: ProfileStartRequest) -> ProfileStatusResponse:
+    session = start_profile(
+        route=payload.route,
+        requests=payload.requests,
+        mode=payload.mode,
+        interval_s=payload.interval_ms / 1000.0,
+        timeout_s=payload.timeout_s,
+    )
+    return ProfileStatusResponse(**session.status())
+
+
+@router.get("/profile", response_model=ProfileStatusResponse, responses=ERROR_RESPONSES)
+async def profile_status_endpoint() -> ProfileStatusResponse:
+    return ProfileStatusResponse(**current_profile().status())
+
+
+@router.delete("/profile", response_model=ProfileStatusResponse, responses=ERROR_RESPONSES)
+async def stop_profile_endpoint() -> ProfileStatusResponse:
+    return ProfileStatusResponse(**stop_profile().status())
+
+
+@router.get("/profile/result", response_class=PlainTextResponse, responses=ERROR_RESPONSES)
+async def profile_result_endpoint(
+    format: Literal["collapsed", "pstats", "prof"] = Query(default="pstats"),
+    sort: str = Query(
+        default="cumulative", description="pstats sort key; 'tottime' ranks by self time"
+    ),
+    limit: int = Query(default=50, ge=1, le=1000),
+) -> Response:
+    session = finished_profile()
+    if format == "collapsed":
+        return PlainTextResponse(session.collapsed())
+    if format == "prof":
+        return Response(
+            session.prof_bytes(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="wikimgr.prof"'},
+        )
+    return PlainTextResponse(session.pstats_text(sort=sort, limit=limit))
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core.auth import require_api_key
+from app.models import DuplicatesResponse, ErrorResponse
+
+router = APIRouter(
+    prefix="/analysis",
+    tags=["analysis"],
+    dependencies=[Depends(require_api_key)],
+)
+
+ERROR_RESPONSES = {
+    401: {"model": ErrorResponse},
+    502: {"model": ErrorResponse},
+    504: {"model": ErrorResponse},
+}
+
+
+@router.get("/duplicates", response_model=DuplicatesResponse, responses=ERROR_RESPONSES)
+def duplicates_endpoint(
+    threshold: float = Query(default=0.8, ge=0.1, le=1.0, description="Minimum Jaccard similarity"),
+    prefix: list[str] = Query(default=[], description="Restrict analysis to these path prefixes"),
+) -> DuplicatesResponse:
+    # imported on first use: the MinHash stack pulls in numpy, a large share of cold start
+    from app.core.services.dedupe_service import find_duplicates
+
+    return find_duplicates(threshold=threshold, prefixes=prefix)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response
 
 from app.core.auth import require_api_key
+from app.core.jsonio import model_response
 from app.core.services.bulk_service import bulk_move, bulk_redirect, bulk_relink, inventory
 from app.models import (
     BulkMoveRequest,
@@ -29,20 +31,20 @@ ERROR_RESPONSES = {
 
 
 @router.post("/bulk-move", response_model=BulkMoveResponse, responses=ERROR_RESPONSES)
-async def bulk_move_endpoint(payload: BulkMoveRequest) -> BulkMoveResponse:
-    return await bulk_move(payload)
+async def bulk_move_endpoint(payload: BulkMoveRequest) -> Response:
+    return model_response(await bulk_move(payload))
 
 
 @router.post("/bulk-redirect", response_model=BulkRedirectResponse, responses=ERROR_RESPONSES)
-async def bulk_redirect_endpoint(payload: BulkRedirectRequest) -> BulkRedirectResponse:
-    return await bulk_redirect(payload)
+async def bulk_redirect_endpoint(payload: BulkRedirectRequest) -> Response:
+    return model_response(await bulk_redirect(payload))
 
 
 @router.post("/bulk-relink", response_model=BulkRelinkResponse, responses=ERROR_RESPONSES)
-async def bulk_relink_endpoint(payload: BulkRelinkRequest) -> BulkRelinkResponse:
-    return await bulk_relink(payload)
+async def bulk_relink_endpoint(payload: BulkRelinkRequest) -> Response:
+    return model_response(await bulk_relink(payload))
 
 
 @router.get("/inventory", response_model=InventoryResponse, responses=ERROR_RESPONSES)
-def inventory_endpoint(include_content: bool = False) -> InventoryResponse:
-    return inventory(include_content=include_content)
+def inventory_endpoint(include_content: bool = False) -> Response:
+    return model_response(inventory(include_content=include_content))
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from collections import Counter
+
 from fastapi import APIRouter, Depends, HTTPException
 
+from app.core.errors import APIError
 from app.core.paths import configured_allowed_roots, preflight_analysis
 from app.deps import require_api_key_legacy
 from app.content_tree import build_tree, render_tree_text
 from app.models import ContentTreeResult, PreflightReq, PreflightResult
-from app.wikijs_api import list_pages
+from app.wikijs_api import list_page_records
 
 router = APIRouter(
     prefix="/content",
@@ -18,21 +21,21 @@ router = APIRouter(
 @router.get("/tree", response_model=ContentTreeResult)
 def content_tree():
     try:
-        pages = list_pages(limit=1000)
+        records = list_page_records(limit=1000)
+    except APIError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"list pages failed: {e}")
 
-    paths = [item.get("path", "") for item in pages]
-    tree = build_tree(paths)
-
-    roots = [path.strip("/").split("/")[0] for path in paths if path and path.strip("/")]
-    root_counts = {key: roots.count(key) for key in sorted(set(roots))}
+    tree = build_tree(records)
+    roots = Counter(filter(None, map(records.root, range(len(records)))))
+    root_counts = {key: roots[key] for key in sorted(roots)}
 
     return {
         "roots": tree,
         "tree_text": render_tree_text(tree),
         "stats": {
-            "page_count": len(paths),
+            "page_count": len(records),
             "root_counts": root_counts,
         },
     }
@@ -41,14 +44,15 @@ def content_tree():
 @router.post("/preflight", response_model=PreflightResult)
 def content_preflight(req: PreflightReq):
     try:
-        pages = list_pages(limit=1000)
+        records = list_page_records(limit=1000)
+    except APIError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"list pages failed: {e}")
 
-    existing_paths = [item.get("path", "") for item in pages if item.get("path")]
     allowed_roots = configured_allowed_roots()
     return preflight_analysis(
         req.path,
         allowed_roots=allowed_roots,
-        existing_paths=existing_paths,
+        existing_paths=records,
     )
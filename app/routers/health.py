@@ -1,13 +1,29 @@
+import math
 from os import getenv
 
 from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse
 
+from app.core.circuit import breaker_for
+from app.core.drain import shutdown_drain
+from app.core.upstream_probe import UpstreamHealth, ready_fail_on, upstream_prober
 from app.models import HealthResponse, ReadyResponse
 
 router = APIRouter(tags=["health"])
 
 
+def _upstream_reason(health: UpstreamHealth) -> str:
+    if health.status == "down":
+        return (
+            f"Wiki.js down: {health.consecutive_failures} consecutive probe failures"
+            f" (last: {health.last_error})"
+        )
+    detail = [f"probe error rate {health.error_rate:.0%}"]
+    if health.latency_ms is not None:
+        detail.append(f"median latency {health.latency_ms:.0f}ms")
+    return f"Wiki.js degraded: {', '.join(detail)}"
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     return HealthResponse(ok=True)
@@ -16,18 +32,66 @@ async def health() -> HealthResponse:
 @router.get(
     "/ready",
     response_model=ReadyResponse,
-    responses={503: {"model": ReadyResponse, "description": "Missing required Wiki.js env vars"}},
+    response_model_exclude_none=True,
+    responses={
+        503: {
+            "model": ReadyResponse,
+            "description": (
+                "Missing required Wiki.js env vars, the Wiki.js circuit is open, "
+                "or the background probe finds Wiki.js down"
+            ),
+        }
+    },
 )
 async def ready():
+    result, headers = readiness()
+    if not result.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=result.model_dump(exclude_none=True),
+            headers=headers,
+        )
+    return result
+
+
+def readiness() -> tuple[ReadyResponse, dict[str, str]]:
+    """Readiness verdict and its response headers, shared by ``/api/v1/ready`` and ``/readyz``.
+
+    Not ready when the Wiki.js env vars are missing, the process is draining, the circuit is
+    open, or the background probe's cached verdict is in ``WIKIMGR_READY_FAIL_ON``.
+    """
     missing: list[str] = []
     if not getenv("WIKIJS_BASE_URL"):
         missing.append("WIKIJS_BASE_URL missing")
     if not getenv("WIKIJS_API_TOKEN"):
         missing.append("WIKIJS_API_TOKEN missing")
-
     if missing:
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content=ReadyResponse(ready=False, reason="; ".join(missing)).model_dump(),
-        )
-    return ReadyResponse(ready=True)
+        return ReadyResponse(ready=False, reason="; ".join(missing)), {}
+
+    if shutdown_drain().draining:
+        return ReadyResponse(ready=False, reason="shutting down"), {}
+
+    breaker = breaker_for(f"{getenv('WIKIJS_BASE_URL', '').rstrip('/')}/graphql")
+    circuit = breaker.state
+    if circuit == "open":
+        retry_after = breaker.retry_after_s()
+        return ReadyResponse(
+            ready=False,
+            reason=f"Wiki.js circuit open after {breaker.failures} consecutive failures",
+            circuit=circuit,
+            retry_after_s=round(retry_after, 1),
+        ), {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+    # cached verdict of the background prober; fields stay out until it has a sample
+    probe = upstream_prober().health()
+    upstream = None if probe.status == "unknown" else probe.status
+    failing = upstream in ready_fail_on()
+    result = ReadyResponse(
+        ready=not failing,
+        reason=_upstream_reason(probe) if failing else None,
+        circuit=circuit,
+        upstream=upstream,
+        upstream_latency_ms=probe.latency_ms,
+        upstream_error_rate=probe.error_rate,
+    )
+    return result, {"Retry-After": str(upstream_prober().retry_after_s())} if failing else {}
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from os import getenv
 from typing import Optional
 
 from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
@@ -24,6 +23,7 @@ from app.models import (
     UploadPageResult,
     UpsertResult,
 )
+from app.routers.health import readiness
 from app.services.upload_service import (
     bulk_upload_workflow,
     execute_upsert,
@@ -48,8 +48,11 @@ async def healthz(response: Response):
 @router.get("/readyz")
 async def readyz(response: Response):
     _set_deprecation_headers(response, "/api/v1/ready")
-    ready = bool(getenv("WIKIJS_BASE_URL") and getenv("WIKIJS_API_TOKEN"))
-    return JSONResponse({"ready": ready}, status_code=200 if ready else 503, headers=response.headers)
+    result, headers = readiness()
+    response.headers.update(headers)
+    return JSONResponse(
+        {"ready": result.ready}, status_code=200 if result.ready else 503, headers=response.headers
+    )
 
 
 @router.post("/pages/upsert", response_model=UpsertResult)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core.auth import require_api_key
+from app.core.services.links_service import link_report
+from app.models import ErrorResponse, LinkReportResponse
+
+router = APIRouter(
+    prefix="/links",
+    tags=["links"],
+    dependencies=[Depends(require_api_key)],
+)
+
+ERROR_RESPONSES = {
+    401: {"model": ErrorResponse},
+    502: {"model": ErrorResponse},
+    504: {"model": ErrorResponse},
+}
+
+
+@router.get("/report", response_model=LinkReportResponse, responses=ERROR_RESPONSES)
+def link_report_endpoint(
+    refresh: bool = Query(default=True, description="Sync changed pages before reporting"),
+    top: int = Query(default=20, ge=1, le=500, description="Size of the most-linked list"),
+) -> LinkReportResponse:
+    return link_report(refresh=refresh, top=top)
@@ -23,6 +23,7 @@ ERROR_RESPONSES = {
     400: {"model": ErrorResponse},
     401: {"model": ErrorResponse},
     404: {"model": ErrorResponse},
+    409: {"model": ErrorResponse},
     502: {"model": ErrorResponse},
     504: {"model": ErrorResponse},
 }
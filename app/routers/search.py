@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core.auth import require_api_key
+from app.core.services.search_service import refresh_search_index, search_pages
+from app.models import ErrorResponse, SearchRefreshResponse, SearchResponse
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+    dependencies=[Depends(require_api_key)],
+)
+
+ERROR_RESPONSES = {
+    401: {"model": ErrorResponse},
+    502: {"model": ErrorResponse},
+    504: {"model": ErrorResponse},
+}
+
+
+@router.get("", response_model=SearchResponse, responses=ERROR_RESPONSES)
+def search_endpoint(
+    q: str = Query(..., min_length=1, description="Free-text query"),
+    prefix: list[str] = Query(default=[], description="Restrict results to these path prefixes"),
+    limit: int = Query(default=20, ge=1, le=200),
+) -> SearchResponse:
+    return search_pages(q, prefixes=prefix, limit=limit)
+
+
+@router.post("/refresh", response_model=SearchRefreshResponse, responses=ERROR_RESPONSES)
+def search_refresh_endpoint() -> SearchRefreshResponse:
+    return refresh_search_index()
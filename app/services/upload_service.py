@@ -1,7 +1,11 @@
 from pathlib import Path
 
 from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
 
+from app.core.concurrency import upstream_priority
+from app.core.errors import APIError
+from app.core.services.pages_service import record_upsert
 from app.models import (
     BulkUploadFailure,
     BulkUploadResult,
@@ -29,6 +33,9 @@ async def execute_upsert(
     wikijs_client = client or WikiJSClient.from_env()
     try:
         result = await wikijs_client.upsert_page(payload, idem_key=idem)
+        await run_in_threadpool(
+            record_upsert, result["id"], result["path"], payload.title, payload.content or ""
+        )
         return UpsertResult(id=result["id"], path=result["path"], idempotency_key=idem)
     except WikiError as e:
         raise HTTPException(status_code=e.status, detail=e.message)
@@ -116,10 +123,14 @@ async def bulk_upload_workflow(
                 is_private=parsed_private,
                 tags=parsed_tags,
             )
-            upserted = await execute_upsert(payload, idem, client=client)
+            with upstream_priority("bulk"):
+                upserted = await execute_upsert(payload, idem, client=client)
             successes.append(BulkUploadSuccess(filename=filename, idempotency_key=idem, page=upserted))
         except HTTPException as e:
             failures.append(BulkUploadFailure(filename=filename, reason=str(e.detail)))
+        except APIError as e:
+            # a limiter or circuit rejection fails this file only, not the whole batch
+            failures.append(BulkUploadFailure(filename=filename, reason=e.message))
 
     return BulkUploadResult(
         ok=len(failures) == 0,
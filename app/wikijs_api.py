@@ -2,14 +2,29 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
+import re
 from typing import Any, Dict, Optional
 
-import httpx
+from app.core.circuit import breaker_for
+from app.core.concurrency import UPSTREAM_LIMITER
+from app.core.errors import APIError
+from app.core.jsonio import dumps, loads
+from app.core.metrics import observe_upstream, record_cache
+from app.core.page_records import PageRecords, PathIndex
+from app.core.shared_cache import cache_store, listing_ttl_s
+from app.core.timing import timed
+from app.core.upstream_http import encode_body, sync_client
+
+logger = logging.getLogger("wikimgr.upstream")
 
 # Queries
 QUERY_LIST = """{ pages { list(orderBy: TITLE) { id path title } } }"""
 
+# Listing with change markers, used to sync local indexes incrementally.
+QUERY_LIST_VERSIONS = """{ pages { list(orderBy: TITLE) { id path title updatedAt } } }"""
+
 QUERY_SINGLE_FULL = """
 query One($id:Int!) {
   pages {
@@ -46,6 +61,15 @@ mutation Del($id:Int!) {
 }
 """
 
+_OPERATION_RE = re.compile(r"pages\s*\{\s*(\w+)")
+
+
+def graphql_operation(query: str) -> str:
+    """Name of the ``pages`` field a query/mutation targets (``list``, ``singleByPath``, ...)."""
+    match = _OPERATION_RE.search(query)
+    return match.group(1) if match else "unknown"
+
+
 def _graphql_url() -> str:
     base_url = os.getenv("WIKIJS_BASE_URL", "").rstrip("/")
     if not base_url:
@@ -67,31 +91,75 @@ def _headers() -> dict[str, str]:
 
 
 def _post(query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    with httpx.Client(timeout=60) as c:
-        r = c.post(
-            _graphql_url(),
-            headers=_headers(),
-            json={"query": query, "variables": variables or {}},
+    operation = graphql_operation(query)
+    url = _graphql_url()
+    try:
+        with (
+            breaker_for(url).guard(),
+            UPSTREAM_LIMITER.slot(),
+            observe_upstream(operation),
+            timed(f"gql-{operation}"),
+        ):
+            body, encoding_headers = encode_body(
+                dumps({"query": query, "variables": variables or {}})
+            )
+            r = sync_client().post(url, headers={**_headers(), **encoding_headers}, content=body)
+            r.raise_for_status()
+            data = loads(r.content)
+            if data.get("errors"):
+                raise RuntimeError(json.dumps(data["errors"]))
+            return data["data"]
+    except Exception as e:
+        logger.warning(
+            "upstream call failed",
+            extra={"fields": {"operation": operation, "error": str(e)[:500]}},
         )
-    r.raise_for_status()
-    data = r.json()
-    if data.get("errors"):
-        raise RuntimeError(json.dumps(data["errors"]))
-    return data["data"]
+        raise
+
+
+# In-process cache: path -> id over the last full listing (lives in the shared store when
+# several workers run)
+_PATH_ID_CACHE = PathIndex()
+
+# Generation namespace bumped on every page write; shared caches built from an older
+# generation are stale in every worker.
+PAGES_GENERATION = "pages"
+
+
+def _path_ids():
+    store = cache_store()
+    return store.mapping("path_id") if store.shared else _PATH_ID_CACHE
 
 
-# In-process cache: path -> id
-_PATH_ID_CACHE: Dict[str, int] = {}
+def remember_path(path: str, id: int) -> None:
+    _path_ids()[path.strip("/")] = int(id)
 
 
-def refresh_index() -> Dict[str, int]:
+def forget_page(id: int, path: Optional[str] = None) -> None:
+    """Drop cached lookups for a deleted or moved page and invalidate shared listings."""
+    cache = _path_ids()
+    if path:
+        cache.pop(path.strip("/"), None)
+    cache.remove_value(int(id))
+    note_page_write()
+
+
+def note_page_write() -> None:
+    cache_store().bump(PAGES_GENERATION)
+
+
+def refresh_index() -> PageRecords:
+    """Full ``path -> id`` listing; it also becomes the snapshot behind the path cache."""
     data = _post(QUERY_LIST)
-    mapping = {
-        item["path"].strip("/"): int(item["id"]) for item in data["pages"]["list"]
-    }
-    _PATH_ID_CACHE.clear()
-    _PATH_ID_CACHE.update(mapping)
-    return _PATH_ID_CACHE
+    records = PageRecords.from_pages(data["pages"]["list"], titles=False)
+    _path_ids().replace(records)
+    return records
+
+
+def list_page_records(limit: Optional[int] = None) -> PageRecords:
+    """Listing as compact records, for features that hold or walk every page."""
+    data = _post(QUERY_LIST)
+    return PageRecords.from_pages(data["pages"]["list"][:limit])
 
 
 def list_pages(limit: int = 1000) -> list[Dict[str, Any]]:
@@ -108,21 +176,52 @@ def list_pages(limit: int = 1000) -> list[Dict[str, Any]]:
     return pages
 
 
+def list_page_versions() -> list[Dict[str, Any]]:
+    """Listing with ``updatedAt`` markers. With a shared store, workers reuse one listing
+    for ``WIKIMGR_SHARED_LISTING_TTL_S`` unless a page was written since it was taken."""
+    store = cache_store()
+    ttl_s = listing_ttl_s() if store.shared else 0.0
+    if ttl_s:
+        generation = store.generation(PAGES_GENERATION)
+        cached = store.get("listing", "versions")
+        if cached is not None and cached["generation"] == generation:
+            record_cache("listing", hit=True)
+            return cached["pages"]
+        record_cache("listing", hit=False)
+    data = _post(QUERY_LIST_VERSIONS)
+    pages = [
+        {
+            "id": int(item["id"]),
+            "path": item["path"].strip("/"),
+            "title": item.get("title") or "",
+            "updatedAt": item.get("updatedAt") or "",
+        }
+        for item in data["pages"]["list"]
+    ]
+    if ttl_s:
+        store.set("listing", "versions", {"generation": generation, "pages": pages}, ttl_s=ttl_s)
+    return pages
+
+
 def resolve_id(path: Optional[str] = None, id: Optional[int] = None) -> int:
     if id is not None:
         return int(id)
     if not path:
         raise ValueError("path or id is required")
     norm = path.strip("/")
+    cache = _path_ids()
     # cache hit?
-    if norm in _PATH_ID_CACHE:
-        return _PATH_ID_CACHE[norm]
+    cached = cache.get(norm)
+    if cached is not None:
+        record_cache("path_id", hit=True)
+        return cached
+    record_cache("path_id", hit=False)
     # try search exact match
     try:
         data = _post(QUERY_SEARCH, {"q": norm.split("/")[-1]})
         for item in data["pages"]["search"]:
             if item["path"].strip("/") == norm:
-                _PATH_ID_CACHE[norm] = int(item["id"])
+                cache[norm] = int(item["id"])
                 return int(item["id"])
     except Exception:
         pass
@@ -173,6 +272,8 @@ def delete_by_id(id: int) -> bool:
         d = _post(MUTATION_DELETE, {"id": id})
         ok = d["pages"]["delete"]["operation"]["succeeded"]
         return bool(ok)
+    except APIError:
+        raise
     except Exception:
         # some versions/roles don't expose delete; upstream may forbid it
         return False
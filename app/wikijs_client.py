@@ -1,11 +1,31 @@
 import asyncio
 import hashlib
+import logging
 import os
+import time
 from dataclasses import dataclass
 
 import httpx
 
+from .core.circuit import breaker_for
+from .core.concurrency import UPSTREAM_LIMITER
+from .core.jsonio import dumps, loads
+from .core.metrics import UPSTREAM_HEDGES, UPSTREAM_RETRIES, observe_upstream
+from .core.retry import (
+    HEDGEABLE_OPERATIONS,
+    MAX_ATTEMPTS,
+    RETRY_BUDGET,
+    UPSTREAM_LATENCY,
+    hedge_delay_s,
+    hedging_enabled,
+    retry_delay,
+)
+from .core.timing import timed
+from .core.upstream_http import async_client, encode_body
 from .models import PagePayload
+from .wikijs_api import graphql_operation
+
+logger = logging.getLogger("wikimgr.upstream")
 
 # --- Path policy helpers ------------------------------------------------------
 MIN_SEG_LEN = 3
@@ -53,6 +73,14 @@ class WikiError(Exception):
         self.message = message
 
 
+def _wiki_error(exc: httpx.RequestError | httpx.HTTPStatusError, attempts: int) -> WikiError:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return WikiError(
+            502, f"Wiki.js answered HTTP {exc.response.status_code} after {attempts} attempt(s)"
+        )
+    return WikiError(504, f"Network error talking to Wiki.js: {exc}")
+
+
 @dataclass
 class WikiJSClient:
     base_url: str
@@ -80,29 +108,105 @@ class WikiJSClient:
         if variables:
             payload["variables"] = variables
 
-        # retry simple network/5xx with backoff
-        for attempt in range(4):
+        operation = graphql_operation(query)
+        breaker = breaker_for(self.graphql_url)
+        hedge = operation in HEDGEABLE_OPERATIONS and hedging_enabled()
+        RETRY_BUDGET.record_request()
+
+        # retry network errors, 5xx and 429 with jittered backoff within the retry budget;
+        # an open circuit ends the chain early
+        for attempt in range(MAX_ATTEMPTS):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout_s) as client:
-                    resp = await client.post(
-                        self.graphql_url, json=payload, headers=headers
+                if hedge:
+                    return await self._hedged(operation, payload, headers, breaker)
+                return await self._attempt(operation, payload, headers, breaker)
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                delay = retry_delay(e, operation, attempt)
+                if delay is None:
+                    logger.error(
+                        "upstream call failed",
+                        extra={
+                            "fields": {
+                                "operation": operation,
+                                "attempts": attempt + 1,
+                                "error": str(e),
+                            }
+                        },
                     )
-                # GraphQL always returns 200 for app-level errors; inspect body
-                data = resp.json()
-                if "errors" in data and data["errors"]:
-                    # bubble up the first error message
-                    msg = data["errors"][0].get("message", "GraphQL error")
-                    # treat as 502 (upstream) to keep behavior
-                    raise WikiError(502, f"Wiki.js GraphQL error: {msg}")
-                return data["data"]
-            except httpx.RequestError as e:
-                if attempt == 3:
-                    raise WikiError(
-                        504, f"Network error talking to Wiki.js: {e}"
-                    ) from e
-                await asyncio.sleep(0.5 * (2**attempt))
+                    raise _wiki_error(e, attempt + 1) from e
+                logger.warning(
+                    "upstream retry",
+                    extra={
+                        "fields": {
+                            "operation": operation,
+                            "attempt": attempt + 1,
+                            "delay_ms": round(delay * 1000.0, 1),
+                            "error": str(e),
+                        }
+                    },
+                )
+                UPSTREAM_RETRIES.labels(operation=operation).inc()
+                with timed("backoff"):
+                    await asyncio.sleep(delay)
         raise WikiError(502, "Wiki.js upstream unavailable after retries")
 
+    async def _attempt(self, operation: str, payload: dict, headers: dict, breaker) -> dict:
+        with breaker.guard():
+            async with UPSTREAM_LIMITER.slot_async():
+                with observe_upstream(operation), timed(f"gql-{operation}"):
+                    start = time.perf_counter()
+                    body, encoding_headers = encode_body(dumps(payload))
+                    resp = await async_client().post(
+                        self.graphql_url,
+                        content=body,
+                        headers={**headers, **encoding_headers},
+                        timeout=self.timeout_s,
+                    )
+                    if resp.status_code >= 500 or resp.status_code == 429:
+                        # retryable; Retry-After is read from the raised error's response
+                        resp.raise_for_status()
+                    try:
+                        data = loads(resp.content)
+                    except ValueError:
+                        raise WikiError(
+                            502, f"Wiki.js returned a non-JSON response (HTTP {resp.status_code})"
+                        )
+                    UPSTREAM_LATENCY.observe(operation, time.perf_counter() - start)
+                    # GraphQL always returns 200 for app-level errors; inspect body
+                    if "errors" in data and data["errors"]:
+                        # bubble up the first error message
+                        msg = data["errors"][0].get("message", "GraphQL error")
+                        # treat as 502 (upstream) to keep behavior
+                        raise WikiError(502, f"Wiki.js GraphQL error: {msg}")
+                    if resp.is_error:
+                        raise WikiError(502, f"Wiki.js answered HTTP {resp.status_code}")
+                    return data["data"]
+
+    async def _hedged(self, operation: str, payload: dict, headers: dict, breaker) -> dict:
+        """Send a second copy of an idempotent read if the first is slower than recent p95."""
+        primary = asyncio.ensure_future(self._attempt(operation, payload, headers, breaker))
+        hedge: asyncio.Future | None = None
+        try:
+            # inside the try: a caller cancelled during the delay must not leave primary running
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay_s(operation))
+            if done or not RETRY_BUDGET.try_spend():
+                return await primary
+            hedge = asyncio.ensure_future(self._attempt(operation, payload, headers, breaker))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = "hedge" if task is hedge else "primary"
+                        UPSTREAM_HEDGES.labels(operation=operation, winner=winner).inc()
+                        return task.result()
+            UPSTREAM_HEDGES.labels(operation=operation, winner="none").inc()
+            return await primary
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
     async def get_page_by_path(
         self, path: str, locale: str | None = None
     ) -> dict | None:
@@ -205,7 +309,8 @@ class WikiJSClient:
 
     async def upsert_page(self, payload: PagePayload, idem_key: str) -> dict:
         # normalize + enforce path rules
-        clean_path = enforce_path_policy(normalize_path(payload.path))
+        with timed("path"):
+            clean_path = enforce_path_policy(normalize_path(payload.path))
         # update payload path for downstream calls
         payload.path = clean_path
         # idem_key currently unused by Wiki.js; we still compute/accept it for logging/echo.
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_http(url: str, timeout_s: float = 30.0) -> float:
+    """Poll ``url`` until it answers 200; returns seconds waited."""
+    start = time.perf_counter()
+    deadline = start + timeout_s
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"{url} did not become ready within {timeout_s}s")
+
+
+def _spawn(args: list[str], env: dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=REPO_ROOT,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=None if os.getenv("BENCH_VERBOSE") else subprocess.DEVNULL,
+    )
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+@contextmanager
+def fake_wikijs(
+    pages: int = 0,
+    latency_ms: float = 0.0,
+    content_bytes: int = 2000,
+    extra_args: list[str] | None = None,
+) -> Iterator[str]:
+    """Run ``benchmarks.fake_wikijs`` in a subprocess and yield its base URL."""
+    port = free_port()
+    args = [
+        "-m",
+        "benchmarks.fake_wikijs",
+        "--port",
+        str(port),
+        "--pages",
+        str(pages),
+        "--content-bytes",
+        str(content_bytes),
+        "--latency-ms",
+        str(latency_ms),
+        *(extra_args or []),
+    ]
+    proc = _spawn(args, {})
+    base = f"http://127.0.0.1:{port}"
+    try:
+        wait_http(f"{base}/__stats", timeout_s=max(30.0, pages / 500.0))
+        yield base
+    finally:
+        _stop(proc)
+
+
+@contextmanager
+def wikimgr(upstream: str, env: dict[str, str] | None = None, workers: int = 1) -> Iterator[str]:
+    """Run the wikimgr app under uvicorn against ``upstream`` and yield its base URL."""
+    port = free_port()
+    with tempfile.TemporaryDirectory(prefix="wikimgr-bench-") as state_dir:
+        child_env = {
+            "WIKIJS_BASE_URL": upstream,
+            "WIKIJS_API_TOKEN": "bench-token",
+            "WIKIMGR_API_KEY": "",
+            "WIKIMGR_STATE_DIR": state_dir,
+            **(env or {}),
+        }
+        args = [
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+            "--workers",
+            str(workers),
+        ]
+        proc = _spawn(args, child_env)
+        base = f"http://127.0.0.1:{port}"
+        try:
+            wait_http(f"{base}/api/v1/health")
+            yield base
+        finally:
+            _stop(proc)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(latencies_s: list[float], elapsed_s: float, errors: int = 0) -> dict[str, Any]:
+    values = sorted(v * 1000.0 for v in latencies_s)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "mean_ms": round(sum(values) / count, 3) if count else 0.0,
+        "throughput_rps": round(count / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+    }
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def save_results(name: str, data: dict[str, Any], out_dir: Path | None = None) -> Path:
+    out = out_dir or RESULTS_DIR
+    out.mkdir(parents=True, exist_ok=True)
+    path = out / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def compare_results(
+    current: dict[str, dict], baseline: dict[str, dict], keys: tuple[str, ...]
+) -> list[str]:
+    """Human-readable percentage deltas for ``keys`` of every operation present in both runs."""
+    lines = []
+    for op, cur in current.items():
+        base = baseline.get(op)
+        if not base:
+            continue
+        parts = []
+        for key in keys:
+            old, new = base.get(key), cur.get(key)
+            if not old or new is None:
+                continue
+            parts.append(f"{key} {old} -> {new} ({(new - old) / old * 100.0:+.1f}%)")
+        if parts:
+            lines.append(f"{op:>14}: " + ", ".join(parts))
+    return lines
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+
+
+ROOTS = ["homelab", "projects", "ai", "personal", "community", "meta"]
+WORDS = (
+    "proxmox ollama network cluster backup restore gpu vm docker compose runbook "
+    "service upgrade storage zfs vlan switch router firewall monitoring grafana"
+).split()
+
+
+def deep_paths(count: int, depth: int = 6, fanout: int = 8, seed: int = 1) -> list[str]:
+    """``count`` page paths spread over a tree ``depth`` levels deep with ``fanout`` children."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        segments = [rng.choice(ROOTS)]
+        for level in range(1, depth):
+            segments.append(f"{rng.choice(WORDS)}-{rng.randrange(fanout)}")
+        segments.append(f"page-{i:06d}")
+        paths.append("/".join(segments))
+    return paths
+
+
+def messy_path(seed: int = 1) -> str:
+    rng = random.Random(seed)
+    parts = [f"  {rng.choice(WORDS).upper()}__{rng.choice(WORDS)} ++ x " for _ in range(6)]
+    return "//" + "//".join(parts) + "/"
+
+
+def huge_markdown(
+    paths: list[str], size_bytes: int = 1_000_000, links_every: int = 200, seed: int = 1
+) -> str:
+    """Markdown of roughly ``size_bytes`` with an internal link every ``links_every`` bytes."""
+    rng = random.Random(seed)
+    chunks: list[str] = []
+    total = 0
+    while total < size_bytes:
+        text = " ".join(rng.choice(WORDS) for _ in range(links_every // 8))
+        link = f" see [{rng.choice(WORDS)}](/{rng.choice(paths)}) and"
+        chunk = f"{text}{link}\n"
+        chunks.append(chunk)
+        total += len(chunk)
+    return "".join(chunks)
+
+
+def link_mapping(paths: list[str], size: int) -> dict[str, str]:
+    return {path: f"moved/{path}" for path in paths[:size]}
+
+
+def inventory_pages(paths: list[str], content_bytes: int = 2_000, seed: int = 1) -> list[dict]:
+    """Wiki.js ``pages.single``-shaped records with ~``content_bytes`` of markdown each."""
+    rng = random.Random(seed)
+    body = huge_markdown(paths, size_bytes=content_bytes, seed=seed)
+    return [
+        {
+            "id": i + 1,
+            "path": path,
+            "title": path.rsplit("/", 1)[-1].replace("-", " ").title(),
+            "description": " ".join(rng.choice(WORDS) for _ in range(8)),
+            "isPrivate": False,
+            "createdAt": "2025-01-01T00:00:00.000Z",
+            "updatedAt": f"2025-06-{rng.randrange(1, 29):02d}T12:00:00.000Z",
+            "content": body,
+        }
+        for i, path in enumerate(paths)
+    ]
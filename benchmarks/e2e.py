@@ -0,0 +1,214 @@
+"""
+End-to-end throughput benchmark: wikimgr under uvicorn against the fake Wiki.js.
+
+Drives upsert, get, delete, inventory, bulk-move, bulk-relink and content-tree
+endpoints and reports p50/p95/p99 latency, throughput and upstream GraphQL calls
+per operation. Results are written to benchmarks/results/e2e-<timestamp>.json.
+
+Run:
+  python -m benchmarks.e2e --pages 1000 --requests 200 --concurrency 8
+  python -m benchmarks.e2e --pages 10000 --ops get,upsert --compare benchmarks/results/e2e-....json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from benchmarks._harness import fake_wikijs, wikimgr
+from benchmarks._stats import compare_results, environment, latency_summary, save_results
+
+ALL_OPS = [
+    "upsert",
+    "get",
+    "get_by_id",
+    "delete",
+    "inventory",
+    "bulk_move",
+    "bulk_relink",
+    "content_tree",
+]
+
+Call = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def _drive(
+    client: httpx.AsyncClient, call: Call, count: int, concurrency: int
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            try:
+                resp = await call(client, i)
+                ok = resp.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return latency_summary(latencies, time.perf_counter() - start, errors)
+
+
+def _listing(upstream: str) -> list[dict[str, Any]]:
+    query = {"query": "{ pages { list(orderBy: TITLE) { id path title } } }"}
+    return httpx.post(f"{upstream}/graphql", json=query, timeout=120).json()["data"]["pages"][
+        "list"
+    ]
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    ops = [op.strip() for op in args.ops.split(",") if op.strip()] if args.ops else ALL_OPS
+    results: dict[str, Any] = {}
+
+    with fake_wikijs(
+        pages=args.pages, latency_ms=args.latency_ms, content_bytes=args.content_bytes
+    ) as upstream:
+        with wikimgr(upstream) as api:
+            seeded = _listing(upstream)
+            rng = random.Random(args.seed)
+            sample = [rng.choice(seeded) for _ in range(args.requests)] if seeded else []
+            upserted = [f"bench/e2e/upsert-{i:06d}" for i in range(args.requests)]
+            movable = seeded[: args.bulk_size * args.bulk_rounds]
+
+            async def upsert(c, i):
+                body = {
+                    "path": upserted[i],
+                    "title": f"Upsert {i}",
+                    "content": f"# Upsert {i}\n\n" + "x" * args.content_bytes,
+                }
+                return await c.post("/api/v1/pages/upsert", json=body)
+
+            async def get(c, i):
+                return await c.get("/api/v1/pages", params={"path": sample[i]["path"]})
+
+            async def get_by_id(c, i):
+                return await c.get(f"/api/v1/pages/{sample[i]['id']}")
+
+            async def delete(c, i):
+                return await c.delete("/api/v1/pages", params={"path": upserted[i]})
+
+            async def inventory(c, i):
+                return await c.get("/api/v1/pages/inventory")
+
+            async def bulk_move(c, i):
+                batch = movable[i * args.bulk_size : (i + 1) * args.bulk_size]
+                moves = [
+                    {"from_path": p["path"], "to_path": f"{p['path']}-moved", "merge": True}
+                    for p in batch
+                ]
+                return await c.post("/api/v1/pages/bulk-move", json={"moves": moves})
+
+            async def bulk_relink(c, i):
+                scope = [p["path"] for p in seeded[: args.bulk_size]]
+                mapping = {p["path"]: f"{p['path']}-relinked" for p in seeded[: args.bulk_size]}
+                return await c.post(
+                    "/api/v1/pages/bulk-relink", json={"mapping": mapping, "scope": scope}
+                )
+
+            async def content_tree(c, i):
+                return await c.get("/content/tree")
+
+            plan: dict[str, tuple[Call, int, int]] = {
+                "upsert": (upsert, args.requests, args.concurrency),
+                "get": (get, len(sample), args.concurrency),
+                "get_by_id": (get_by_id, len(sample), args.concurrency),
+                "delete": (delete, args.requests, args.concurrency),
+                "inventory": (inventory, args.heavy_rounds, 1),
+                "bulk_move": (
+                    bulk_move,
+                    min(args.bulk_rounds, len(movable) // max(args.bulk_size, 1)),
+                    1,
+                ),
+                "bulk_relink": (bulk_relink, args.heavy_rounds, 1),
+                "content_tree": (content_tree, args.requests, args.concurrency),
+            }
+
+            timeout = httpx.Timeout(args.timeout)
+            limits = httpx.Limits(max_connections=args.concurrency * 2)
+            async with httpx.AsyncClient(base_url=api, timeout=timeout, limits=limits) as client:
+                async with httpx.AsyncClient(base_url=upstream) as fake:
+                    for op in ops:
+                        call, count, concurrency = plan[op]
+                        if count <= 0:
+                            continue
+                        await fake.post("/__reset")
+                        summary = await _drive(client, call, count, concurrency)
+                        stats = (await fake.get("/__stats")).json()
+                        summary["upstream_calls"] = stats["calls"]
+                        summary["upstream_calls_per_op"] = round(stats["total_calls"] / count, 2)
+                        results[op] = summary
+                        print(
+                            f"{op:>14}: n={summary['count']:<6} err={summary['errors']:<4} "
+                            f"p50={summary['p50_ms']:.1f}ms p95={summary['p95_ms']:.1f}ms "
+                            f"p99={summary['p99_ms']:.1f}ms {summary['throughput_rps']:.1f} req/s "
+                            f"upstream/op={summary['upstream_calls_per_op']}"
+                        )
+
+    return {
+        "meta": {
+            **environment(),
+            "pages": args.pages,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "content_bytes": args.content_bytes,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--pages", type=int, default=1000, help="Pages seeded into the fake Wiki.js (1k-50k)"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Requests per single-page operation"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Injected upstream latency")
+    parser.add_argument("--content-bytes", type=int, default=2000)
+    parser.add_argument(
+        "--bulk-size", type=int, default=20, help="Moves/relink paths per bulk request"
+    )
+    parser.add_argument("--bulk-rounds", type=int, default=3)
+    parser.add_argument("--heavy-rounds", type=int, default=1, help="Inventory/relink repetitions")
+    parser.add_argument("--ops", default="", help=f"Comma-separated subset of {','.join(ALL_OPS)}")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, default=None, help="Results directory")
+    parser.add_argument(
+        "--compare", type=Path, default=None, help="Previous results JSON to diff against"
+    )
+    args = parser.parse_args()
+
+    data = asyncio.run(run(args))
+    path = save_results("e2e", data, args.out)
+    print(f"\nresults: {path}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        for line in compare_results(
+            data["results"], baseline, ("p95_ms", "throughput_rps", "upstream_calls_per_op")
+        ):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
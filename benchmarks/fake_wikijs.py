@@ -0,0 +1,311 @@
+"""
+In-memory stand-in for the Wiki.js GraphQL endpoint.
+
+It recognizes the operations wikimgr sends (``list``, ``single``, ``singleByPath``,
+``search``, ``create``, ``update``, ``delete``) by the ``pages { <field>`` they target
+rather than parsing GraphQL, and answers with Wiki.js-shaped data. Latency and error
+injection and per-operation call counters are controlled through ``/__config``,
+``/__stats``, ``/__reset`` and ``/__seed``.
+
+Run:
+  python -m benchmarks.fake_wikijs --port 3900 --pages 1000 --latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+_OPERATION_RE = re.compile(r"pages\s*\{\s*(\w+)")
+# inline list(limit: N), as sent by the readiness probe
+_LIMIT_RE = re.compile(r"list\s*\(\s*limit:\s*(\d+)")
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    # "http" answers 502 with a non-JSON body; "graphql" answers 200 with an errors array
+    error_mode: str = "http"
+    op_latency_ms: dict[str, float] = field(default_factory=dict)
+    # simulated link speed; 0 = unlimited. Request and response bytes on the wire add delay.
+    bandwidth_mbps: float = 0.0
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FakeWiki:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pages: dict[int, dict] = {}
+        self.by_path: dict[str, int] = {}
+        self.next_id = 1
+        self.config = FakeConfig()
+        self.calls: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.calls.clear()
+            self.errors.clear()
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "pages": len(self.pages),
+                "calls": dict(self.calls),
+                "errors": dict(self.errors),
+                "total_calls": sum(self.calls.values()),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+            }
+
+    def put(self, path: str, title: str, content: str, description: str = "", **extra) -> dict:
+        path = path.strip("/")
+        with self.lock:
+            page_id = self.by_path.get(path)
+            if page_id is None:
+                page_id = self.next_id
+                self.next_id += 1
+                created = _now()
+            else:
+                created = self.pages[page_id]["createdAt"]
+            page = {
+                "id": page_id,
+                "path": path,
+                "title": title,
+                "description": description,
+                "isPrivate": bool(extra.get("isPrivate", False)),
+                "createdAt": created,
+                "updatedAt": _now(),
+                "content": content,
+                "tags": list(extra.get("tags") or []),
+            }
+            self.pages[page_id] = page
+            self.by_path[path] = page_id
+            return page
+
+    def seed(self, count: int, content_bytes: int = 2000, prefix: str = "bench") -> int:
+        roots = ["homelab", "projects", "ai", "personal", "community", "meta"]
+        filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+        for i in range(count):
+            root = roots[i % len(roots)]
+            path = f"{root}/{prefix}/section-{i % 50:03d}/page-{i:06d}"
+            previous = f"{root}/{prefix}/section-{(i - 1) % 50:03d}/page-{max(i - 1, 0):06d}"
+            links = f"\n\nSee [previous](/{previous})."
+            body = (filler * (content_bytes // len(filler) + 1))[:content_bytes]
+            self.put(path, f"Page {i}", f"# Page {i}\n\n{body}{links}")
+        return len(self.pages)
+
+
+WIKI = FakeWiki()
+app = FastAPI(title="Fake Wiki.js")
+
+
+def _summary(page: dict, *fields: str) -> dict:
+    return {key: page[key] for key in fields}
+
+
+def _handle(op: str, variables: dict) -> dict:
+    if op == "list":
+        with WIKI.lock:
+            pages = sorted(WIKI.pages.values(), key=lambda p: p["title"])[: variables.get("limit")]
+            return {"list": [_summary(p, "id", "path", "title", "updatedAt") for p in pages]}
+    if op == "single":
+        page = WIKI.pages.get(int(variables.get("id", 0)))
+        if page is None:
+            return {"single": None}
+        return {"single": {**page, "contentRaw": page["content"]}}
+    if op == "singleByPath":
+        page_id = WIKI.by_path.get(str(variables.get("path", "")).strip("/"))
+        if page_id is None:
+            raise LookupError("This page does not exist.")
+        return {"singleByPath": _summary(WIKI.pages[page_id], "id", "path", "title")}
+    if op == "search":
+        needle = str(variables.get("q", "")).lower()
+        with WIKI.lock:
+            hits = [
+                _summary(p, "id", "path", "title")
+                for p in WIKI.pages.values()
+                if needle in p["path"].lower() or needle in p["title"].lower()
+            ][:25]
+        return {"search": {"results": hits, "suggestions": [], "totalHits": len(hits)}}
+    if op == "create":
+        path = str(variables.get("path", "")).strip("/")
+        if path in WIKI.by_path:
+            result = {
+                "succeeded": False,
+                "message": (
+                    "Cannot create this page because an entry already exists at the same path."
+                ),
+                "errorCode": 6002,
+            }
+            return {"create": {"responseResult": result, "page": None}}
+        page = WIKI.put(
+            path,
+            variables.get("title", ""),
+            variables.get("content", ""),
+            variables.get("desc", ""),
+            isPrivate=variables.get("isPrivate"),
+            tags=variables.get("tags"),
+        )
+        ok = {"succeeded": True, "message": "", "errorCode": 0}
+        return {"create": {"responseResult": ok, "page": _summary(page, "id", "path", "title")}}
+    if op == "update":
+        page = WIKI.pages.get(int(variables.get("id", 0)))
+        if page is None:
+            result = {"succeeded": False, "message": "This page does not exist.", "errorCode": 6003}
+            return {"update": {"responseResult": result, "page": None}}
+        page = WIKI.put(
+            page["path"],
+            variables.get("title", ""),
+            variables.get("content", ""),
+            variables.get("desc", ""),
+            isPrivate=variables.get("isPrivate"),
+            tags=variables.get("tags"),
+        )
+        ok = {"succeeded": True, "message": "", "errorCode": 0}
+        return {"update": {"responseResult": ok, "page": _summary(page, "id", "path", "title")}}
+    if op == "delete":
+        with WIKI.lock:
+            page = WIKI.pages.pop(int(variables.get("id", 0)), None)
+            if page is not None:
+                WIKI.by_path.pop(page["path"], None)
+        result = {"succeeded": page is not None, "message": "", "errorCode": 0}
+        # Wiki.js answers with responseResult; ``operation`` mirrors the field wikimgr selects.
+        return {"delete": {"responseResult": result, "operation": result}}
+    raise ValueError(f"Unsupported operation: {op}")
+
+
+@app.post("/graphql")
+async def graphql(request: Request) -> Response:
+    raw = await request.body()
+    wire_in = len(raw)
+    if request.headers.get("content-encoding") == "gzip":
+        raw = await asyncio.to_thread(gzip.decompress, raw)
+    body = json.loads(raw or b"{}")
+    op_match = _OPERATION_RE.search(body.get("query", ""))
+    op = op_match.group(1) if op_match else "unknown"
+    cfg = WIKI.config
+    with WIKI.lock:
+        WIKI.calls[op] += 1
+        WIKI.bytes_in += wire_in
+
+    delay = cfg.op_latency_ms.get(op, cfg.latency_ms)
+    if cfg.jitter_ms:
+        delay += random.uniform(0, cfg.jitter_ms)
+    if cfg.bandwidth_mbps:
+        delay += wire_in * 8 / (cfg.bandwidth_mbps * 1000.0)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000.0)
+
+    if cfg.error_rate and random.random() < cfg.error_rate:
+        with WIKI.lock:
+            WIKI.errors[op] += 1
+        if cfg.error_mode == "graphql":
+            return JSONResponse({"data": None, "errors": [{"message": "Injected failure"}]})
+        return Response("<html>502 Bad Gateway</html>", status_code=502, media_type="text/html")
+
+    try:
+        variables = dict(body.get("variables") or {})
+        limit_match = _LIMIT_RE.search(body.get("query", ""))
+        if limit_match:
+            variables["limit"] = int(limit_match.group(1))
+        payload = {"data": {"pages": _handle(op, variables)}}
+    except LookupError as e:
+        payload = {"data": {"pages": {op: None}}, "errors": [{"message": str(e)}]}
+    except ValueError as e:
+        payload = {"data": None, "errors": [{"message": str(e)}]}
+    encoded = json.dumps(payload).encode()
+    headers = {}
+    # like Wiki.js behind its default compression middleware: gzip when the client asks.
+    # Off the loop so one large page does not stall every other in-flight request.
+    if "gzip" in request.headers.get("accept-encoding", "") and len(encoded) >= 1024:
+        encoded = await asyncio.to_thread(gzip.compress, encoded, 6)
+        headers["Content-Encoding"] = "gzip"
+    with WIKI.lock:
+        WIKI.bytes_out += len(encoded)
+    if cfg.bandwidth_mbps:
+        await asyncio.sleep(len(encoded) * 8 / (cfg.bandwidth_mbps * 1_000_000.0))
+    return Response(encoded, media_type="application/json", headers=headers)
+
+
+@app.get("/__stats")
+async def stats() -> dict:
+    return WIKI.stats()
+
+
+@app.post("/__reset")
+async def reset() -> dict:
+    WIKI.reset_stats()
+    return WIKI.stats()
+
+
+@app.post("/__config")
+async def configure(cfg: dict) -> dict:
+    merged = {**asdict(WIKI.config), **cfg}
+    WIKI.config = FakeConfig(**merged)
+    return asdict(WIKI.config)
+
+
+@app.post("/__seed")
+async def seed(spec: dict) -> dict:
+    count = WIKI.seed(
+        int(spec.get("count", 100)),
+        int(spec.get("content_bytes", 2000)),
+        str(spec.get("prefix", "bench")),
+    )
+    return {"pages": count}
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3900)
+    parser.add_argument("--pages", type=int, default=0, help="Pages to seed at startup")
+    parser.add_argument("--content-bytes", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-mode", choices=["http", "graphql"], default="http")
+    parser.add_argument(
+        "--bandwidth-mbps", type=float, default=0.0, help="Simulated link speed (0 = unlimited)"
+    )
+    args = parser.parse_args()
+
+    WIKI.config = FakeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_mode=args.error_mode,
+        bandwidth_mbps=args.bandwidth_mbps,
+    )
+    if args.pages:
+        WIKI.seed(args.pages, args.content_bytes)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
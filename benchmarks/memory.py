@@ -0,0 +1,180 @@
+"""
+Memory benchmark: bytes per page of the in-memory page structures, dicts vs compact records.
+
+For each page count it builds a Wiki.js ``pages.list`` response and measures, with
+tracemalloc, what each structure keeps alive after the parsed response is gone (retained)
+and the most memory in use while building it (peak):
+
+  listing      list of ``{"id", "path", "title"}`` dicts vs ``PageRecords``
+  path index   ``{path: id}`` dict vs ``PathIndex`` over records without titles
+  tree         ``/content/tree``: listing -> paths -> ``build_tree`` vs records -> ``build_tree``
+  preflight    ``/content/preflight`` scoring over the listing's paths vs over the records
+
+Lookup and scoring times are reported alongside, so a smaller structure that is much slower
+shows up. Results are written to benchmarks/results/memory-<timestamp>.json.
+
+Run:
+  python -m benchmarks.memory
+  python -m benchmarks.memory --pages 10000,50000,100000 --lookups 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from app.content_tree import build_tree
+from app.core.jsonio import loads
+from app.core.page_records import PageRecords, PathIndex
+from app.core.paths import preflight_analysis
+from benchmarks import _synthetic as synth
+from benchmarks._stats import environment, save_results
+
+PREFLIGHT_PATH = "/Infra/Proxmox/GPU VM"
+
+
+def listing_body(count: int) -> bytes:
+    paths = synth.deep_paths(count, depth=6, fanout=8)
+    pages = [
+        {"id": i + 1, "path": path, "title": path.rsplit("/", 1)[-1].replace("-", " ").title()}
+        for i, path in enumerate(paths)
+    ]
+    return json.dumps({"data": {"pages": {"list": pages}}}).encode()
+
+
+def _listing(body: bytes) -> list[dict]:
+    # the shape ``wikijs_api.list_pages`` returns
+    return [
+        {"id": int(item["id"]), "path": item["path"].strip("/"), "title": item.get("title") or ""}
+        for item in loads(body)["data"]["pages"]["list"]
+    ]
+
+
+def _path_dict(body: bytes) -> dict[str, int]:
+    return {
+        item["path"].strip("/"): int(item["id"]) for item in loads(body)["data"]["pages"]["list"]
+    }
+
+
+def _records(body: bytes, titles: bool = True) -> PageRecords:
+    return PageRecords.from_pages(loads(body)["data"]["pages"]["list"], titles=titles)
+
+
+def _warm(index: PathIndex) -> PathIndex:
+    # the hash column behind lookups is built on first use; count it
+    index.get("")
+    return index
+
+
+STRUCTURES: dict[str, dict[str, Callable[[bytes], Any]]] = {
+    "listing": {"dicts": _listing, "records": _records},
+    "path_index": {
+        "dicts": _path_dict,
+        "records": lambda body: _warm(PathIndex(_records(body, titles=False))),
+    },
+    "tree": {
+        "dicts": lambda body: build_tree([page["path"] for page in _listing(body)]),
+        "records": lambda body: build_tree(_records(body)),
+    },
+}
+
+
+def measure_memory(build: Callable[[bytes], Any], body: bytes) -> tuple[Any, dict[str, int]]:
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = build(body)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"retained_bytes": current - base, "peak_bytes": peak - base}
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(count: int, lookups: int) -> dict[str, Any]:
+    body = listing_body(count)
+    results: dict[str, Any] = {}
+    built: dict[tuple[str, str], Any] = {}
+    for structure, variants in STRUCTURES.items():
+        for variant, build in variants.items():
+            obj, mem = measure_memory(build, body)
+            built[structure, variant] = obj
+            results[f"{structure}[{variant}]"] = {
+                **mem,
+                "retained_per_page": round(mem["retained_bytes"] / count, 1),
+                "peak_per_page": round(mem["peak_bytes"] / count, 1),
+            }
+
+    rng = random.Random(1)
+    keys = [page["path"] for page in built["listing", "dicts"]]
+    probes = [rng.choice(keys) for _ in range(lookups)]
+    for variant in ("dicts", "records"):
+        index = built["path_index", variant]
+        elapsed = _timed(lambda: [index.get(path) for path in probes], 1)
+        results[f"path_index[{variant}]"]["lookup_ns"] = round(elapsed / lookups * 1e9, 1)
+
+    paths = [page["path"] for page in built["listing", "dicts"] if page["path"]]
+    for variant, existing in (("dicts", paths), ("records", built["listing", "records"])):
+        _, mem = measure_memory(
+            lambda _body: preflight_analysis(
+                PREFLIGHT_PATH, allowed_roots=synth.ROOTS, existing_paths=existing
+            ),
+            body,
+        )
+        elapsed = _timed(
+            lambda: preflight_analysis(
+                PREFLIGHT_PATH, allowed_roots=synth.ROOTS, existing_paths=existing
+            ),
+            1,
+        )
+        results[f"preflight[{variant}]"] = {
+            "peak_bytes": mem["peak_bytes"],
+            "peak_per_page": round(mem["peak_bytes"] / count, 1),
+            "ms": round(elapsed * 1000.0, 1),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", default="10000,50000,100000", help="Comma-separated page counts")
+    parser.add_argument(
+        "--lookups", type=int, default=20_000, help="Path index lookups timed per variant"
+    )
+    parser.add_argument("--out", type=Path, default=None, help="Results directory")
+    args = parser.parse_args()
+
+    data: dict[str, Any] = {"meta": {**environment(), "lookups": args.lookups}, "results": {}}
+    for count in (int(part) for part in args.pages.split(",") if part.strip()):
+        results = run(count, args.lookups)
+        data["results"][str(count)] = results
+        print(f"\n{count:,} pages")
+        print(f"  {'structure':<22} {'retained B/page':>16} {'peak B/page':>12}  extra")
+        for name, r in results.items():
+            extra = ""
+            if "lookup_ns" in r:
+                extra = f"lookup {r['lookup_ns']:,.0f}ns"
+            elif "ms" in r:
+                extra = f"{r['ms']:,.1f}ms"
+            retained = f"{r['retained_per_page']:,.1f}" if "retained_per_page" in r else "-"
+            print(f"  {name:<22} {retained:>16} {r['peak_per_page']:>12,.1f}  {extra}")
+    print(f"\nresults: {save_results('memory', data, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Micro-benchmarks for hot-path pure functions.
+
+Reports ops/sec (best of several timed rounds) and peak bytes allocated per call
+(tracemalloc) for each case, and compares against a stored baseline.
+
+Run:
+  python -m benchmarks.micro                     # print results
+  python -m benchmarks.micro --check             # exit 1 on regression vs baseline
+  python -m benchmarks.micro --save-baseline     # overwrite benchmarks/baselines/micro.json
+
+Baselines are machine-specific; regenerate them on the machine that runs --check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.content_tree import build_tree, render_tree_text
+from app.core import jsonio
+from app.core.paths import normalize_path as core_normalize_path
+from app.core.paths import preflight_analysis
+from app.core.services.bulk_service import _INVENTORY_PAGES, moved_stub, rewrite_links
+from app.models import InventoryPage, InventoryResponse, PagePayload
+from app.wikijs_client import derive_idempotency_key, enforce_path_policy
+from app.wikijs_client import normalize_path as client_normalize_path
+from benchmarks import _synthetic as synth
+from benchmarks._stats import environment
+
+BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+
+
+def build_cases(scale: float = 1.0) -> dict[str, Callable[[], Any]]:
+    n_paths = max(100, int(10_000 * scale))
+    paths = synth.deep_paths(n_paths, depth=8)
+    tree = build_tree(paths)
+    markdown = synth.huge_markdown(paths, size_bytes=max(10_000, int(1_000_000 * scale)))
+    mapping = synth.link_mapping(paths, max(10, int(1_000 * scale)))
+    messy = synth.messy_path()
+    clean = client_normalize_path("AI/Tools/DB/Ollama Setup/ML Notes")
+    payload = PagePayload(path=paths[0], title="Big page", content=markdown)
+    n_pages = max(50, int(5_000 * scale))
+    records = synth.inventory_pages(paths[:n_pages])
+    inventory = InventoryResponse(count=len(records), pages=[InventoryPage(**r) for r in records])
+    gql_body = json.dumps({"data": {"pages": {"list": records}}}).encode()
+    n_items = max(100, int(10_000 * scale))
+    listing = synth.inventory_pages(paths[:n_items], content_bytes=0)
+    for record in listing:
+        record.pop("content")
+    listing_model = InventoryResponse(
+        count=n_items, pages=_INVENTORY_PAGES.validate_python(listing)
+    )
+    inventory_field = create_model_field("response", InventoryResponse, mode="serialization")
+    cases = {
+        "rewrite_links[1MB,1k-map]": lambda: rewrite_links(markdown, mapping),
+        "moved_stub": lambda: moved_stub(paths[0]),
+        "core.normalize_path[messy]": lambda: core_normalize_path(messy),
+        "client.normalize_path[messy]": lambda: client_normalize_path(messy),
+        "enforce_path_policy": lambda: enforce_path_policy(clean),
+        f"build_tree[{n_paths}x8]": lambda: build_tree(paths),
+        f"render_tree_text[{n_paths}x8]": lambda: render_tree_text(tree),
+        f"preflight_analysis[{n_paths}]": lambda: preflight_analysis(
+            "/Infra/Proxmox/GPU VM", allowed_roots=synth.ROOTS, existing_paths=paths
+        ),
+        "derive_idempotency_key[1MB]": lambda: derive_idempotency_key(payload),
+        # full response path for GET /pages/inventory?include_content=true: model dump + render
+        f"inventory_response[{n_pages},stdlib]": lambda: JSONResponse(
+            inventory.model_dump(mode="json")
+        ).body,
+        f"graphql_parse[{n_pages},stdlib]": lambda: json.loads(gql_body),
+        # building the 10k-page inventory: one model per item vs one batch validator call
+        f"inventory_build[{n_items},per-item]": lambda: InventoryResponse(
+            count=n_items, pages=[InventoryPage(**r) for r in listing]
+        ),
+        f"inventory_build[{n_items},batch]": lambda: InventoryResponse(
+            count=n_items, pages=_INVENTORY_PAGES.validate_python(listing)
+        ),
+        # what FastAPI does with a returned model (dump, re-validate, serialize, render)
+        # vs model_response
+        f"inventory_endpoint[{n_items},response_model]": lambda: JSONResponse(
+            asyncio.run(serialize_response(field=inventory_field, response_content=listing_model))
+        ).body,
+        f"inventory_endpoint[{n_items},model_response]": lambda: jsonio.model_response(
+            listing_model
+        ).body,
+    }
+    if jsonio.HAS_ORJSON:
+        cases[f"inventory_response[{n_pages},orjson]"] = lambda: jsonio.FastJSONResponse(
+            inventory.model_dump(mode="json")
+        ).body
+        cases[f"graphql_parse[{n_pages},orjson]"] = lambda: jsonio.loads(gql_body)
+    return cases
+
+
+def measure(fn: Callable[[], Any], min_time_s: float, rounds: int) -> dict[str, float]:
+    fn()  # warm caches (regex compile, lazy imports)
+    # calibrate: enough iterations per round to exceed min_time_s
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time_s or iterations >= 1_000_000:
+            break
+        iterations *= 2 if elapsed <= 0 else max(2, int(min_time_s / elapsed) + 1)
+
+    best = elapsed / iterations
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops_per_sec": round(1.0 / best, 2), "peak_alloc_bytes": max(0, peak - base)}
+
+
+def check(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    failures = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if cur["ops_per_sec"] < base["ops_per_sec"] * (1.0 - threshold):
+            failures.append(f"{name}: ops/sec {base['ops_per_sec']} -> {cur['ops_per_sec']}")
+        if base["peak_alloc_bytes"] and cur["peak_alloc_bytes"] > base["peak_alloc_bytes"] * (
+            1.0 + threshold
+        ):
+            failures.append(
+                f"{name}: peak alloc {base['peak_alloc_bytes']} -> {cur['peak_alloc_bytes']} bytes"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Scale synthetic inputs (1.0 = 10k paths, 1MB page)",
+    )
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run cases containing this substring")
+    parser.add_argument("--check", action="store_true", help="Fail on regression vs baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression fraction")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    for name, fn in build_cases(args.scale).items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(fn, args.min_time, args.rounds)
+        r = results[name]
+        print(
+            f"{name:>34}: {r['ops_per_sec']:>14,.1f} ops/s "
+            f" {r['peak_alloc_bytes'] / 1024:>10,.1f} KiB/call"
+        )
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"meta": {**environment(), "scale": args.scale}, "results": results}
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"\nbaseline saved: {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        failures = check(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+        if failures:
+            print("\nREGRESSIONS:")
+            for line in failures:
+                print("  " + line)
+            return 1
+        print(f"\nno regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Cold-start benchmark: import time of ``app.main`` and time to first ready.
+
+Each run uses a fresh interpreter, so nothing is cached between runs except the OS page cache
+and bytecode. It reports:
+
+  import      wall time of ``import app.main`` (median/p95 over ``--runs``)
+  packages    ``-X importtime`` self time summed per top-level package, largest first
+  modules     the slowest individual modules by cumulative time
+  ready       from spawning uvicorn until ``/api/v1/ready`` answers 200 against the fake Wiki.js
+  first call  latency of the first ``GET /api/v1/pages/{id}`` after ready
+
+``--check`` exits non-zero when the median time to ready exceeds ``--max-ready-ms``, the
+documented target. Results are written to benchmarks/results/startup-<timestamp>.json.
+
+Run:
+  python -m benchmarks.startup --runs 10
+  python -m benchmarks.startup --check --max-ready-ms 2500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks._harness import REPO_ROOT, _spawn, _stop, fake_wikijs, free_port
+from benchmarks._stats import environment, percentile, save_results
+
+READY_TARGET_MS = 2500.0
+
+_IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+)
+
+
+def _child_env(upstream: str = "http://127.0.0.1:9") -> dict[str, str]:
+    return {**os.environ, "WIKIJS_BASE_URL": upstream, "WIKIJS_API_TOKEN": "bench-token"}
+
+
+def import_wall_times(runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SNIPPET],
+            cwd=REPO_ROOT,
+            env=_child_env(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def import_profile(top: int) -> dict[str, Any]:
+    """Parse ``-X importtime`` output into per-package self time and the slowest modules."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=REPO_ROOT,
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages: dict[str, int] = defaultdict(int)
+    modules: list[tuple[int, str]] = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (
+            part.strip() for part in line.replace("import time:", "|", 1).split("|")
+        )
+        packages[name.split(".")[0]] += int(self_us)
+        modules.append((int(cumulative_us), name))
+    return {
+        "packages_ms": {
+            name: round(us / 1000.0, 1)
+            for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "modules_cumulative_ms": {
+            name: round(us / 1000.0, 1) for us, name in sorted(modules, reverse=True)[:top]
+        },
+    }
+
+
+def time_to_ready(http: httpx.Client, upstream: str, page_id: int) -> dict[str, float]:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {"WIKIJS_BASE_URL": upstream, "WIKIJS_API_TOKEN": "bench-token", "WIKIMGR_API_KEY": ""}
+    start = time.perf_counter()
+    proc = _spawn(
+        [
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env,
+    )
+    try:
+        deadline = start + 60.0
+        while True:
+            try:
+                if http.get(f"{base}/api/v1/ready", timeout=1.0).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.perf_counter() > deadline:
+                raise RuntimeError("wikimgr did not become ready within 60s")
+            time.sleep(0.005)
+        ready = time.perf_counter() - start
+        first_start = time.perf_counter()
+        http.get(f"{base}/api/v1/pages/{page_id}", timeout=10.0).raise_for_status()
+        first = time.perf_counter() - first_start
+    finally:
+        _stop(proc)
+    return {"ready_ms": round(ready * 1000.0, 1), "first_call_ms": round(first * 1000.0, 1)}
+
+
+def _summary(values_ms: list[float]) -> dict[str, float]:
+    ordered = sorted(values_ms)
+    return {
+        "median_ms": round(statistics.median(ordered), 1),
+        "p95_ms": round(percentile(ordered, 95), 1),
+        "min_ms": round(ordered[0], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per measurement")
+    parser.add_argument(
+        "--top", type=int, default=15, help="Packages/modules listed in the profile"
+    )
+    parser.add_argument(
+        "--max-ready-ms", type=float, default=READY_TARGET_MS, help="Target for --check"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Fail when median time to ready exceeds the target"
+    )
+    parser.add_argument("--out", type=Path, default=None, help="Results directory")
+    args = parser.parse_args()
+
+    imports = _summary([t * 1000.0 for t in import_wall_times(args.runs)])
+    print(
+        f"import app.main: median={imports['median_ms']}ms p95={imports['p95_ms']}ms"
+        f" min={imports['min_ms']}ms"
+    )
+    profile = import_profile(args.top)
+    print("self time by package:")
+    for name, ms in profile["packages_ms"].items():
+        print(f"  {name:<28} {ms:>8.1f}ms")
+
+    # one polling client: building a client per poll costs more than the probe resolution
+    with fake_wikijs(pages=10) as upstream, httpx.Client() as http:
+        listing = http.post(
+            f"{upstream}/graphql", json={"query": "{ pages { list { id } } }"}
+        ).json()
+        page_id = listing["data"]["pages"]["list"][0]["id"]
+        starts = [time_to_ready(http, upstream, page_id) for _ in range(args.runs)]
+    ready = _summary([s["ready_ms"] for s in starts])
+    first_call = _summary([s["first_call_ms"] for s in starts])
+    print(
+        f"time to ready:   median={ready['median_ms']}ms p95={ready['p95_ms']}ms"
+        f" (target {args.max_ready_ms:.0f}ms)"
+    )
+    print(f"first GET:       median={first_call['median_ms']}ms p95={first_call['p95_ms']}ms")
+
+    data = {
+        "meta": {**environment(), "runs": args.runs, "target_ready_ms": args.max_ready_ms},
+        "results": {"import": imports, "ready": ready, "first_call": first_call, **profile},
+    }
+    print(f"\nresults: {save_results('startup', data, args.out)}")
+    if args.check and ready["median_ms"] > args.max_ready_ms:
+        print(f"FAIL: median time to ready {ready['median_ms']}ms > {args.max_ready_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
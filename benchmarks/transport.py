@@ -0,0 +1,130 @@
+"""
+Upstream transport benchmark: bytes on the wire and latency for large pages.
+
+Starts the fake Wiki.js once and wikimgr once per transport variant, upserts
+``--requests`` pages of ``--content-bytes`` markdown, then reads them back by id,
+and reports p50/p95 latency plus request/response bytes seen by the fake per
+operation. ``--bandwidth-mbps`` makes the fake simulate a slow link so the
+effect on a remote Wiki.js shows up on loopback. Results are written to
+benchmarks/results/transport-<timestamp>.json.
+
+Variants:
+  identity       no compression either way (WIKIMGR_UPSTREAM_ACCEPT_ENCODING=identity)
+  gzip           compressed responses (default Accept-Encoding)
+  gzip+requests  compressed responses and request bodies (WIKIMGR_UPSTREAM_GZIP_REQUESTS=1)
+
+Run:
+  python -m benchmarks.transport --requests 100 --content-bytes 200000 --bandwidth-mbps 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks import _synthetic as synth
+from benchmarks._harness import fake_wikijs, wikimgr
+from benchmarks._stats import environment, save_results
+from benchmarks.e2e import _drive
+
+VARIANTS: dict[str, dict[str, str]] = {
+    "identity": {"WIKIMGR_UPSTREAM_ACCEPT_ENCODING": "identity"},
+    "gzip": {},
+    "gzip+requests": {"WIKIMGR_UPSTREAM_GZIP_REQUESTS": "1"},
+}
+
+
+async def _variant(
+    name: str, env: dict[str, str], upstream: str, args: argparse.Namespace
+) -> dict[str, Any]:
+    paths = [f"bench/transport/{name}/page-{i:05d}" for i in range(args.requests)]
+    content = synth.huge_markdown(
+        synth.deep_paths(200), size_bytes=args.content_bytes, seed=args.seed
+    )
+    ids: list[int] = [0] * len(paths)
+    results: dict[str, Any] = {}
+
+    async def upsert(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        r = await c.post(
+            "/api/v1/pages/upsert",
+            json={"path": paths[i], "title": f"Page {i}", "content": content},
+        )
+        if r.status_code == 200:
+            ids[i] = r.json()["id"]
+        return r
+
+    async def get(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.get(f"/api/v1/pages/{ids[i]}")
+
+    with wikimgr(upstream, env={**env, "WIKIMGR_COMPRESS": "0"}) as api:
+        async with httpx.AsyncClient(base_url=api, timeout=args.timeout) as client:
+            async with httpx.AsyncClient(base_url=upstream) as fake:
+                for op, call in (("upsert", upsert), ("get", get)):
+                    await fake.post("/__reset")
+                    summary = await _drive(client, call, len(paths), args.concurrency)
+                    stats = (await fake.get("/__stats")).json()
+                    summary["upstream_bytes_in"] = stats["bytes_in"]
+                    summary["upstream_bytes_out"] = stats["bytes_out"]
+                    results[op] = summary
+                    print(
+                        f"{name:>14} {op:>6}: p50={summary['p50_ms']:.1f}ms"
+                        f" p95={summary['p95_ms']:.1f}ms "
+                        f"err={summary['errors']} to-wiki={stats['bytes_in'] / 1024:,.0f}KiB "
+                        f"from-wiki={stats['bytes_out'] / 1024:,.0f}KiB"
+                    )
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    extra = ["--bandwidth-mbps", str(args.bandwidth_mbps)]
+    results: dict[str, Any] = {}
+    with fake_wikijs(latency_ms=args.latency_ms, extra_args=extra) as upstream:
+        for name in variants:
+            results[name] = await _variant(name, VARIANTS[name], upstream, args)
+    return {
+        "meta": {
+            **environment(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "content_bytes": args.content_bytes,
+            "latency_ms": args.latency_ms,
+            "bandwidth_mbps": args.bandwidth_mbps,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--requests", type=int, default=100, help="Pages upserted and read per variant"
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--content-bytes", type=int, default=200_000)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Injected upstream latency")
+    parser.add_argument(
+        "--bandwidth-mbps", type=float, default=20.0, help="Simulated link speed (0 = unlimited)"
+    )
+    parser.add_argument(
+        "--variants",
+        default=",".join(VARIANTS),
+        help=f"Comma-separated subset of {','.join(VARIANTS)}",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, default=None, help="Results directory")
+    args = parser.parse_args()
+
+    data = asyncio.run(run(args))
+    print(f"\nresults: {save_results('transport', data, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
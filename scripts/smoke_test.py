@@ -8,13 +8,24 @@ Usage:
 
 Run:
   python3 scripts/smoke_test.py
+
+Load mode reuses the same flows with N concurrent virtual clients:
+  python3 scripts/smoke_test.py --load --clients 20 --duration 30 --mix read=70,write=25,bulk=5
+  python3 scripts/smoke_test.py --load --rate 50 --requests 2000          # open-loop arrivals/sec
+  python3 scripts/smoke_test.py --load --local-stack --pages 5000         # against the fake Wiki.js
 """
 
+import argparse
+import asyncio
 import json
+import math
 import os
+import random
 import sys
 import time
 import uuid
+from collections import Counter
+from contextlib import ExitStack
 
 import httpx
 
@@ -41,11 +52,80 @@ def ok(msg):
     print("OK:", msg)
 
 
-def main():
+# --- Flows ---------------------------------------------------------------------
+# Each flow returns request kwargs (method/url/params/json/headers) so the sequential
+# smoke pass and the concurrent load mode send exactly the same calls.
+
+
+def readyz_request(api_url):
+    return {"method": "GET", "url": f"{api_url}/readyz"}
+
+
+def page_payload(path, title="Smoke Test Page", content_text=None, tags=None):
+    return {
+        "path": path,
+        "title": title,
+        "content": content_text or "# Smoke Test\n\nThis page was created by smoke_test.py",
+        "description": "smoke test",
+        "is_private": False,
+        "tags": tags or ["smoke"],
+    }
+
+
+def upsert_request(api_url, payload, idem=None):
+    return {
+        "method": "POST",
+        "url": f"{api_url}/pages/upsert",
+        "headers": headers_with_auth(idempotency_key=idem),
+        "json": payload,
+    }
+
+
+def get_request(api_url, path):
+    return {
+        "method": "GET",
+        "url": f"{api_url}/wikimgr/get",
+        "params": {"path": path},
+        "headers": headers_with_auth(),
+    }
+
+
+def inventory_request(api_url, include_content=True):
+    return {
+        "method": "GET",
+        "url": f"{api_url}/wikimgr/pages/inventory.json",
+        "params": {"include_content": "true" if include_content else "false"},
+        "headers": headers_with_auth(),
+    }
+
+
+def bulk_move_request(api_url, paths):
+    moves = [{"from_path": p, "to_path": f"{p}-moved", "merge": True} for p in paths]
+    return {
+        "method": "POST",
+        "url": f"{api_url}/wikimgr/pages/bulk-move",
+        "headers": headers_with_auth(),
+        "json": {"moves": moves, "dry_run": True},
+    }
+
+
+def delete_request(api_url, path, idem=None):
+    return {
+        "method": "POST",
+        "url": f"{api_url}/wikimgr/delete",
+        "headers": headers_with_auth(idempotency_key=idem),
+        "json": {"path": path, "soft": False},
+    }
+
+
+# --- Sequential smoke pass -----------------------------------------------------
+
+
+def smoke(api_url):
     client = httpx.Client(timeout=TIMEOUT)
     # 1) readiness
     try:
-        r = client.get(f"{API_URL}/readyz")
+        r = client.request(**readyz_request(api_url))
     except Exception as e:
         fail(f"readyz request failed: {e}")
     if r.status_code != 200:
@@ -61,23 +141,12 @@ def main():
     # create a unique path so repeated runs don't collide
     timestamp = int(time.time())
     path = f"smoke/test-{timestamp}-{uuid.uuid4().hex[:6]}"
-    title = "Smoke Test Page"
-    content_text = "# Smoke Test\n\nThis page was created by smoke_test.py"
-    description = "smoke test"
-
-    payload = {
-        "path": path,
-        "title": title,
-        "content": content_text,
-        "description": description,
-        "is_private": False,
-        "tags": ["smoke"],
-    }
+    payload = page_payload(path)
+    content_text = payload["content"]
     idem = os.getenv("SMOKE_IDEMP_KEY") or f"smoke-{timestamp}-{uuid.uuid4().hex[:6]}"
-    headers = headers_with_auth(idempotency_key=idem)
 
     # 2) upsert
-    r = client.post(f"{API_URL}/pages/upsert", headers=headers, json=payload)
+    r = client.request(**upsert_request(api_url, payload, idem))
     if r.status_code != 200:
         fail(f"upsert failed: {r.status_code} {r.text}")
     try:
@@ -90,7 +159,7 @@ def main():
     ok(f"upsert OK (id={page_id}, path={returned_path})")
 
     # 3) get back the page via wikimgr internal GET
-    r = client.get(f"{API_URL}/wikimgr/get", params={"path": path}, timeout=TIMEOUT)
+    r = client.request(**get_request(api_url, path), timeout=TIMEOUT)
     if r.status_code != 200:
         fail(f"wikimgr get failed: {r.status_code} {r.text}")
     try:
@@ -103,9 +172,7 @@ def main():
     ok("wikimgr/get content OK")
 
     # 4) inventory contains the page (request with include_content=true to be sure)
-    r = client.get(
-        f"{API_URL}/wikimgr/pages/inventory.json", params={"include_content": "true"}
-    )
+    r = client.request(**inventory_request(api_url))
     if r.status_code != 200:
         fail(f"inventory fetch failed: {r.status_code} {r.text}")
     inv = r.json()
@@ -115,8 +182,7 @@ def main():
     ok("inventory includes page")
 
     # 5) delete cleanup (best-effort)
-    del_payload = {"path": path, "soft": False}
-    r = client.post(f"{API_URL}/wikimgr/delete", headers=headers, json=del_payload)
+    r = client.request(**delete_request(api_url, path, idem))
     if r.status_code not in (200, 404):
         print("WARN: delete returned unexpected status:", r.status_code, r.text)
     else:
@@ -126,5 +192,253 @@ def main():
     client.close()
 
 
+# --- Load mode -----------------------------------------------------------------
+
+
+def parse_mix(raw):
+    mix = {"read": 70, "write": 25, "bulk": 5}
+    if raw:
+        mix = {k: 0 for k in mix}
+        for part in raw.split(","):
+            name, _, weight = part.partition("=")
+            if name.strip() not in mix:
+                raise SystemExit(f"unknown mix entry {name!r}; use read/write/bulk")
+            mix[name.strip()] = float(weight or 0)
+    if sum(mix.values()) <= 0:
+        raise SystemExit("mix weights must add up to more than 0")
+    return mix
+
+
+def _pct(values, pct):
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = Counter()
+        self.statuses = Counter()
+
+    def record(self, flow, seconds, status):
+        self.latencies.setdefault(flow, []).append(seconds)
+        self.statuses[f"{flow}:{status}"] += 1
+        if status == "exc" or int(status) >= 400:
+            self.errors[flow] += 1
+
+    def summary(self, elapsed):
+        out = {}
+        for flow, values in sorted(self.latencies.items()):
+            ms = sorted(v * 1000.0 for v in values)
+            out[flow] = {
+                "count": len(ms),
+                "errors": self.errors[flow],
+                "p50_ms": round(_pct(ms, 50), 1),
+                "p95_ms": round(_pct(ms, 95), 1),
+                "p99_ms": round(_pct(ms, 99), 1),
+                "max_ms": round(ms[-1], 1),
+                "throughput_rps": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+            }
+        return out
+
+
+class LoadRun:
+    def __init__(self, api_url, args):
+        self.api_url = api_url
+        self.args = args
+        self.mix = parse_mix(args.mix)
+        self.rng = random.Random(args.seed)
+        self.run_id = f"{int(time.time())}-{uuid.uuid4().hex[:6]}"
+        self.pool = []
+        self.stats = LoadStats()
+        self.sent = 0
+        self.created = 0
+
+    def _pick_flow(self):
+        names = list(self.mix)
+        return self.rng.choices(names, weights=[self.mix[n] for n in names])[0]
+
+    def _next_request(self):
+        flow = self._pick_flow()
+        if flow != "write" and not self.pool:
+            # reads and bulk moves need pages this run has written
+            flow = "write"
+        if flow == "write":
+            if self.pool and self.rng.random() < 0.5:
+                path = self.rng.choice(self.pool)
+            else:
+                self.created += 1
+                path = f"smoke/load-{self.run_id}/page-{self.created:06d}"
+            content = f"# Load {path}\n\n" + "load test body " * self.args.content_words
+            return flow, upsert_request(self.api_url, page_payload(path, content_text=content))
+        if flow == "read":
+            return flow, get_request(self.api_url, self.rng.choice(self.pool))
+        return flow, bulk_move_request(
+            self.api_url, self.rng.sample(self.pool, min(5, len(self.pool)))
+        )
+
+    def _done(self, started):
+        if self.args.requests and self.sent >= self.args.requests:
+            return True
+        return time.perf_counter() - started >= self.args.duration
+
+    async def _send(self, client, flow, request, scheduled):
+        try:
+            r = await client.request(**request)
+            status = r.status_code
+        except httpx.HTTPError:
+            status = "exc"
+        if flow == "write" and status == 200 and request["json"]["path"] not in self.pool:
+            # only pages that exist upstream become read/bulk targets
+            self.pool.append(request["json"]["path"])
+        # latency is measured from the scheduled start so queueing delay counts (open loop)
+        self.stats.record(flow, time.perf_counter() - scheduled, status)
+
+    async def _closed_loop_client(self, client, started):
+        while not self._done(started):
+            self.sent += 1
+            flow, request = self._next_request()
+            await self._send(client, flow, request, time.perf_counter())
+
+    async def _open_loop(self, client, started):
+        tasks = set()
+        next_at = time.perf_counter()
+        while not self._done(started):
+            now = time.perf_counter()
+            if now < next_at:
+                await asyncio.sleep(next_at - now)
+            self.sent += 1
+            flow, request = self._next_request()
+            task = asyncio.create_task(self._send(client, flow, request, next_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            next_at += self.rng.expovariate(self.args.rate)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run(self):
+        limits = httpx.Limits(
+            max_connections=self.args.clients, max_keepalive_connections=self.args.clients
+        )
+        async with httpx.AsyncClient(timeout=self.args.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            if self.args.rate:
+                await self._open_loop(client, started)
+            else:
+                await asyncio.gather(
+                    *(self._closed_loop_client(client, started) for _ in range(self.args.clients))
+                )
+            elapsed = time.perf_counter() - started
+
+            if not self.args.keep:
+                for path in self.pool:
+                    try:
+                        await client.request(**delete_request(self.api_url, path))
+                    except httpx.HTTPError:
+                        pass
+        return elapsed
+
+
+def print_summary(summary, elapsed, args):
+    mode = f"open-loop {args.rate}/s" if args.rate else f"closed-loop {args.clients} clients"
+    total = sum(s["count"] for s in summary.values())
+    errors = sum(s["errors"] for s in summary.values())
+    print(f"\nLOAD SUMMARY ({mode}, {elapsed:.1f}s, {total} requests, {errors} errors)")
+    print(
+        f"{'flow':>6} {'count':>7} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+        f" {'req/s':>8}"
+    )
+    for flow, s in summary.items():
+        print(
+            f"{flow:>6} {s['count']:>7} {s['errors']:>5}"
+            f" {s['p50_ms']:>7.1f}ms {s['p95_ms']:>7.1f}ms "
+            f"{s['p99_ms']:>7.1f}ms {s['max_ms']:>7.1f}ms {s['throughput_rps']:>8.1f}"
+        )
+    rate = total / elapsed if elapsed else 0
+    print(f"{'all':>6} {total:>7} {errors:>5} {'':>9} {'':>9} {'':>9} {'':>9} {rate:>8.1f}")
+
+
+def load(api_url, args):
+    runner = LoadRun(api_url, args)
+    elapsed = asyncio.run(runner.run())
+    summary = runner.stats.summary(elapsed)
+    print_summary(summary, elapsed, args)
+    if args.json_out:
+        with open(args.json_out, "w") as fh:
+            json.dump(
+                {
+                    "elapsed_s": elapsed,
+                    "args": vars(args),
+                    "flows": summary,
+                    "statuses": dict(runner.stats.statuses),
+                },
+                fh,
+                indent=2,
+                default=str,
+            )
+    if args.max_error_rate is not None:
+        total = sum(s["count"] for s in summary.values()) or 1
+        if sum(s["errors"] for s in summary.values()) / total > args.max_error_rate:
+            fail(f"error rate above {args.max_error_rate:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--api-url", default=API_URL)
+    parser.add_argument("--load", action="store_true", help="Run the concurrent load mode")
+    parser.add_argument(
+        "--clients",
+        type=int,
+        default=10,
+        help="Concurrent virtual clients (connection cap in open loop)",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument(
+        "--requests", type=int, default=0, help="Stop after this many requests (0 = duration only)"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="Open-loop arrivals per second (0 = closed loop)"
+    )
+    parser.add_argument("--mix", default="", help="Weights, e.g. read=70,write=25,bulk=5")
+    parser.add_argument("--content-words", type=int, default=200, help="Body size of written pages")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--keep", action="store_true", help="Do not delete pages created by the load run"
+    )
+    parser.add_argument("--json-out", default="", help="Write the summary to this JSON file")
+    parser.add_argument("--max-error-rate", type=float, default=None, help="Exit 2 if exceeded")
+    parser.add_argument(
+        "--local-stack",
+        action="store_true",
+        help="Start the fake Wiki.js and a local wikimgr instead of using --api-url",
+    )
+    parser.add_argument(
+        "--pages", type=int, default=1000, help="Pages seeded into the fake Wiki.js"
+    )
+    parser.add_argument("--upstream-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        api_url = args.api_url.rstrip("/")
+        if args.local_stack:
+            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            from benchmarks._harness import fake_wikijs, wikimgr
+
+            upstream = stack.enter_context(
+                fake_wikijs(pages=args.pages, latency_ms=args.upstream_latency_ms)
+            )
+            api_url = stack.enter_context(wikimgr(upstream))
+            print(f"local stack: wikimgr {api_url} -> fake Wiki.js {upstream}")
+        if args.load:
+            load(api_url, args)
+        else:
+            smoke(api_url)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import admission
+from app.core.admission import KeyQuotas, RouteGate, classify_request
+from app.core.errors import TooManyRequests
+from app.main import app
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_controller():
+    admission.reset_admission()
+    yield
+    admission.reset_admission()
+
+
+def test_classify_request():
+    assert classify_request("GET", "/api/v1/ready") is None
+    assert classify_request("GET", "/metrics") is None
+    assert classify_request("POST", "/api/v1/admin/profile") is None
+    assert classify_request("POST", "/api/v1/pages/bulk-relink") == "bulk"
+    assert classify_request("GET", "/api/v1/pages/inventory") == "bulk"
+    assert classify_request("GET", "/content/tree") == "bulk"
+    assert classify_request("POST", "/content/preflight") == "bulk"
+    assert classify_request("POST", "/api/v1/pages/upsert") == "write"
+    assert classify_request("GET", "/api/v1/pages/3") == "read"
+
+
+def test_gate_queues_within_deadline_and_sheds_beyond_it():
+    async def main():
+        gate = RouteGate("read", limit=1, max_wait_s=0.5, queue_size=8)
+        gate.service_s = 0.05
+        await gate.acquire()
+
+        queued = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        assert not queued.done()
+        gate.release(0.05)
+        await queued
+        assert gate.inflight == 1
+
+        gate.service_s = 10.0  # expected wait now far beyond the deadline
+        with pytest.raises(TooManyRequests) as shed:
+            await gate.acquire()
+        assert shed.value.status_code == 429
+        assert shed.value.retry_after_s >= 10
+
+    asyncio.run(main())
+
+
+def test_gate_gives_up_after_max_wait():
+    async def main():
+        gate = RouteGate("bulk", limit=1, max_wait_s=0.05, queue_size=8)
+        await gate.acquire()
+        with pytest.raises(TooManyRequests) as shed:
+            await gate.acquire()
+        assert "deadline" in shed.value.message
+        gate.release(0.01)
+        assert gate.inflight == 0
+
+    asyncio.run(main())
+
+
+def test_token_bucket_allows_burst_then_asks_to_wait():
+    quotas = KeyQuotas(rate=2.0, burst=2.0)
+    assert quotas.try_take("a") == 0.0
+    assert quotas.try_take("a") == 0.0
+    wait = quotas.try_take("a")
+    assert 0 < wait <= 0.5
+    assert quotas.try_take("b") == 0.0
+
+
+def test_quota_returns_429_per_key_but_never_throttles_probes(monkeypatch):
+    monkeypatch.setenv("WIKIMGR_QUOTA_RPS", "0.01")
+    monkeypatch.setenv("WIKIMGR_QUOTA_BURST", "1")
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+
+    first = client.get("/api/v1/search", params={"q": "x"}, headers={"X-API-Key": "importer"})
+    assert first.status_code != 429
+    second = client.get("/api/v1/search", params={"q": "x"}, headers={"X-API-Key": "importer"})
+    assert second.status_code == 429
+    assert second.json()["code"] == "quota_exceeded"
+    assert int(second.headers["Retry-After"]) >= 1
+
+    other = client.get("/api/v1/search", params={"q": "x"}, headers={"X-API-Key": "editor"})
+    assert other.status_code != 429
+    for _ in range(3):
+        assert client.get("/api/v1/health", headers={"X-API-Key": "importer"}).status_code == 200
@@ -95,3 +95,43 @@ def test_inventory_route_not_captured_by_id_route(monkeypatch):
 def test_non_int_page_id_returns_404_not_validation_error():
     r = client.get("/api/v1/pages/inventory-not-an-id")
     assert r.status_code == 404
+
+
+def test_bulk_relink_rewrites_links_in_scoped_pages(monkeypatch):
+    from app.core.services import bulk_service
+    from app.models import GetPageResponse, InventoryPage, UpsertPageResponse
+
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    monkeypatch.setattr(
+        bulk_service,
+        "inventory",
+        lambda include_content=False: InventoryResponse(
+            count=2,
+            pages=[
+                InventoryPage(id=1, path="homelab/index", title="Index"),
+                InventoryPage(id=2, path="homelab/other", title="Other"),
+            ],
+        ),
+    )
+    monkeypatch.setattr(
+        bulk_service,
+        "get_page",
+        lambda path=None, id=None: GetPageResponse(
+            id=1, path=path, title="Index", content="See [old](/old/path)."
+        ),
+    )
+    written = {}
+
+    async def fake_upsert(payload, x_idempotency_key, legacy_x_idempotency_key):
+        written[payload.path] = payload.content
+        return UpsertPageResponse(id=1, path=payload.path, idempotency_key="k")
+
+    monkeypatch.setattr(bulk_service, "upsert_page", fake_upsert)
+
+    r = client.post(
+        "/api/v1/pages/bulk-relink",
+        json={"mapping": {"/old/path/": "new/path"}, "scope": ["homelab/index"]},
+    )
+    assert r.status_code == 200
+    assert r.json() == {"updated": ["homelab/index"], "errors": []}
+    assert written == {"homelab/index": "See [old](/new/path)."}
@@ -0,0 +1,93 @@
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import wikijs_api
+from app.core.circuit import CircuitBreaker
+from app.core.errors import UpstreamUnavailable
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _fail(exc):
+    raise exc
+
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_s=0.05)
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            with breaker.guard():
+                _fail(httpx.ConnectError("refused"))
+    assert breaker.state == "open"
+
+    with pytest.raises(UpstreamUnavailable) as rejected:
+        with breaker.guard():
+            pass
+    assert rejected.value.code == "circuit_open"
+    assert 0 < rejected.value.retry_after_s <= 0.05
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    probe = breaker.before_call()
+    assert probe is True
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_success(probe)
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens_and_app_errors_do_not_count():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_s=0.01)
+    with pytest.raises(ValueError):
+        with breaker.guard():
+            _fail(ValueError("GraphQL said no"))
+    assert breaker.state == "closed"
+
+    with pytest.raises(httpx.ReadTimeout):
+        with breaker.guard():
+            _fail(httpx.ReadTimeout("slow"))
+    time.sleep(0.02)
+    with pytest.raises(httpx.ReadTimeout):
+        with breaker.guard():
+            _fail(httpx.ReadTimeout("still slow"))
+    assert breaker.state == "open"
+
+
+class _DownClient:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def post(self, url, **kwargs):
+        raise httpx.ConnectError("connection refused")
+
+
+def test_open_circuit_fails_fast_with_503_and_shows_in_ready(monkeypatch):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://breaker-test.invalid")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "t")
+    monkeypatch.setenv("WIKIMGR_BREAKER_FAILURES", "2")
+    monkeypatch.setattr(wikijs_api, "sync_client", _DownClient)
+
+    assert client.get("/api/v1/ready").json() == {"ready": True, "circuit": "closed"}
+    first = client.get("/api/v1/pages/5")
+    assert first.status_code == 502  # the failures that trip the breaker still surface
+
+    r = client.get("/api/v1/pages/5")
+    assert r.status_code == 503
+    assert r.json()["code"] == "circuit_open"
+    assert int(r.headers["Retry-After"]) >= 1
+
+    ready = client.get("/api/v1/ready")
+    assert ready.status_code == 503
+    assert ready.json()["circuit"] == "open"
+    assert "Retry-After" in ready.headers
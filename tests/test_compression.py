@@ -0,0 +1,96 @@
+import asyncio
+import gzip
+import zlib
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding, parse_level_rules
+
+
+def _app(**kwargs) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return {
+            "pages": [{"path": f"homelab/page-{i}", "content": "proxmox " * 20} for i in range(200)]
+        }
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/tree")
+    def tree():
+        return PlainTextResponse("homelab/\n  proxmox/\n" * 500)
+
+    @app.get("/stream")
+    def stream():
+        async def lines():
+            for i in range(3):
+                yield f'{{"n": {i}, "pad": "{"x" * 600}"}}\n'
+                await asyncio.sleep(0)
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware, **kwargs)
+    return TestClient(app)
+
+
+def test_negotiation_honours_q_values_and_server_preference():
+    available = ("zstd", "br", "gzip")
+    assert negotiate_encoding("gzip, deflate", available) == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, br", available) == "br"
+    assert negotiate_encoding("gzip, br, zstd", available) == "zstd"
+    assert negotiate_encoding("*;q=0.1, zstd;q=0", available) == "br"
+    assert negotiate_encoding("identity", available) is None
+    assert negotiate_encoding("", available) is None
+
+
+def test_large_json_is_gzipped_and_small_bodies_are_not():
+    client = _app(min_bytes=1024, default_level=5, level_rules=[])
+    r = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert int(r.headers["content-length"]) < len(r.content) / 5
+    assert r.json()["pages"][0]["path"] == "homelab/page-0"
+
+    r = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+    r = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+
+
+def test_vary_is_set_on_uncompressed_compressible_responses():
+    client = _app(min_bytes=1024, default_level=5, level_rules=parse_level_rules("/tree=0"))
+    # below min_bytes, a client that did not ask, and a route with compression off
+    for path, accept in (("/small", "gzip"), ("/big", "identity"), ("/tree", "gzip")):
+        r = client.get(path, headers={"Accept-Encoding": accept})
+        assert "content-encoding" not in r.headers
+        assert r.headers["vary"] == "Accept-Encoding"
+
+
+def test_route_level_zero_disables_compression():
+    client = _app(min_bytes=0, default_level=5, level_rules=parse_level_rules("/tree=0,/big=9"))
+    assert (
+        "content-encoding" not in client.get("/tree", headers={"Accept-Encoding": "gzip"}).headers
+    )
+    assert (
+        client.get("/big", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"]
+        == "gzip"
+    )
+
+
+def test_streaming_body_is_flushed_chunk_by_chunk():
+    client = _app(min_bytes=1024, default_level=5, level_rules=[])
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as r:
+        assert r.headers["content-encoding"] == "gzip"
+        assert "content-length" not in r.headers
+        chunks = list(r.iter_raw())
+    # every chunk is decodable on its own (sync flush), so lines arrive as produced
+    decoder = zlib.decompressobj(31)
+    first = decoder.decompress(chunks[0])
+    assert first.startswith(b'{"n": 0')
+    assert gzip.decompress(b"".join(chunks)).count(b"\n") == 3
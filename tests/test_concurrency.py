@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import wikijs_api
+from app.core.concurrency import AdaptiveLimiter, current_priority, upstream_priority
+from app.core.errors import UpstreamUnavailable
+from app.core.page_records import PathIndex
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_sync_callers_never_exceed_the_window():
+    limiter = AdaptiveLimiter(initial=2, max_limit=2)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def call():
+        with limiter.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+    assert limiter.inflight == 0
+
+
+def test_async_and_sync_callers_share_the_window():
+    limiter = AdaptiveLimiter(initial=2, max_limit=2)
+    active, peak = [0], [0]
+
+    async def call():
+        async with limiter.slot_async():
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+
+    async def main():
+        holder = threading.Thread(target=limiter.acquire)
+        holder.start()
+        holder.join()  # a thread now holds one slot and never releases it
+        await asyncio.gather(*(call() for _ in range(5)))
+
+    asyncio.run(main())
+    assert peak[0] == 1
+    assert limiter.inflight == 1
+
+
+def test_bounded_queue_rejects_when_full_or_after_timeout():
+    limiter = AdaptiveLimiter(initial=1, max_limit=1, queue_size=1, queue_timeout_s=0.1)
+    limiter.acquire()
+    errors = []
+
+    def waiter():
+        try:
+            limiter.acquire()
+        except UpstreamUnavailable as e:
+            errors.append(e)
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    time.sleep(0.02)
+    with pytest.raises(UpstreamUnavailable) as full:
+        limiter.acquire()
+    t.join()
+    assert full.value.status_code == 503
+    assert full.value.retry_after_s >= 1
+    assert len(errors) == 1 and "timeout" in errors[0].message
+    assert limiter.queue_depth == 0
+
+
+def test_window_grows_when_used_and_shrinks_on_overload():
+    limiter = AdaptiveLimiter(initial=4, max_limit=16)
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(40):
+        limiter.release(0.01, overloaded=False)
+        limiter.acquire()
+    grown = limiter.limit
+    assert grown > 4
+
+    request = httpx.Request("POST", "http://wiki/graphql")
+    with pytest.raises(httpx.HTTPStatusError):
+        with limiter.slot():
+            raise httpx.HTTPStatusError(
+                "502", request=request, response=httpx.Response(502, request=request)
+            )
+    assert limiter.limit == pytest.approx(grown * 0.9)
+
+
+def test_rejected_upstream_call_returns_503_with_retry_after(monkeypatch):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://wikijs.local")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "test-token")
+    limiter = AdaptiveLimiter(initial=1, max_limit=1, queue_size=0)
+    limiter.acquire()
+    monkeypatch.setattr(wikijs_api, "UPSTREAM_LIMITER", limiter)
+    monkeypatch.setattr(wikijs_api, "_PATH_ID_CACHE", PathIndex())
+
+    r = client.get("/api/v1/pages/5")
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert r.json()["code"] == "upstream_unavailable"
+
+
+def _queue_in_threads(limiter, priorities, order):
+    def call(priority):
+        with upstream_priority(priority):
+            limiter.acquire()
+        order.append(priority)
+        limiter.release(0.01, overloaded=False)
+
+    threads = []
+    for priority in priorities:
+        t = threading.Thread(target=call, args=(priority,))
+        t.start()
+        threads.append(t)
+        deadline = time.monotonic() + 1
+        while limiter.queue_depth < len(threads) and time.monotonic() < deadline:
+            time.sleep(0.001)
+    return threads
+
+
+def test_interactive_calls_jump_ahead_of_queued_bulk_work():
+    limiter = AdaptiveLimiter(initial=1, max_limit=1, bulk_share=0.0)
+    limiter.acquire()
+    order = []
+    threads = _queue_in_threads(limiter, ["bulk", "bulk", "interactive", "interactive"], order)
+    limiter.release(0.01, overloaded=False)
+    for t in threads:
+        t.join()
+    assert order == ["interactive", "interactive", "bulk", "bulk"]
+
+
+def test_bulk_share_prevents_starvation():
+    limiter = AdaptiveLimiter(initial=1, max_limit=1, bulk_share=0.5)
+    limiter.acquire()
+    order = []
+    threads = _queue_in_threads(limiter, ["bulk"] * 3 + ["interactive"] * 4, order)
+    limiter.release(0.01, overloaded=False)
+    for t in threads:
+        t.join()
+    assert order[:4] == ["interactive", "bulk", "interactive", "bulk"]
+
+
+def test_bulk_operations_run_at_bulk_priority():
+    from app.core.services import bulk_service
+
+    seen = []
+
+    @bulk_service.tracks_bulk("test")
+    def sweep():
+        seen.append(current_priority())
+
+    sweep()
+    assert seen == ["bulk"]
+    assert current_priority() == "interactive"
@@ -0,0 +1,27 @@
+from app.core.config import env_flag, env_float, env_int
+
+
+def test_numbers_clamp_to_the_minimum_and_fall_back_on_garbage(monkeypatch):
+    monkeypatch.setenv("WIKIMGR_TEST_NUMBER", "-5")
+    assert env_float("WIKIMGR_TEST_NUMBER", 2.5, 0.0) == 0.0
+    assert env_int("WIKIMGR_TEST_NUMBER", 3, 1) == 1
+    assert env_int("WIKIMGR_TEST_NUMBER", 3) == -5
+
+    monkeypatch.setenv("WIKIMGR_TEST_NUMBER", "lots")
+    assert env_float("WIKIMGR_TEST_NUMBER", 2.5, 0.0) == 2.5
+    assert env_int("WIKIMGR_TEST_NUMBER", 3, 1) == 3
+
+    monkeypatch.delenv("WIKIMGR_TEST_NUMBER")
+    assert env_int("WIKIMGR_TEST_NUMBER", 3, 1) == 3
+
+
+def test_flags_accept_both_spellings_and_keep_the_default_otherwise(monkeypatch):
+    for raw, expected in (("1", True), (" Yes ", True), ("ON", True), ("0", False), ("off", False)):
+        monkeypatch.setenv("WIKIMGR_TEST_FLAG", raw)
+        assert env_flag("WIKIMGR_TEST_FLAG", default=not expected) is expected
+
+    monkeypatch.setenv("WIKIMGR_TEST_FLAG", "maybe")
+    assert env_flag("WIKIMGR_TEST_FLAG") is False
+    assert env_flag("WIKIMGR_TEST_FLAG", default=True) is True
+    monkeypatch.delenv("WIKIMGR_TEST_FLAG")
+    assert env_flag("WIKIMGR_TEST_FLAG", default=True) is True
@@ -1,6 +1,7 @@
 from fastapi.testclient import TestClient
 
 from app.content_tree import build_tree, render_tree_text
+from app.core.page_records import PageRecords
 from app.main import app
 
 
@@ -48,7 +49,9 @@ def test_content_tree_endpoint(monkeypatch):
 
     from app.routers import content as content_router
 
-    monkeypatch.setattr(content_router, "list_pages", lambda limit=1000: fake_pages)
+    monkeypatch.setattr(
+        content_router, "list_page_records", lambda limit=1000: PageRecords.from_pages(fake_pages)
+    )
 
     r = client.get("/content/tree")
 
@@ -69,7 +72,9 @@ def test_content_preflight_endpoint(monkeypatch):
     ]
     from app.routers import content as content_router
 
-    monkeypatch.setattr(content_router, "list_pages", lambda limit=1000: fake_pages)
+    monkeypatch.setattr(
+        content_router, "list_page_records", lambda limit=1000: PageRecords.from_pages(fake_pages)
+    )
     monkeypatch.setenv("WIKIMGR_ALLOWED_ROOTS", "homelab,ai,projects")
 
     r = client.post("/content/preflight", json={"path": "/infra/proxmox/cluster"})
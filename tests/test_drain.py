@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.drain import ShutdownDrain, reset_shutdown_drain, shutdown_drain
+from app.core.services import bulk_service
+from app.main import app
+from app.models import GetPageResponse, UpsertPageResponse
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _drain(monkeypatch, tmp_path):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://wikijs.local")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "test-token")
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    monkeypatch.setenv("WIKIMGR_STATE_DIR", str(tmp_path))
+    reset_shutdown_drain()
+    yield
+    reset_shutdown_drain()
+
+
+def test_draining_refuses_new_bulk_work_and_fails_readiness():
+    shutdown_drain().begin()
+
+    r = client.post(
+        "/api/v1/pages/bulk-move", json={"moves": [{"from_path": "a/b", "to_path": "a/c"}]}
+    )
+    assert r.status_code == 503
+    assert r.json()["code"] == "shutting_down"
+    assert int(r.headers["Retry-After"]) >= 1
+
+    ready = client.get("/api/v1/ready")
+    assert ready.status_code == 503
+    assert ready.json()["reason"] == "shutting down"
+
+
+def test_move_stops_at_item_boundary_after_deadline_and_journals_the_rest(monkeypatch, tmp_path):
+    monkeypatch.setenv("WIKIMGR_DRAIN_TIMEOUT_S", "0")
+    reset_shutdown_drain()
+    written = []
+
+    monkeypatch.setattr(
+        bulk_service,
+        "get_page",
+        lambda path=None, id=None: GetPageResponse(id=1, path=path, title="T", content="body"),
+    )
+
+    async def fake_upsert(payload, x_idempotency_key, legacy_x_idempotency_key):
+        written.append(payload.path)
+        # shutdown arrives while the first move is half done
+        shutdown_drain().begin()
+        return UpsertPageResponse(id=1, path=payload.path, idempotency_key="k")
+
+    monkeypatch.setattr(bulk_service, "upsert_page", fake_upsert)
+    moves = [
+        {"from_path": "docs/one", "to_path": "archive/one", "merge": True},
+        {"from_path": "docs/two", "to_path": "archive/two", "merge": True},
+        {"from_path": "docs/three", "to_path": "archive/three", "merge": True},
+    ]
+
+    r = client.post("/api/v1/pages/bulk-move", json={"moves": moves})
+    assert r.status_code == 200
+    body = r.json()
+    # the started move finished both halves: copy and stub
+    assert written == ["archive/one", "docs/one"]
+    assert [item["from"] for item in body["applied"]] == ["docs/one"]
+    assert [(item["move"]["from_path"], item["reason"]) for item in body["skipped"]] == [
+        ("docs/two", "shutdown"),
+        ("docs/three", "shutdown"),
+    ]
+
+    (journal,) = (tmp_path / "interrupted").glob("move-*.json")
+    data = json.loads(journal.read_text())
+    assert [m["from_path"] for m in data["remaining"]] == ["docs/two", "docs/three"]
+
+
+def test_started_step_completes_after_the_request_is_cancelled():
+    async def scenario():
+        drain = ShutdownDrain(timeout_s=1.0)
+        done = []
+
+        async def item():
+            await asyncio.sleep(0.05)
+            done.append(True)
+
+        request = asyncio.create_task(drain.step(item()))
+        await asyncio.sleep(0.01)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        assert done == []
+        assert await drain.wait() is True
+        return done
+
+    assert asyncio.run(scenario()) == [True]
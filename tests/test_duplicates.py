@@ -0,0 +1,104 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.minhash import MinHasher, jaccard, lsh_candidate_pairs, shingle_hashes
+from app.core.services import dedupe_service
+from app.main import app
+
+
+client = TestClient(app)
+
+RUNBOOK = " ".join(f"step {i} restart service number {i} and verify logs" for i in range(40))
+
+
+def test_minhash_signature_agreement_tracks_jaccard():
+    a = shingle_hashes(RUNBOOK)
+    b = shingle_hashes(RUNBOOK + " extra closing note about backups")
+    c = shingle_hashes("completely different page about network vlans and switches " * 5)
+
+    hasher = MinHasher()
+    sig_a, sig_b, sig_c = (hasher.signature(h) for h in (a, b, c))
+    assert abs(float(np.mean(sig_a == sig_b)) - jaccard(a, b)) < 0.15
+    assert float(np.mean(sig_a == sig_c)) < 0.1
+
+    pairs = lsh_candidate_pairs(np.vstack([sig_a, sig_b, sig_c]))
+    assert (0, 1) in pairs
+    assert (0, 2) not in pairs and (1, 2) not in pairs
+
+
+def test_duplicates_endpoint_returns_clusters_as_bulk_moves(monkeypatch):
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    monkeypatch.setattr(dedupe_service, "_FINGERPRINTS", {})
+    pages = {
+        1: {
+            "path": "homelab/runbooks/restart",
+            "createdAt": "2024-01-01",
+            "updatedAt": "2024-02-01",
+            "content": RUNBOOK,
+        },
+        2: {
+            "path": "projects/copy-of-restart",
+            "createdAt": "2024-03-01",
+            "updatedAt": "2024-05-01",
+            "content": RUNBOOK + " updated",
+        },
+        3: {
+            "path": "homelab/network",
+            "createdAt": "2024-01-01",
+            "updatedAt": "2024-01-01",
+            "content": "vlans " * 50,
+        },
+    }
+    listing = [
+        {"id": pid, "path": p["path"], "title": p["path"], "updatedAt": p["updatedAt"]}
+        for pid, p in pages.items()
+    ]
+
+    from app.core.services import page_sync
+
+    monkeypatch.setattr(dedupe_service, "list_page_versions", lambda: listing)
+    monkeypatch.setattr(
+        page_sync, "get_single", lambda pid: {"id": pid, "title": pages[pid]["path"], **pages[pid]}
+    )
+
+    r = client.get("/api/v1/analysis/duplicates", params={"threshold": 0.8})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["page_count"] == 3
+    assert len(body["clusters"]) == 1
+    cluster = body["clusters"][0]
+    # newest copy is moved onto the original location so its content wins
+    assert cluster["target"] == "homelab/runbooks/restart"
+    assert cluster["moves"] == [
+        {
+            "from_path": "projects/copy-of-restart",
+            "to_path": "homelab/runbooks/restart",
+            "merge": True,
+        }
+    ]
+    assert body["bulk_move"]["dry_run"] is True
+    assert body["bulk_move"]["moves"] == cluster["moves"]
+
+
+def test_duplicates_reports_pages_that_failed_to_fetch(monkeypatch):
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    monkeypatch.setattr(dedupe_service, "_FINGERPRINTS", {})
+    listing = [
+        {"id": 1, "path": "a", "title": "a", "updatedAt": "t1"},
+        {"id": 2, "path": "b", "title": "b", "updatedAt": "t1"},
+    ]
+
+    from app.core.services import page_sync
+
+    def fake_get_single(pid):
+        if pid == 2:
+            raise RuntimeError("boom")
+        return {"id": pid, "path": "a", "title": "a", "updatedAt": "t1", "content": RUNBOOK}
+
+    monkeypatch.setattr(dedupe_service, "list_page_versions", lambda: listing)
+    monkeypatch.setattr(page_sync, "get_single", fake_get_single)
+
+    body = client.get("/api/v1/analysis/duplicates").json()
+    assert body["page_count"] == 1
+    assert list(body["fetch_errors"]) == ["2"]
+    assert "boom" in body["fetch_errors"]["2"]
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+from benchmarks import fake_wikijs
+
+
+def _gql(client, query, variables=None):
+    return client.post("/graphql", json={"query": query, "variables": variables or {}})
+
+
+def test_fake_wikijs_page_lifecycle_and_counters(monkeypatch):
+    monkeypatch.setattr(fake_wikijs, "WIKI", fake_wikijs.FakeWiki())
+    client = TestClient(fake_wikijs.app)
+
+    create = (
+        "mutation ($path: String!) { pages { create(path: $path)"
+        " { responseResult { succeeded } page { id path } } } }"
+    )
+    r = _gql(client, create, {"path": "/homelab/gpu-vm", "title": "GPU", "content": "# GPU"})
+    page = r.json()["data"]["pages"]["create"]["page"]
+    assert page["path"] == "homelab/gpu-vm"
+
+    dup = _gql(client, create, {"path": "homelab/gpu-vm", "title": "GPU", "content": "x"})
+    assert dup.json()["data"]["pages"]["create"]["responseResult"]["succeeded"] is False
+
+    by_path = "query ($path: String!) { pages { singleByPath(path: $path) { id } } }"
+    missing = _gql(client, by_path, {"path": "nope/nope"})
+    assert "does not exist" in missing.json()["errors"][0]["message"]
+
+    delete = "mutation Del($id:Int!) { pages { delete(id:$id) { operation { succeeded } } } }"
+    r = _gql(client, delete, {"id": page["id"]})
+    assert r.json()["data"]["pages"]["delete"]["operation"]["succeeded"] is True
+
+    stats = client.get("/__stats").json()
+    assert stats["calls"] == {"create": 2, "singleByPath": 1, "delete": 1}
+    assert stats["pages"] == 0
+
+
+def test_fake_wikijs_error_injection(monkeypatch):
+    monkeypatch.setattr(fake_wikijs, "WIKI", fake_wikijs.FakeWiki())
+    client = TestClient(fake_wikijs.app)
+    client.post("/__seed", json={"count": 3})
+    client.post("/__config", json={"error_rate": 1.0, "error_mode": "http"})
+
+    r = _gql(client, "{ pages { list(orderBy: TITLE) { id path title } } }")
+    assert r.status_code == 502
+    assert client.get("/__stats").json()["errors"] == {"list": 1}
@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core import jsonio
+from app.core.jsonio import FastJSONResponse, model_response
+from app.models import BulkMoveItem, BulkMoveResponse
+
+
+def test_fast_response_renders_like_json_response():
+    content = {
+        "path": "ai/ollama",
+        "title": "Ünïcode ✓",
+        "tags": ["a", "b"],
+        "n": 3,
+        "ok": None,
+    }
+    fast = FastJSONResponse(content)
+    assert fast.body == JSONResponse(content).body
+    assert fast.headers["content-type"] == "application/json"
+
+
+def test_dumps_and_loads_round_trip_non_str_keys():
+    raw = jsonio.dumps({1: "x", "nested": {"k": [1.5, True]}})
+    assert jsonio.loads(raw) == {"1": "x", "nested": {"k": [1.5, True]}}
+    assert jsonio.loads(raw.decode()) == jsonio.loads(raw)
+
+
+def test_model_response_matches_fastapi_serialization():
+    report = BulkMoveResponse.model_validate(
+        {
+            "dry_run": True,
+            "applied": [{"from": "a", "to": "b", "dry": True}, {"from": "c", "to": "d"}],
+            "errors": [{"move": BulkMoveItem(from_path="e", to_path="f"), "error": "502: boom"}],
+        }
+    )
+    field = create_model_field("response", BulkMoveResponse, mode="serialization")
+    expected = asyncio.run(serialize_response(field=field, response_content=report))
+    response = model_response(report)
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == expected
@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+
+from app.core.link_graph import LinkGraph
+from app.core.services import links_service
+from app.core.services.bulk_service import extract_links
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_extract_links_strips_anchors_and_slashes():
+    md = "See [a](/homelab/gpu-vm#setup), [b](/ai/ollama/?tab=2) and [ext](https://x.test)."
+    assert extract_links(md) == ["homelab/gpu-vm", "ai/ollama"]
+
+
+def test_link_graph_report():
+    graph = LinkGraph()
+    graph.set_page(1, "homelab", "t", ["homelab/network", "en/ai/ollama", "old/path", "img/x.png"])
+    graph.set_page(2, "homelab/network", "t", ["homelab", "homelab/network"])
+    graph.set_page(3, "ai/ollama", "t", ["homelab/network"])
+    graph.set_page(4, "meta/lonely", "t", [])
+
+    report = graph.report(locale="en")
+    assert report["broken"] == [{"source": "homelab", "target": "old/path"}]
+    assert report["orphans"] == ["meta/lonely"]
+    assert report["most_linked"][0] == {"path": "homelab/network", "inbound": 2}
+
+
+def test_link_report_endpoint_only_fetches_changed_pages(monkeypatch, tmp_path):
+    monkeypatch.setenv("WIKIMGR_STATE_DIR", str(tmp_path))
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    monkeypatch.setattr(links_service, "_GRAPH", None)
+
+    listing = [
+        {"id": 1, "path": "homelab", "title": "Home", "updatedAt": "t1"},
+        {"id": 2, "path": "homelab/network", "title": "Net", "updatedAt": "t1"},
+    ]
+    content = {1: "[net](/homelab/network) [gone](/old/page)", 2: "no links"}
+    fetched = []
+
+    def fake_get_single(page_id):
+        fetched.append(page_id)
+        item = next(p for p in listing if p["id"] == page_id)
+        return {**item, "content": content[page_id]}
+
+    from app.core.services import page_sync
+
+    monkeypatch.setattr(links_service, "list_page_versions", lambda: listing)
+    monkeypatch.setattr(page_sync, "get_single", fake_get_single)
+
+    r = client.get("/api/v1/links/report")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["broken"] == [{"source": "homelab", "target": "old/page"}]
+    assert body["orphans"] == ["homelab"]
+    assert sorted(fetched) == [1, 2]
+    assert (tmp_path / links_service.GRAPH_FILE).exists()
+
+    fetched.clear()
+    r = client.get("/api/v1/links/report")
+    assert r.status_code == 200
+    assert fetched == []
@@ -0,0 +1,63 @@
+import json
+import logging
+import queue
+
+from fastapi.testclient import TestClient
+
+from app import log_utils, wikijs_api
+from app.core.page_records import PathIndex
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_json_formatter_merges_fields_and_request_id():
+    record = logging.LogRecord("wikimgr", logging.INFO, __file__, 1, "request %s", ("x",), None)
+    record.fields = {"status": 200}
+    log_utils.RequestIdFilter().filter(record)
+    entry = json.loads(log_utils.JsonFormatter().format(record))
+    assert entry["msg"] == "request x"
+    assert entry["req_id"] == "-"
+    assert entry["status"] == 200
+
+
+def test_sample_rules_match_first_pattern():
+    log_utils._SAMPLE_RULES = log_utils.parse_sample_rules(
+        "/api/v1/health=0, /metrics=0.5,bogus,/x=y"
+    )
+    try:
+        assert log_utils._SAMPLE_RULES == [("/api/v1/health", 0.0), ("/metrics", 0.5)]
+        assert log_utils.access_sample_rate("/api/v1/health") == 0.0
+        assert log_utils.access_sample_rate("/api/v1/pages") == 1.0
+    finally:
+        log_utils.setup_logging()
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = log_utils._NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("wikimgr", logging.INFO, __file__, 1, "m", None, None)
+    dropped = log_utils.LOG_RECORDS_DROPPED.labels()
+    before = dropped.value
+    handler.emit(record)
+    handler.emit(record)
+    assert handler.queue.qsize() == 1
+    assert dropped.value == before + 1
+
+
+def test_request_id_reaches_upstream_logs(monkeypatch, caplog):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://wikijs.local")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "test-token")
+    monkeypatch.setattr(wikijs_api, "_PATH_ID_CACHE", PathIndex())
+    monkeypatch.setattr(
+        wikijs_api, "sync_client", lambda: (_ for _ in ()).throw(RuntimeError("boom"))
+    )
+    caplog.set_level(logging.INFO)
+    r = client.get("/api/v1/pages/5", headers={"X-Request-Id": "req-123"})
+    assert r.headers["X-Request-Id"] == "req-123"
+
+    upstream = [rec for rec in caplog.records if rec.name == "wikimgr.upstream"]
+    assert upstream and all(rec.req_id == "req-123" for rec in upstream)
+    access = [rec for rec in caplog.records if rec.getMessage() == "request"]
+    assert access[-1].fields["status"] == r.status_code
+    assert log_utils.current_request_id() == "-"
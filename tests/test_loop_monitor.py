@@ -0,0 +1,44 @@
+import asyncio
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.metrics import LOOP_BLOCKED, LOOP_LAG
+from app.main import app
+
+
+def _blocking_handler():
+    time.sleep(0.25)
+
+
+async def _run_with_block(monitor):
+    monitor.start()
+    await asyncio.sleep(0.05)
+    _blocking_handler()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+
+def test_monitor_records_lag_and_logs_blocking_stack(caplog):
+    caplog.set_level(logging.WARNING, logger="wikimgr.loop")
+    blocked_before = LOOP_BLOCKED.labels().value
+    count_before = sum(LOOP_LAG.labels().counts)
+
+    monitor = LoopLagMonitor(interval_s=0.02, block_s=0.1, debug=True)
+    asyncio.run(_run_with_block(monitor))
+
+    assert monitor.max_lag_s >= 0.15
+    assert sum(LOOP_LAG.labels().counts) > count_before
+    assert LOOP_BLOCKED.labels().value == blocked_before + 1
+    (record,) = [r for r in caplog.records if r.getMessage() == "event loop blocked"]
+    assert "_blocking_handler" in record.fields["stack"]
+
+
+def test_lifespan_starts_monitor_and_exports_metric():
+    with TestClient(app) as client:
+        assert app.state.loop_monitor._task is not None
+        text = client.get("/metrics").text
+    assert "wikimgr_event_loop_lag_seconds_bucket" in text
+    assert app.state.loop_monitor._task is None
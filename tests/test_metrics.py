@@ -0,0 +1,82 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import wikijs_api
+from app.core import metrics
+from app.core.metrics import Counter, Histogram, render_metrics
+from app.core.page_records import PageRecords, PathIndex
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_graphql_operation_names():
+    assert wikijs_api.graphql_operation(wikijs_api.QUERY_LIST) == "list"
+    assert wikijs_api.graphql_operation(wikijs_api.QUERY_SINGLE_FULL) == "single"
+    assert wikijs_api.graphql_operation(wikijs_api.QUERY_SEARCH) == "search"
+    assert wikijs_api.graphql_operation(wikijs_api.MUTATION_DELETE) == "delete"
+    assert (
+        wikijs_api.graphql_operation("mutation { pages { create(path: $p) { id } } }") == "create"
+    )
+
+
+@contextmanager
+def _scratch_registry():
+    # metrics created meanwhile register here, not in the process-wide registry
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(metrics, "_REGISTRY", list(metrics._REGISTRY))
+        yield
+
+
+@pytest.fixture
+def scratch_registry():
+    with _scratch_registry():
+        yield
+
+
+def test_histogram_and_counter_exposition(scratch_registry):
+    hist = Histogram("test_latency_seconds", "Test latency.", ("op",), buckets=(0.1, 1.0))
+    hist.labels(op="a").observe(0.05)
+    hist.labels(op="a").observe(0.5)
+    counter = Counter("test_things", "Test things.", ("kind",))
+    counter.labels(kind='x"y').inc(2)
+
+    text = render_metrics()
+    assert 'test_latency_seconds_bucket{op="a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{op="a",le="+Inf"} 2' in text
+    assert 'test_latency_seconds_count{op="a"} 2' in text
+    assert 'test_things_total{kind="x\\"y"} 2' in text
+
+
+def test_scratch_registry_keeps_test_metrics_out_of_the_process_registry():
+    before = list(metrics._REGISTRY)
+    with _scratch_registry():
+        Counter("test_scratch", "Scratch.", ("kind",)).labels(kind="a").inc()
+        assert "test_scratch_total" in render_metrics()
+    assert metrics._REGISTRY == before
+    assert "test_scratch_total" not in render_metrics()
+
+
+def test_metrics_endpoint_reports_route_templates_and_upstream_calls(monkeypatch):
+    monkeypatch.setattr(
+        wikijs_api, "_PATH_ID_CACHE", PathIndex(PageRecords.from_mapping({"ai/ollama": 7}))
+    )
+    monkeypatch.setattr(
+        wikijs_api,
+        "_post",
+        lambda query, variables=None: {
+            "pages": {"single": {"id": 7, "path": "ai/ollama", "title": "Ollama", "content": "x"}}
+        },
+    )
+    client.get("/api/v1/pages/7")
+    client.get("/api/v1/pages", params={"path": "ai/ollama"})
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/v1/pages/{id:int}"' in r.text
+    assert 'wikimgr_cache_requests_total{cache="path_id",result="hit"}' in r.text
+    assert "wikimgr_bulk_operations_in_progress" in r.text
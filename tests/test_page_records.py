@@ -0,0 +1,148 @@
+import random
+import sys
+import threading
+
+from app import wikijs_api
+from app.content_tree import build_tree
+from app.core.page_records import PageRecords, PathIndex
+from app.core.paths import preflight_analysis
+from app.core.shared_cache import reset_cache_store
+
+
+PAGES = [
+    {"id": 1, "path": "homelab/proxmox/cluster", "title": "Cluster"},
+    {"id": 2, "path": "/ai/ollama/setup/", "title": "Ollama"},
+    {"id": 3, "path": "ai/agents", "title": "Agents"},
+    {"id": 4, "path": "homelab/network", "title": "Network"},
+]
+
+
+def test_records_read_as_a_path_mapping_in_listing_order():
+    records = PageRecords.from_pages(PAGES)
+
+    assert len(records) == 4
+    assert records["ai/ollama/setup"] == 2
+    assert records.get("/homelab/network/") == 4
+    assert "ai/missing" not in records
+    assert list(records.items()) == [
+        ("homelab/proxmox/cluster", 1),
+        ("ai/ollama/setup", 2),
+        ("ai/agents", 3),
+        ("homelab/network", 4),
+    ]
+    assert records.titles == ["Cluster", "Ollama", "Agents", "Network"]
+    # folder segments are stored once
+    assert records.segments.count("homelab") == 1
+    assert records.root(1) == "ai"
+
+
+def test_duplicate_path_resolves_to_the_last_listed_like_a_dict():
+    records = PageRecords.from_pages([{"id": 1, "path": "a/b"}, {"id": 9, "path": "a/b"}])
+    assert records["a/b"] == 9
+
+
+def test_tree_and_preflight_match_the_plain_path_versions():
+    records = PageRecords.from_pages(PAGES)
+    paths = [page["path"] for page in PAGES]
+
+    assert build_tree(records) == build_tree(paths)
+    assert list(build_tree(records)) == ["ai", "homelab"]
+    kwargs = {"allowed_roots": ["homelab", "ai"]}
+    assert preflight_analysis(
+        "/Infra/Proxmox/Cluster", existing_paths=records, **kwargs
+    ) == preflight_analysis("/Infra/Proxmox/Cluster", existing_paths=paths, **kwargs)
+
+
+def test_tree_strips_whitespace_in_segments_like_the_path_version():
+    paths = [" y /a", "y/b", "x/ /c"]
+    assert build_tree(PageRecords.from_paths(paths)) == build_tree(paths)
+    assert list(build_tree(PageRecords.from_paths(paths))) == ["x", "y"]
+
+
+def test_path_index_layers_changes_over_the_snapshot():
+    index = PathIndex(PageRecords.from_pages(PAGES, titles=False))
+
+    index["ai/new"] = 5
+    index["ai/agents"] = 33  # moved id wins over the snapshot
+    assert index.get("ai/new") == 5 and index["ai/agents"] == 33
+    assert index.pop("homelab/network") == 4
+    assert "homelab/network" not in index
+    index.remove_value(2)
+    assert index.get("ai/ollama/setup") is None
+    assert sorted(index) == ["ai/agents", "ai/new", "homelab/proxmox/cluster"]
+    assert len(index) == 3
+
+    index.replace({"x/y": 7})
+    assert list(index) == ["x/y"] and index["x/y"] == 7
+
+
+def test_path_index_behaves_like_a_dict_under_random_changes():
+    rng = random.Random(50)
+    paths = [f"docs/{name}" for name in "abcdef"]
+
+    def listing():
+        return {path: rng.randint(1, 5) for path in rng.sample(paths, rng.randint(0, len(paths)))}
+
+    for _ in range(200):
+        start = listing()
+        index, expected = PathIndex(PageRecords.from_mapping(start)), dict(start)
+        for _ in range(30):
+            op = rng.choice(("set", "set", "pop", "remove_value", "replace"))
+            path, page_id = rng.choice(paths), rng.randint(1, 5)
+            if op == "set":
+                index[path] = expected[path] = page_id
+            elif op == "pop":
+                assert index.pop(path) == expected.pop(path, None)
+            elif op == "remove_value":
+                index.remove_value(page_id)
+                expected = {key: value for key, value in expected.items() if value != page_id}
+            else:
+                items = listing()
+                index.replace(items)
+                expected = dict(items)
+            assert {path: index.get(path) for path in paths} == {
+                path: expected.get(path) for path in paths
+            }
+            assert len(index) == len(expected)
+            assert sorted(index) == sorted(expected)
+
+
+def test_concurrent_writes_do_not_drop_rows_of_a_new_snapshot():
+    old = PageRecords.from_mapping({f"old/{i}": i for i in range(300)})
+    fresh = PageRecords.from_mapping({f"new/{i}": i for i in range(300)})
+    index = PathIndex(old)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+
+        def writer():
+            # moves of old pages to ids the new snapshot does not use
+            for i in range(300):
+                index[f"old/{i}"] = 1000 + i
+                index.remove_value(1000 + i)
+
+        threads = [threading.Thread(target=writer) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        index.replace(fresh)
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(index.get(f"new/{i}") == i for i in range(300))
+
+
+def test_refresh_index_installs_records_as_the_local_path_cache(monkeypatch):
+    monkeypatch.setattr(wikijs_api, "_PATH_ID_CACHE", PathIndex())
+    monkeypatch.delenv("WIKIMGR_SHARED_CACHE", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    reset_cache_store()
+    monkeypatch.setattr(
+        wikijs_api, "_post", lambda query, variables=None: {"pages": {"list": PAGES}}
+    )
+
+    mapping = wikijs_api.refresh_index()
+    assert isinstance(mapping, PageRecords)
+    assert wikijs_api._PATH_ID_CACHE.get("ai/agents") == 3
+    assert wikijs_api.resolve_id(path="/homelab/network") == 4
+    reset_cache_store()
@@ -214,3 +214,30 @@ def test_upload_hits_internal_upsert(monkeypatch):
     assert seen["content_md"] == "# Hello"
     assert seen["is_private"] is True
     assert seen["idem"] == "header-idem-1"
+
+
+def test_bulk_upload_records_a_circuit_rejection_per_file(monkeypatch):
+    from app.core.errors import UpstreamUnavailable
+    from app.wikijs_client import WikiJSClient
+
+    async def flaky_upsert_page(self, payload, idem_key):
+        if payload.title == "two":
+            raise UpstreamUnavailable("Wiki.js circuit open", retry_after_s=5, code="circuit_open")
+        return {"id": len(payload.title), "path": payload.path}
+
+    monkeypatch.setattr(WikiJSClient, "upsert_page", flaky_upsert_page)
+
+    r = client.post(
+        "/pages/bulk_upload",
+        data={"base_path": "AI/Notes"},
+        files=[
+            ("files", ("one.md", b"# 1", "text/markdown")),
+            ("files", ("two.md", b"# 2", "text/markdown")),
+            ("files", ("three.md", b"# 3", "text/markdown")),
+        ],
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert body["ok"] is False
+    assert [s["filename"] for s in body["successes"]] == ["one.md", "three.md"]
+    assert body["failures"] == [{"filename": "two.md", "reason": "Wiki.js circuit open"}]
@@ -0,0 +1,87 @@
+import marshal
+import time
+
+from fastapi.testclient import TestClient
+
+from app import wikijs_api
+from app.core import profiler
+from app.main import app
+
+
+client = TestClient(app)
+ADMIN = {"X-API-Key": "admin-secret"}
+
+
+def _slow_post(query, variables=None):
+    time.sleep(0.05)
+    return {"pages": {"single": {"id": 7, "path": "ai/ollama", "title": "Ollama", "content": "x"}}}
+
+
+def test_admin_endpoints_disabled_without_admin_key(monkeypatch):
+    monkeypatch.delenv("WIKIMGR_ADMIN_API_KEY", raising=False)
+    r = client.post("/api/v1/admin/profile", json={})
+    assert r.status_code == 403
+    assert r.json()["code"] == "admin_disabled"
+
+
+def test_sampling_profile_collects_matching_requests(monkeypatch):
+    monkeypatch.setenv("WIKIMGR_ADMIN_API_KEY", "admin-secret")
+    monkeypatch.setattr(wikijs_api, "_post", _slow_post)
+
+    assert client.post("/api/v1/admin/profile", json={}, headers={}).status_code == 401
+    r = client.post(
+        "/api/v1/admin/profile",
+        json={"route": "/api/v1/pages/*", "requests": 2, "interval_ms": 1},
+        headers=ADMIN,
+    )
+    assert r.status_code == 200
+    assert r.json()["active"] is True
+    assert client.get("/api/v1/admin/profile/result", headers=ADMIN).status_code == 409
+
+    client.get("/api/v1/health")  # not matched
+    client.get("/api/v1/pages/7")
+    client.get("/api/v1/pages/7")
+
+    status = client.get("/api/v1/admin/profile", headers=ADMIN).json()
+    assert status["active"] is False
+    assert status["profiled"] == 2
+    assert status["samples"] > 0
+    assert profiler._ACTIVE is None
+
+    collapsed = client.get(
+        "/api/v1/admin/profile/result", params={"format": "collapsed"}, headers=ADMIN
+    ).text
+    first = collapsed.splitlines()[0]
+    assert first.rsplit(" ", 1)[1].isdigit()
+    assert "test_profiler.py:_slow_post" in collapsed
+
+    table = client.get("/api/v1/admin/profile/result", headers=ADMIN).text
+    assert "samples every 1.0ms over 2 request(s)" in table
+
+
+def test_cprofile_profile_returns_pstats_and_prof(monkeypatch):
+    monkeypatch.setenv("WIKIMGR_ADMIN_API_KEY", "admin-secret")
+    r = client.post(
+        "/api/v1/admin/profile",
+        json={"route": "/api/v1/health", "requests": 5, "mode": "cprofile"},
+        headers=ADMIN,
+    )
+    assert r.status_code == 200
+    assert client.post("/api/v1/admin/profile", json={}, headers=ADMIN).status_code == 409
+    client.get("/api/v1/health")
+    assert client.delete("/api/v1/admin/profile", headers=ADMIN).json()["profiled"] == 1
+
+    text = client.get("/api/v1/admin/profile/result", headers=ADMIN).text
+    assert "function calls" in text
+    assert (
+        client.get(
+            "/api/v1/admin/profile/result", params={"format": "collapsed"}, headers=ADMIN
+        ).status_code
+        == 400
+    )
+
+    raw = client.get(
+        "/api/v1/admin/profile/result", params={"format": "prof"}, headers=ADMIN
+    ).content
+    stats = marshal.loads(raw)
+    assert any(func == "health" for (_file, _line, func) in stats)
@@ -0,0 +1,186 @@
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from app import wikijs_client
+from app.core import retry
+from app.core.retry import RetryBudget, full_jitter, retry_after_seconds, retry_delay
+from app.wikijs_client import WikiError, WikiJSClient
+
+READ = "query { pages { single(id: 1) { id } } }"
+MUTATION = "mutation { pages { delete(id: 1) { responseResult { succeeded } } } }"
+
+
+def _status_error(status: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://wiki/graphql")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("boom", request=request, response=response)
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    fresh = RetryBudget(ratio=0.2, min_per_s=0.0, cap=10.0)
+    monkeypatch.setattr(retry, "RETRY_BUDGET", fresh)
+    monkeypatch.setattr(wikijs_client, "RETRY_BUDGET", fresh)
+    monkeypatch.setattr(retry, "full_jitter", lambda attempt: 0.0)
+    return fresh
+
+
+class _FakeAsyncClient:
+    """Plays back ``responses`` in order; each is an exception, a Response or (delay, Response)."""
+
+    responses: list = []
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def post(self, url, **kwargs):
+        cls = type(self)
+        item = cls.responses[min(cls.calls, len(cls.responses) - 1)]
+        cls.calls += 1
+        if isinstance(item, tuple):
+            delay, item = item
+            await asyncio.sleep(delay)
+        if isinstance(item, Exception):
+            raise item
+        item.request = httpx.Request("POST", url)
+        return item
+
+
+def _client(monkeypatch, name: str, responses: list) -> WikiJSClient:
+    fake = type("Fake", (_FakeAsyncClient,), {"responses": responses, "calls": 0})
+    monkeypatch.setattr(wikijs_client, "async_client", fake)
+    client = WikiJSClient(f"http://{name}.invalid", "t")
+    client.fake = fake
+    return client
+
+
+def _ok(body: dict | None = None) -> httpx.Response:
+    return httpx.Response(200, json={"data": body or {"pages": {"single": {"id": 1}}}})
+
+
+def test_full_jitter_stays_within_capped_exponential_window():
+    random.seed(7)
+    for attempt in range(8):
+        ceiling = min(retry.BACKOFF_CAP_S, retry.BACKOFF_BASE_S * 2**attempt)
+        samples = [full_jitter(attempt) for _ in range(200)]
+        assert all(0.0 <= s <= ceiling for s in samples)
+        assert max(samples) > ceiling / 2
+
+
+def test_retry_after_parses_seconds_and_dates():
+    assert retry_after_seconds(httpx.Response(503, headers={"Retry-After": "3"})) == 3.0
+    assert retry_after_seconds(httpx.Response(503, headers={"Retry-After": "soon"})) is None
+    assert retry_after_seconds(httpx.Response(503)) is None
+    past = retry_after_seconds(
+        httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    )
+    assert past == 0.0
+
+
+def test_retry_delay_honours_retry_after_and_gives_up_when_too_long(budget):
+    assert retry_delay(_status_error(503, {"Retry-After": "2"}), "single", 0) == 2.0
+    assert retry_delay(_status_error(503, {"Retry-After": "3600"}), "single", 0) is None
+    assert retry_delay(_status_error(503), "single", retry.MAX_ATTEMPTS - 1) is None
+
+
+def test_mutations_only_retry_when_the_request_cannot_have_applied(budget):
+    assert retry_delay(httpx.ReadTimeout("slow"), "delete", 0) is None
+    assert retry_delay(_status_error(502), "delete", 0) is None
+    assert retry_delay(httpx.ConnectError("refused"), "delete", 0) == 0.0
+    assert retry_delay(_status_error(429), "delete", 0) == 0.0
+    assert retry_delay(httpx.ReadTimeout("slow"), "single", 0) == 0.0
+
+
+def test_budget_exhaustion_stops_retries():
+    empty = RetryBudget(ratio=0.5, min_per_s=0.0, cap=1.0)
+    assert empty.try_spend() is True
+    assert empty.try_spend() is False
+    empty.record_request()
+    empty.record_request()
+    assert empty.try_spend() is True
+
+
+def test_exhausted_budget_fails_fast(monkeypatch, budget):
+    budget._balance = 0.0
+    client = _client(monkeypatch, "retry-budget", [httpx.ReadTimeout("slow")])
+    with pytest.raises(WikiError) as err:
+        asyncio.run(client._gql(READ))
+    assert err.value.status == 504
+    assert client.fake.calls == 1
+
+
+def test_non_json_5xx_is_retried_then_mapped_to_502(monkeypatch, budget):
+    html = httpx.Response(502, text="<html>Bad Gateway</html>")
+    client = _client(monkeypatch, "retry-html", [html, _ok()])
+    assert asyncio.run(client._gql(READ)) == {"pages": {"single": {"id": 1}}}
+    assert client.fake.calls == 2
+
+    client = _client(monkeypatch, "retry-html-down", [html])
+    with pytest.raises(WikiError) as err:
+        asyncio.run(client._gql(READ))
+    assert err.value.status == 502
+    assert "HTTP 502" in err.value.message
+    assert client.fake.calls == retry.MAX_ATTEMPTS
+
+
+def test_non_json_success_body_is_an_upstream_error(monkeypatch, budget):
+    client = _client(monkeypatch, "retry-text", [httpx.Response(200, text="maintenance")])
+    with pytest.raises(WikiError) as err:
+        asyncio.run(client._gql(READ))
+    assert err.value.status == 502
+    assert "non-JSON" in err.value.message
+    assert client.fake.calls == 1
+
+
+def test_mutation_is_not_retried_after_read_timeout(monkeypatch, budget):
+    client = _client(monkeypatch, "retry-mutation", [httpx.ReadTimeout("slow"), _ok()])
+    with pytest.raises(WikiError) as err:
+        asyncio.run(client._gql(MUTATION))
+    assert err.value.status == 504
+    assert client.fake.calls == 1
+
+
+def test_hedge_wins_over_slow_primary(monkeypatch, budget):
+    monkeypatch.setenv("WIKIMGR_HEDGE_READS", "1")
+    monkeypatch.setenv("WIKIMGR_HEDGE_DEFAULT_DELAY_MS", "20")
+    client = _client(
+        monkeypatch, "retry-hedge", [(1.0, _ok({"who": "primary"})), _ok({"who": "hedge"})]
+    )
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        data = await client._gql(READ)
+        return data, asyncio.get_running_loop().time() - started
+
+    data, elapsed = asyncio.run(run())
+    assert data == {"who": "hedge"}
+    assert elapsed < 0.5
+    assert client.fake.calls == 2
+
+
+def test_cancelled_caller_cancels_primary_during_hedge_delay(monkeypatch, budget):
+    monkeypatch.setenv("WIKIMGR_HEDGE_READS", "1")
+    monkeypatch.setenv("WIKIMGR_HEDGE_DEFAULT_DELAY_MS", "500")
+    client = _client(monkeypatch, "retry-hedge-cancel", [(1.0, _ok())])
+
+    async def run():
+        caller = asyncio.ensure_future(client._gql(READ))
+        await asyncio.sleep(0.02)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+    assert client.fake.calls == 1
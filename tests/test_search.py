@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+
+from app.core.search_index import SearchIndex, tokenize
+from app.core.services import search_service
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_tokenize_strips_markdown_and_link_targets():
+    md = (
+        "# Ollama Setup\n\n```bash\n```\n"
+        "See [the guide](/homelab/gpu-vm) for <b>GPU</b> passthrough."
+    )
+    assert tokenize(md) == ["ollama", "setup", "see", "guide", "gpu", "passthrough"]
+
+
+def test_bm25_ranks_title_matches_first_and_filters_prefix():
+    index = SearchIndex()
+    index.upsert(1, "homelab/proxmox", "Proxmox", "Cluster notes about nodes.")
+    index.upsert(2, "ai/ollama", "Ollama", "Runs models; mentions proxmox once.")
+    index.upsert(3, "homelab/network", "Network", "VLANs and switches.")
+
+    hits = index.search("proxmox")
+    assert [doc.id for doc, _ in hits] == [1, 2]
+
+    hits = index.search("proxmox", prefixes=["ai"])
+    assert [doc.path for doc, _ in hits] == ["ai/ollama"]
+
+
+def test_index_remove_and_round_trip():
+    index = SearchIndex()
+    index.upsert(1, "a/one", "One", "alpha beta", updated_at="t1")
+    index.upsert(2, "a/two", "Two", "beta gamma", updated_at="t2")
+    assert index.remove(1) is True
+    assert "alpha" not in index.postings
+
+    restored = SearchIndex.from_dict(index.to_dict())
+    assert restored.versions() == {2: "t2"}
+    assert [doc.id for doc, _ in restored.search("gamma")] == [2]
+
+
+def test_search_endpoint_builds_incrementally_and_persists(monkeypatch, tmp_path):
+    monkeypatch.setenv("WIKIMGR_STATE_DIR", str(tmp_path))
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    monkeypatch.setattr(search_service, "_INDEX", None)
+    monkeypatch.setattr(search_service, "_SYNCED", False)
+
+    listing = [
+        {"id": 1, "path": "homelab/proxmox", "title": "Proxmox", "updatedAt": "t1"},
+        {"id": 2, "path": "ai/ollama", "title": "Ollama", "updatedAt": "t1"},
+    ]
+    fetched = []
+
+    def fake_get_single(page_id):
+        fetched.append(page_id)
+        item = next(p for p in listing if p["id"] == page_id)
+        return {**item, "content": f"notes for {item['title']}"}
+
+    from app.core.services import page_sync
+
+    monkeypatch.setattr(search_service, "list_page_versions", lambda: listing)
+    monkeypatch.setattr(page_sync, "get_single", fake_get_single)
+
+    r = client.get("/api/v1/search", params={"q": "ollama"})
+    assert r.status_code == 200
+    assert [hit["path"] for hit in r.json()["results"]] == ["ai/ollama"]
+    assert sorted(fetched) == [1, 2]
+    assert (tmp_path / search_service.INDEX_FILE).exists()
+
+    listing[0] = {**listing[0], "updatedAt": "t2"}
+    fetched.clear()
+    r = client.post("/api/v1/search/refresh")
+    assert r.status_code == 200
+    assert r.json()["updated"] == 1
+    assert fetched == [1]
@@ -0,0 +1,187 @@
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import wikijs_api, wikijs_client
+from app.core.metrics import CACHE_WRITE_ERRORS
+from app.core.services import pages_service
+from app.core.shared_cache import LocalStore, SharedStore, cache_store, reset_cache_store
+from app.main import app
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def shared(monkeypatch, tmp_path):
+    monkeypatch.setenv("WIKIMGR_SHARED_CACHE", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    reset_cache_store()
+    yield cache_store()
+    reset_cache_store()
+
+
+def test_store_is_local_for_a_single_worker(monkeypatch):
+    monkeypatch.delenv("WIKIMGR_SHARED_CACHE", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    reset_cache_store()
+    try:
+        assert isinstance(cache_store(), LocalStore)
+    finally:
+        reset_cache_store()
+
+
+def test_local_store_sweeps_expired_entries_that_are_never_read_again():
+    store = LocalStore()
+    for i in range(3):
+        store.set("idem", f"key-{i}", {"id": i}, ttl_s=0.01)
+    store.set("ns", "kept", 1)
+    time.sleep(0.02)
+    store._last_sweep = 0.0  # past the sweep interval
+    store.set("ns", "other", 2)
+    assert sorted(key for _, key in store._entries) == ["kept", "other"]
+
+
+def test_two_stores_on_one_file_see_each_others_writes(tmp_path):
+    # two SharedStore instances stand in for two worker processes
+    a = SharedStore(tmp_path / "cache.sqlite3")
+    b = SharedStore(tmp_path / "cache.sqlite3")
+
+    a.set("ns", "k", {"id": 1})
+    assert b.get("ns", "k") == {"id": 1}
+    b.delete("ns", "k")
+    assert a.get("ns", "k") is None
+
+    assert a.generation("pages") == 0
+    assert b.bump("pages") == 1
+    assert a.generation("pages") == 1
+
+    a.set("ns", "short", 1, ttl_s=0.01)
+    time.sleep(0.02)
+    assert b.get("ns", "short", "gone") == "gone"
+
+
+def test_shared_map_replace_and_remove_value(tmp_path):
+    paths = SharedStore(tmp_path / "cache.sqlite3").mapping("path_id")
+    paths["old/page"] = 1
+    paths.replace({"a": 1, "b": 2, "c": 2})
+    assert "old/page" not in paths
+    assert sorted(paths) == ["a", "b", "c"]
+    paths.remove_value(2)
+    assert len(paths) == 1 and paths["a"] == 1
+
+
+def test_workers_share_the_listing_until_a_page_is_written(shared, monkeypatch):
+    calls = []
+
+    def fake_post(query, variables=None):
+        calls.append(query)
+        return {"pages": {"list": [{"id": 1, "path": "a", "title": "A", "updatedAt": "t1"}]}}
+
+    monkeypatch.setattr(wikijs_api, "_post", fake_post)
+
+    first = wikijs_api.list_page_versions()
+    assert wikijs_api.list_page_versions() == first
+    assert len(calls) == 1
+
+    wikijs_api.note_page_write()
+    wikijs_api.list_page_versions()
+    assert len(calls) == 2
+
+
+def test_deleted_page_is_dropped_from_the_shared_path_cache(shared):
+    wikijs_api.remember_path("/ai/ollama/", 7)
+    assert wikijs_api.resolve_id(path="ai/ollama") == 7
+    generation = shared.generation(wikijs_api.PAGES_GENERATION)
+
+    wikijs_api.forget_page(7)
+    assert "ai/ollama" not in shared.mapping("path_id")
+    assert shared.generation(wikijs_api.PAGES_GENERATION) == generation + 1
+
+
+def test_explicit_idempotency_key_replays_the_stored_upsert(shared, monkeypatch):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://wikijs.local")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "test-token")
+    writes = []
+
+    async def fake_upsert_page(self, payload, idem_key):
+        writes.append(payload.path)
+        return {"id": 40 + len(writes), "path": payload.path}
+
+    monkeypatch.setattr(wikijs_client.WikiJSClient, "upsert_page", fake_upsert_page)
+    body = {"path": "ai/replay", "title": "Replay", "content": "# once"}
+    headers = {"X-Idempotency-Key": "replay-1"}
+
+    first = client.post("/api/v1/pages/upsert", json=body, headers=headers)
+    again = client.post("/api/v1/pages/upsert", json=body, headers=headers)
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert writes == ["ai/replay"]
+
+    changed = client.post(
+        "/api/v1/pages/upsert", json={**body, "content": "# twice"}, headers=headers
+    )
+    assert changed.status_code == 200
+    assert len(writes) == 2
+
+
+@pytest.mark.parametrize("make_store", [LocalStore, lambda: SharedStore(":memory:")])
+def test_add_stores_only_an_absent_or_expired_key(make_store):
+    store = make_store()
+    assert store.add("idem", "k", 1, ttl_s=0.01)
+    assert not store.add("idem", "k", 2)
+    assert store.get("idem", "k") == 1
+    time.sleep(0.02)
+    assert store.add("idem", "k", 3)
+    assert store.get("idem", "k") == 3
+
+
+def test_in_flight_idempotency_key_conflicts_and_a_failed_write_releases_it(shared, monkeypatch):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://wikijs.local")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "test-token")
+
+    async def failing_upsert_page(self, payload, idem_key):
+        raise RuntimeError("wiki down")
+
+    monkeypatch.setattr(wikijs_client.WikiJSClient, "upsert_page", failing_upsert_page)
+    body = {"path": "ai/claim", "title": "Claim", "content": "# once"}
+    headers = {"X-Idempotency-Key": "claim-1"}
+
+    shared.set("idempotency", "claim-1", {"digest": "x", "pending": True}, ttl_s=60)
+    busy = client.post("/api/v1/pages/upsert", json=body, headers=headers)
+    assert busy.status_code == 409
+    assert busy.json()["code"] == "idempotency_conflict"
+
+    shared.delete("idempotency", "claim-1")
+    failed = client.post("/api/v1/pages/upsert", json=body, headers=headers)
+    assert failed.status_code == 502
+    assert shared.get("idempotency", "claim-1") is None
+
+
+def test_cache_failure_after_a_committed_write_still_returns_the_result(shared, monkeypatch):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://wikijs.local")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "test-token")
+
+    async def fake_upsert_page(self, payload, idem_key):
+        return {"id": 9, "path": payload.path}
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(wikijs_client.WikiJSClient, "upsert_page", fake_upsert_page)
+    monkeypatch.setattr(pages_service, "remember_path", locked)
+    monkeypatch.setattr(pages_service, "forget_page", locked)
+    monkeypatch.setattr(pages_service, "delete_by_id", lambda pid: True)
+    before = CACHE_WRITE_ERRORS.labels(step="path_cache").value
+
+    r = client.post(
+        "/api/v1/pages/upsert", json={"path": "ai/locked", "title": "L", "content": "x"}
+    )
+    assert r.status_code == 200
+    assert r.json()["id"] == 9
+    r = client.delete("/api/v1/pages/9")
+    assert r.status_code == 200
+    assert r.json()["ok"] is True
+    assert CACHE_WRITE_ERRORS.labels(step="path_cache").value == before + 2
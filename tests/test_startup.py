@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.main import app
+from app.routers.api import API_PREFIX
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_app_import_does_not_load_the_minhash_stack():
+    # numpy is only needed by /api/v1/analysis/duplicates; loading it at import slows cold start
+    out = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print('numpy' in sys.modules)"],
+        cwd=REPO_ROOT,
+        env={**os.environ, "WIKIJS_BASE_URL": "http://example.test", "WIKIJS_API_TOKEN": "t"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_api_routes_are_mounted_under_v1_prefix():
+    paths = {route.path for route in app.routes}
+    assert f"{API_PREFIX}/ready" in paths
+    assert f"{API_PREFIX}/analysis/duplicates" in paths
+    assert f"{API_PREFIX}/pages/upsert" in paths
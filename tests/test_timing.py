@@ -0,0 +1,67 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app import wikijs_api
+from app.core.timing import server_timing_header
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def test_server_timing_header_aggregates_repeated_phases():
+    phases = [("gql-singleByPath", 0.010), ("backoff", 0.5), ("gql-singleByPath", 0.0125)]
+    assert server_timing_header(phases, 0.6) == (
+        'gql-singleByPath;dur=22.5;desc="x2", backoff;dur=500.0, total;dur=600.0'
+    )
+
+
+class _FakeResponse:
+    def raise_for_status(self):
+        return None
+
+    content = json.dumps(
+        {
+            "data": {
+                "pages": {
+                    "single": {"id": 5, "path": "ai/ollama", "title": "Ollama", "content": "x"}
+                }
+            }
+        }
+    ).encode()
+
+    def json(self):
+        return {
+            "data": {
+                "pages": {
+                    "single": {"id": 5, "path": "ai/ollama", "title": "Ollama", "content": "x"}
+                }
+            }
+        }
+
+
+class _FakeClient:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def post(self, url, headers, content):
+        return _FakeResponse()
+
+
+def test_responses_carry_server_timing_with_upstream_phases(monkeypatch):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://example.test")
+    monkeypatch.delenv("WIKIMGR_API_KEY", raising=False)
+    monkeypatch.setattr(wikijs_api, "sync_client", _FakeClient)
+
+    r = client.get("/api/v1/pages/5")
+    assert r.status_code == 200
+    timing = r.headers["Server-Timing"]
+    assert timing.startswith("gql-single;dur=")
+    assert "total;dur=" in timing
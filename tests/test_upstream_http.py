@@ -0,0 +1,48 @@
+import asyncio
+import gzip
+
+from app.core import upstream_http
+from app.core.upstream_http import accept_encoding, encode_body, http2_enabled
+
+
+def test_request_bodies_are_sent_uncompressed_by_default(monkeypatch):
+    monkeypatch.delenv("WIKIMGR_UPSTREAM_GZIP_REQUESTS", raising=False)
+    body = b"x" * 10_000
+    assert encode_body(body) == (body, {})
+
+
+def test_large_request_bodies_are_gzipped_when_enabled(monkeypatch):
+    monkeypatch.setenv("WIKIMGR_UPSTREAM_GZIP_REQUESTS", "1")
+    monkeypatch.setenv("WIKIMGR_UPSTREAM_GZIP_MIN_BYTES", "1024")
+    small = b'{"query":"q"}'
+    assert encode_body(small) == (small, {})
+
+    body = b'{"content":"' + b"lorem ipsum " * 500 + b'"}'
+    encoded, headers = encode_body(body)
+    assert headers == {"Content-Encoding": "gzip"}
+    assert len(encoded) < len(body)
+    assert gzip.decompress(encoded) == body
+
+
+def test_accept_encoding_env_override(monkeypatch):
+    monkeypatch.delenv("WIKIMGR_UPSTREAM_ACCEPT_ENCODING", raising=False)
+    assert accept_encoding().startswith("gzip")
+    monkeypatch.setenv("WIKIMGR_UPSTREAM_ACCEPT_ENCODING", "identity")
+    assert accept_encoding() == "identity"
+
+
+def test_http2_falls_back_without_h2(monkeypatch):
+    monkeypatch.setenv("WIKIMGR_UPSTREAM_HTTP2", "1")
+    monkeypatch.setattr(upstream_http.importlib.util, "find_spec", lambda name: None)
+    assert http2_enabled() is False
+    monkeypatch.delenv("WIKIMGR_UPSTREAM_HTTP2")
+    assert http2_enabled() is False
+
+
+def test_sync_client_is_shared_until_closed():
+    first = upstream_http.sync_client()
+    assert upstream_http.sync_client() is first
+    assert first.headers["Accept-Encoding"] == accept_encoding()
+    asyncio.run(upstream_http.close_clients())
+    assert first.is_closed
+    assert upstream_http.sync_client() is not first
@@ -0,0 +1,193 @@
+import asyncio
+import sqlite3
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import upstream_probe
+from app.core.drain import reset_shutdown_drain
+from app.core.shared_cache import SharedStore, reset_cache_store
+from app.core.upstream_probe import (
+    PROBE_KEY,
+    PROBE_NS,
+    UpstreamProber,
+    reset_upstream_prober,
+    upstream_prober,
+)
+from app.main import app
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _probe(monkeypatch):
+    monkeypatch.setenv("WIKIJS_BASE_URL", "http://wikijs.local")
+    monkeypatch.setenv("WIKIJS_API_TOKEN", "test-token")
+    monkeypatch.delenv("WIKIMGR_SHARED_CACHE", raising=False)
+    monkeypatch.delenv("WIKIMGR_READY_FAIL_ON", raising=False)
+    reset_cache_store()
+    reset_upstream_prober()
+    # an earlier lifespan shutdown leaves the drain begun
+    reset_shutdown_drain()
+    yield
+    reset_upstream_prober()
+    reset_cache_store()
+
+
+class FakeUpstream:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def post(self, url, json=None, headers=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"data": {"pages": {"list": [{"id": 1}]}}})
+
+
+def _prober(monkeypatch, outcomes, interval_s=0.0, **kw):
+    # interval 0: every tick probes instead of adopting the snapshot it just wrote
+    fake = FakeUpstream(outcomes)
+    monkeypatch.setattr(upstream_probe, "async_client", lambda: fake)
+    prober = UpstreamProber(
+        "http://wikijs.local/graphql", "test-token", interval_s=interval_s, **kw
+    )
+    return prober, fake
+
+
+def _install(monkeypatch, prober):
+    # the app's prober, reported as running; the test drives its ticks by hand
+    monkeypatch.setattr(UpstreamProber, "running", property(lambda self: True))
+    monkeypatch.setattr(upstream_probe, "_PROBER", prober)
+
+
+def test_consecutive_failures_mark_upstream_down(monkeypatch):
+    prober, _ = _prober(
+        monkeypatch, [200, httpx.ConnectError("refused"), 502, httpx.ReadTimeout("slow")]
+    )
+
+    async def scenario():
+        return [(await prober.tick()).status for _ in range(4)]
+
+    # one failure in a window of two already crosses the 20% error-rate threshold
+    assert asyncio.run(scenario()) == ["ok", "degraded", "degraded", "down"]
+
+
+def test_slow_probes_degrade(monkeypatch):
+    prober, _ = _prober(monkeypatch, [200], degraded_ms=1.0)
+
+    async def scenario():
+        monkeypatch.setattr(upstream_probe.time, "perf_counter", iter([0.0, 0.005]).__next__)
+        return await prober.tick()
+
+    health = asyncio.run(scenario())
+    assert health.status == "degraded"
+    assert health.latency_ms == 5.0
+
+
+def test_ready_answers_from_the_cached_verdict(monkeypatch):
+    prober, fake = _prober(monkeypatch, [httpx.ConnectError("refused")], down_after=2)
+    _install(monkeypatch, prober)
+
+    asyncio.run(prober.tick())
+    assert client.get("/api/v1/ready").status_code == 200
+    asyncio.run(prober.tick())
+
+    r = client.get("/api/v1/ready")
+    assert r.status_code == 503
+    body = r.json()
+    assert body["upstream"] == "down"
+    assert body["reason"].startswith("Wiki.js down: 2 consecutive probe failures")
+    assert r.headers["Retry-After"] == "1"
+    assert client.get("/readyz").status_code == 503
+    # readiness reads the cache; only the two ticks reached Wiki.js
+    assert fake.calls == 2
+
+
+def test_readiness_does_not_read_the_store(monkeypatch):
+    prober, _ = _prober(monkeypatch, [200])
+    _install(monkeypatch, prober)
+    asyncio.run(prober.tick())
+
+    locked = sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(upstream_probe, "cache_store", lambda: (_ for _ in ()).throw(locked))
+    assert prober.health().status == "ok"
+    assert client.get("/api/v1/ready").json()["upstream"] == "ok"
+
+
+def test_degraded_fails_readiness_only_when_configured(monkeypatch):
+    prober, _ = _prober(monkeypatch, [200, 502])
+    _install(monkeypatch, prober)
+
+    async def scenario():
+        await prober.tick()
+        await prober.tick()
+
+    asyncio.run(scenario())
+    r = client.get("/api/v1/ready")
+    assert r.status_code == 200
+    assert r.json()["upstream"] == "degraded"
+    assert r.json()["upstream_error_rate"] == 0.5
+
+    monkeypatch.setenv("WIKIMGR_READY_FAIL_ON", "degraded")
+    assert client.get("/api/v1/ready").status_code == 503
+
+
+def test_ready_omits_upstream_until_the_prober_runs():
+    assert upstream_prober().health().status == "unknown"
+    assert client.get("/api/v1/ready").json() == {"ready": True, "circuit": "closed"}
+
+
+def test_workers_share_one_probe_per_interval(monkeypatch, tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    prober, fake = _prober(monkeypatch, [200], interval_s=10.0)
+    # two store instances on one file stand in for two worker processes
+    stores = iter([SharedStore(path), SharedStore(path)])
+    monkeypatch.setattr(upstream_probe, "cache_store", lambda: next(stores))
+
+    async def scenario():
+        return [await prober.tick(), await prober.tick()]
+
+    first, second = asyncio.run(scenario())
+    assert fake.calls == 1
+    assert first.status == second.status == "ok"
+    assert SharedStore(path).get(PROBE_NS, PROBE_KEY)["at"] <= time.time()
+
+
+def test_probe_loop_survives_a_failing_tick(monkeypatch):
+    prober, fake = _prober(monkeypatch, [200], interval_s=0.001)
+    locked = sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(upstream_probe, "cache_store", lambda: (_ for _ in ()).throw(locked))
+
+    async def scenario():
+        prober._task = asyncio.get_running_loop().create_task(prober._run())
+        await asyncio.sleep(0.02)
+        alive = prober.running
+        await prober.stop()
+        return alive
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_readyz_fails_while_draining_or_with_an_open_circuit(monkeypatch):
+    from app.core.circuit import CircuitBreaker
+    from app.core.drain import shutdown_drain
+    from app.routers import health
+
+    assert client.get("/readyz").status_code == 200
+    shutdown_drain().begin()
+    assert client.get("/readyz").status_code == 503
+    reset_shutdown_drain()
+
+    breaker = CircuitBreaker("readyz-test", failure_threshold=1)
+    breaker.record_failure(probe=False)
+    monkeypatch.setattr(health, "breaker_for", lambda name: breaker)
+    r = client.get("/readyz")
+    assert r.status_code == 503
+    assert r.json() == {"ready": False}
+    assert int(r.headers["Retry-After"]) >= 1
@@ -1,3 +1,5 @@
+import json
+
 from app import wikijs_api
 
 
@@ -5,6 +7,8 @@ class _FakeResponse:
     def raise_for_status(self):
         return None
 
+    content = json.dumps({"data": {"pages": {"list": []}}}).encode()
+
     def json(self):
         return {"data": {"pages": {"list": []}}}
 
@@ -19,7 +23,7 @@ class _FakeClient:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def post(self, url, headers, json):
+    def post(self, url, headers, content):
         self.last_url = url
         assert url == "http://example.test/graphql"
         assert headers["Authorization"] == "Bearer token-1"
@@ -29,7 +33,7 @@ class _FakeClient:
 def test_wikijs_api_uses_runtime_env(monkeypatch):
     monkeypatch.setenv("WIKIJS_BASE_URL", "http://example.test")
     monkeypatch.setenv("WIKIJS_API_TOKEN", "token-1")
-    monkeypatch.setattr(wikijs_api.httpx, "Client", _FakeClient)
+    monkeypatch.setattr(wikijs_api, "sync_client", _FakeClient)
 
     pages = wikijs_api.list_pages(limit=1)
     assert pages == []